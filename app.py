@@ -5,7 +5,12 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import time
+import os
 from models.irrigation_model import IrrigationModel
+from models.pump_policy import DEFAULT_PUMP_POLICY
+from models.rules import DEFAULT_RULES_ENGINE
+from models.retraining import RetrainingWorker, leitura_solo_data_source
+from src.inference_server import InferenceClient
 from utils.data_generator import SensorDataGenerator
 from utils.sensor_data import SensorData
 
@@ -21,7 +26,32 @@ st.set_page_config(
 # Inicialização de componentes
 @st.cache_resource
 def load_model():
-    return IrrigationModel()
+    # Usar o servidor local de inferência quando configurado (src/inference_server.py)
+    inference_socket = os.environ.get('IRRIGATION_INFERENCE_SOCKET')
+    if inference_socket:
+        return InferenceClient(socket_path=inference_socket)
+
+    model = IrrigationModel()
+
+    # Retreinamento em segundo plano com o histórico real (opcional)
+    retrain_interval = os.environ.get('IRRIGATION_RETRAIN_INTERVAL')
+    if retrain_interval:
+        RetrainingWorker(model, leitura_solo_data_source(),
+                         interval_seconds=float(retrain_interval)).start()
+
+    return model
+
+
+@st.cache_resource
+def load_permutation_importance(_model, model_version):
+    """
+    Importância por permutação, calculada uma vez por versão do modelo
+    (e não a cada rerun do Streamlit).
+    """
+    if isinstance(_model, InferenceClient):
+        return _model.get_permutation_importance()['importances']
+    # Processo único: sem pool de processos dentro do Streamlit
+    return _model.get_permutation_importance(n_jobs=1)['importances']
 
 
 @st.cache_resource
@@ -122,19 +152,17 @@ def main():
     with col2:
         st.subheader("🤖 Modelo Preditivo")
 
-        # Predição do modelo
-        features = np.array([[current_data['humidity'], current_data['ph'],
-                              current_data['phosphorus'], current_data['potassium']]])
-
-        prediction = st.session_state.irrigation_model.predict(features)
-        irrigation_probability = st.session_state.irrigation_model.predict_proba(features)[0][1]
+        # Predição do modelo (classe, probabilidade e confiança em uma passagem)
+        result = st.session_state.irrigation_model.predict_with_proba(current_data)
+        prediction = result['prediction']
+        irrigation_probability = result['probability']
 
         # Mostrar predição
         pred_col1, pred_col2 = st.columns(2)
         with pred_col1:
             st.metric("Necessidade de Irrigação",
-                      "SIM" if prediction[0] == 1 else "NÃO",
-                      delta=f"{irrigation_probability:.1%} confiança")
+                      "SIM" if prediction == 1 else "NÃO",
+                      delta=f"{result['confidence']:.1%} confiança")
 
         with pred_col2:
             st.metric("Probabilidade", f"{irrigation_probability:.1%}")
@@ -165,7 +193,9 @@ def main():
 
         # Importância das features
         st.subheader("📊 Importância dos Fatores")
-        feature_importance = st.session_state.irrigation_model.get_feature_importance()
+        # Importância por permutação, pré-calculada e guardada ao lado do artefato
+        model = st.session_state.irrigation_model
+        feature_importance = load_permutation_importance(model, model.version)
 
         fig_importance = px.bar(
             x=list(feature_importance.values()),
@@ -179,12 +209,10 @@ def main():
     with col3:
         st.subheader("💧 Status da Bomba")
 
-        # Lógica de controle automático
+        # Lógica de controle automático (a mesma usada no simulador de safra)
         if st.session_state.auto_mode:
-            if prediction[0] == 1 and irrigation_probability > 0.7:
-                st.session_state.pump_status = True
-            elif irrigation_probability < 0.3:
-                st.session_state.pump_status = False
+            st.session_state.pump_status = DEFAULT_PUMP_POLICY.step(
+                st.session_state.pump_status, prediction, irrigation_probability)
 
         # Status visual da bomba
         if st.session_state.pump_status:
@@ -201,15 +229,11 @@ def main():
         st.subheader("🚨 Alertas")
 
         # Sistema de alertas
-        alerts = []
-        if current_data['humidity'] < humidity_threshold:
-            alerts.append("⚠️ Umidade baixa!")
-        if current_data['ph'] < ph_min or current_data['ph'] > ph_max:
-            alerts.append("⚠️ pH fora do range!")
-        if current_data['phosphorus'] < 15:
-            alerts.append("⚠️ Fósforo baixo!")
-        if current_data['potassium'] < 120:
-            alerts.append("⚠️ Potássio baixo!")
+        alerts = DEFAULT_RULES_ENGINE.alerts(current_data, thresholds={
+            'humidity_low': humidity_threshold,
+            'ph_min': ph_min,
+            'ph_max': ph_max
+        })
 
         if alerts:
             for alert in alerts:
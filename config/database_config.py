@@ -13,7 +13,9 @@ SEQUENCES = {
     'sensor': 'sensor_seq',
     'leitura': 'leitura_seq',
     'ajuste': 'ajuste_seq',
-    'leitura_solo': 'leitura_solo_seq'
+    'leitura_solo': 'leitura_solo_seq',
+    'previsao_irrigacao': 'previsao_irrigacao_seq',
+    'predicao_leitura_solo': 'predicao_leitura_solo_seq'
 }
 
 # Configurações das tabelas
@@ -98,5 +100,31 @@ TABLES = {
             'irrigacao VARCHAR(20) NOT NULL',
             'FOREIGN KEY (id_sensor) REFERENCES sensor(id_sensor)'
         ]
+    },
+    'previsao_irrigacao': {
+        'name': 'previsao_irrigacao',
+        'columns': [
+            'id_previsao SERIAL PRIMARY KEY',
+            'id_lote INTEGER NOT NULL',
+            'timestamp TIMESTAMP NOT NULL',
+            'umidade_prevista NUMERIC(5,2)',
+            'probabilidade_irrigacao NUMERIC(5,2)',
+            'confianca_modelo NUMERIC(5,2)',
+            'FOREIGN KEY (id_lote) REFERENCES lote(id_lote)'
+        ]
+    },
+    'predicao_leitura_solo': {
+        'name': 'predicao_leitura_solo',
+        'columns': [
+            'id_predicao SERIAL PRIMARY KEY',
+            'id_leitura_solo INTEGER NOT NULL',
+            'versao_modelo VARCHAR(64) NOT NULL',
+            'data_hora TIMESTAMP NOT NULL',
+            'irrigacao_prevista BOOLEAN NOT NULL',
+            'probabilidade_irrigacao NUMERIC(5,2) NOT NULL',
+            'confianca_modelo NUMERIC(5,2) NOT NULL',
+            'UNIQUE (id_leitura_solo, versao_modelo)',
+            'FOREIGN KEY (id_leitura_solo) REFERENCES leitura_solo(id_leitura_solo)'
+        ]
     }
 }
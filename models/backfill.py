@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+from models.training_data import leitura_solo_features
+
+
+LEITURA_SOLO_ID_RANGE_QUERY = "SELECT MIN(id_leitura_solo), MAX(id_leitura_solo) FROM leitura_solo"
+
+LEITURA_SOLO_RANGE_QUERY = """
+    SELECT
+        id_leitura_solo,
+        umidade::float8,
+        ph::float8,
+        fosforo_ok::int,
+        potassio_ok::int
+    FROM leitura_solo
+    WHERE id_leitura_solo BETWEEN %s AND %s
+    ORDER BY id_leitura_solo
+"""
+
+
+# Tamanho máximo de versao_modelo na tabela predicao_leitura_solo
+MODEL_VERSION_MAX_LENGTH = 64
+
+
+def artifact_model_version(artifact_path):
+    """
+    Rótulo de versao_modelo de um artefato: nome do arquivo seguido do hash
+    do seu conteúdo.
+
+    No cache, o nome já traz a impressão digital do treino (versão dos
+    dados e hiperparâmetros); o hash do conteúdo distingue um modelo
+    retreinado e regravado no mesmo caminho, cujas predições não podem
+    ser tomadas como já feitas pelo checkpoint nem descartadas pelo
+    ON CONFLICT de insert_predicoes_leitura.
+
+    Returns:
+        str: ex.: 'irrigation_model_3bf76c581a880135-1a2b3c4d5e6f'
+    """
+    digest = hashlib.sha256()
+    with open(artifact_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+
+    suffix = f'-{digest.hexdigest()[:12]}'
+    name = os.path.splitext(os.path.basename(artifact_path))[0]
+    return name[:MODEL_VERSION_MAX_LENGTH - len(suffix)] + suffix
+
+
+def plan_ranges(min_id, max_id, range_size):
+    """
+    Divide o intervalo de ids [min_id, max_id] em faixas fechadas de até
+    range_size ids.
+
+    Returns:
+        list: tuplas (início, fim)
+    """
+    if min_id is None or max_id is None:
+        return []
+    return [(start, min(start + range_size - 1, max_id))
+            for start in range(min_id, max_id + 1, range_size)]
+
+
+class BackfillCheckpoint:
+    """
+    Registro das faixas já concluídas de um backfill, em um arquivo JSON
+    lines (uma faixa por linha). Cada linha é gravada depois do commit da
+    faixa no banco, então uma execução interrompida recomeça das faixas
+    que faltam.
+    """
+
+    def __init__(self, filepath, model_version):
+        self.filepath = filepath
+        self.model_version = model_version
+        self.done = set()
+
+        if os.path.exists(filepath):
+            with open(filepath) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry['model_version'] == model_version:
+                        self.done.add((entry['start'], entry['end']))
+
+    def pending(self, ranges):
+        return [r for r in ranges if tuple(r) not in self.done]
+
+    def mark_done(self, start, end, n_rows):
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        os.makedirs(directory, exist_ok=True)
+
+        entry = {'model_version': self.model_version, 'start': start, 'end': end, 'rows': n_rows}
+        with open(self.filepath, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.add((start, end))
+
+
+# Estado de cada processo do pool: conexão e cópia do modelo próprias
+_worker = {}
+
+
+def _init_worker(artifact_path, inference_backend):
+    # Importações tardias: o driver do PostgreSQL só é exigido nos workers
+    from src.database import DatabaseManager
+    from models.irrigation_model import IrrigationModel
+
+    db = DatabaseManager()
+    db.connect()
+    _worker['db'] = db
+    _worker['model'] = IrrigationModel(artifact_path=artifact_path,
+                                       inference_backend=inference_backend)
+
+
+def backfill_range(start, end, model_version, chunk_size=None):
+    """
+    Pontua as leituras de uma faixa de ids e grava as predições.
+
+    Executa em um processo do pool (ver _init_worker), por isso é uma
+    função de módulo.
+
+    Returns:
+        tuple: (início, fim, linhas gravadas)
+    """
+    db = _worker['db']
+    model = _worker['model']
+
+    rows = db.execute_query(LEITURA_SOLO_RANGE_QUERY, (start, end)).fetchall()
+    if not rows:
+        return start, end, 0
+
+    data = np.array(rows, dtype=np.float64)
+    # Leituras inválidas de uma faixa não interrompem o backfill
+    X, valid = leitura_solo_features(data[:, 1], data[:, 2], data[:, 3], data[:, 4],
+                                     allow_empty=True)
+    data = data[valid]
+    if not len(data):
+        return start, end, 0
+    scored = model.score_batch(X, chunk_size=chunk_size)
+
+    timestamp = datetime.now()
+    predicoes = list(zip(
+        data[:, 0].astype(int).tolist(),
+        [model_version] * len(data),
+        [timestamp] * len(data),
+        (scored['prediction'].to_numpy() == 1).tolist(),
+        np.round(scored['probability'].to_numpy() * 100, 2).tolist(),
+        np.round(scored['confidence'].to_numpy() * 100, 2).tolist()
+    ))
+    db.insert_predicoes_leitura(predicoes)
+
+    return start, end, len(predicoes)
+
+
+def run_backfill(ranges, checkpoint, artifact_path, inference_backend=None,
+                 n_jobs=None, chunk_size=None):
+    """
+    Processa as faixas pendentes em um pool de processos, cada um com sua
+    conexão e sua cópia do modelo, e registra as concluídas no checkpoint.
+
+    Args:
+        ranges: faixas de plan_ranges
+        checkpoint: BackfillCheckpoint
+        artifact_path: artefato do modelo carregado por cada worker
+        inference_backend: backend de inferência dos workers (None = o padrão
+                           de IrrigationModel)
+        n_jobs: número de processos (padrão: todos os núcleos)
+        chunk_size: linhas por pedaço em IrrigationModel.score_batch
+
+    Returns:
+        dict: faixas processadas, linhas gravadas, duração e linhas/s
+    """
+    pending = checkpoint.pending(ranges)
+    skipped = len(ranges) - len(pending)
+    if skipped:
+        print(f"Retomando backfill: {skipped} de {len(ranges)} faixas já concluídas")
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    total_rows = 0
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(artifact_path, inference_backend)) as executor:
+        futures = [executor.submit(backfill_range, start, end, checkpoint.model_version, chunk_size)
+                   for start, end in pending]
+        for i, future in enumerate(as_completed(futures), 1):
+            start, end, n_rows = future.result()
+            checkpoint.mark_done(start, end, n_rows)
+            total_rows += n_rows
+
+            elapsed = time.perf_counter() - start_time
+            print(f"[{i}/{len(pending)}] ids {start}-{end}: {n_rows} linhas "
+                  f"({total_rows / elapsed:.0f} linhas/s)")
+
+    duration = time.perf_counter() - start_time
+    return {
+        'ranges': len(pending),
+        'skipped_ranges': skipped,
+        'rows': total_rows,
+        'duration_s': duration,
+        'rows_per_second': total_rows / duration if duration > 0 else 0.0
+    }
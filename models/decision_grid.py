@@ -0,0 +1,177 @@
+import itertools
+import numpy as np
+
+
+class DecisionGrid:
+    """
+    Tabela pré-computada da probabilidade de irrigação sobre uma grade 4-D
+    das features (umidade, pH, fósforo, potássio). Responde consultas em
+    O(1) por célula mais próxima ou por interpolação multilinear.
+    """
+
+    METHODS = ('linear', 'nearest')
+
+    def __init__(self, axes, values, method='linear'):
+        """
+        Args:
+            axes: lista com os pontos (crescentes) de cada eixo da grade
+            values: probabilidade de irrigação em cada ponto, float32
+            method: 'linear' (multilinear) ou 'nearest' (célula mais próxima)
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Método de consulta inválido: {method}")
+
+        self.axes = [np.asarray(axis, dtype=np.float64) for axis in axes]
+        for i, axis in enumerate(self.axes):
+            if len(axis) < 2 or not np.all(np.diff(axis) > 0):
+                raise ValueError(f"Eixo {i} da grade precisa ser estritamente crescente")
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+        self.method = method
+
+        self._low = np.array([axis[0] for axis in self.axes])
+        self._high = np.array([axis[-1] for axis in self.axes])
+        self._shape = np.array(self.values.shape)
+        self._strides = np.array(
+            [int(np.prod(self.values.shape[i + 1:])) for i in range(self.values.ndim)])
+        self._flat = self.values.ravel()
+
+        # Cantos do hipercubo de interpolação e seus deslocamentos na grade
+        self._corners = np.array(list(itertools.product((0, 1), repeat=self.values.ndim)))
+        self._corner_offsets = self._corners @ self._strides
+
+    @staticmethod
+    def _resolution_per_axis(resolution, n_axes):
+        if np.isscalar(resolution):
+            resolution = (int(resolution),) * n_axes
+        resolution = tuple(int(r) for r in resolution)
+        if len(resolution) != n_axes or min(resolution) < 2:
+            raise ValueError(f"Resolução inválida para {n_axes} eixos: {resolution}")
+        return resolution
+
+    @classmethod
+    def build(cls, proba_fn, bounds, resolution=16, method='linear', chunk_size=100_000):
+        """
+        Avalia o modelo em todos os pontos da grade.
+
+        Args:
+            proba_fn: função que recebe uma matriz de features e retorna a
+                      probabilidade de irrigação de cada linha
+            bounds: lista de (mínimo, máximo) por feature
+            resolution: pontos por eixo (inteiro ou um valor por eixo)
+            method: método de consulta
+            chunk_size: linhas avaliadas por chamada a proba_fn
+
+        Returns:
+            DecisionGrid: grade pronta para consulta
+
+        Raises:
+            ValueError: se algum eixo tem máximo menor ou igual ao mínimo
+                        (ex.: uma cultura com ph_min == ph_max)
+        """
+        resolution = cls._resolution_per_axis(resolution, len(bounds))
+        for i, (low, high) in enumerate(bounds):
+            if not high > low:
+                raise ValueError(f"Limites degenerados no eixo {i} da grade: ({low}, {high})")
+        axes = [np.linspace(low, high, n) for (low, high), n in zip(bounds, resolution)]
+
+        mesh = np.meshgrid(*axes, indexing='ij')
+        points = np.column_stack([m.ravel() for m in mesh])
+
+        values = np.empty(len(points), dtype=np.float32)
+        for start in range(0, len(points), chunk_size):
+            end = start + chunk_size
+            values[start:end] = proba_fn(points[start:end])
+
+        return cls(axes, values.reshape(resolution), method=method)
+
+    @property
+    def resolution(self):
+        return tuple(self.values.shape)
+
+    def _positions(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        position = (X - self._low) / (self._high - self._low) * (self._shape - 1)
+        return np.clip(position, 0, self._shape - 1)
+
+    def query(self, X):
+        """
+        Consulta a probabilidade de irrigação.
+
+        Valores fora dos limites da grade são saturados na borda.
+
+        Args:
+            X: array (n_samples, n_features) de features brutas
+
+        Returns:
+            numpy.ndarray: probabilidade de irrigação de cada linha (float64)
+        """
+        position = self._positions(X)
+
+        if self.method == 'nearest':
+            index = np.rint(position).astype(np.intp)
+            return self._flat[index @ self._strides].astype(np.float64)
+
+        base = np.minimum(np.floor(position).astype(np.intp), self._shape - 2)
+        frac = position[:, np.newaxis, :] - base[:, np.newaxis, :]
+        weights = np.prod(np.where(self._corners, frac, 1.0 - frac), axis=2)
+        corner_values = self._flat[(base @ self._strides)[:, np.newaxis] + self._corner_offsets]
+
+        return np.sum(weights * corner_values, axis=1)
+
+    def predict_proba(self, X):
+        """
+        Probabilidades no formato do sklearn ([não irrigar, irrigar]).
+        """
+        probability = self.query(X)
+        return np.column_stack([1.0 - probability, probability])
+
+    def error_report(self, proba_fn, X):
+        """
+        Compara a grade com o modelo de referência.
+
+        Args:
+            proba_fn: função de referência (probabilidade de irrigação)
+            X: amostras de features para a comparação
+
+        Returns:
+            dict: erro máximo/médio de probabilidade e concordância da decisão
+        """
+        reference = proba_fn(X)
+        approx = self.query(X)
+        error = np.abs(approx - reference)
+
+        return {
+            'resolution': self.resolution,
+            'method': self.method,
+            'max_abs_error': float(error.max()),
+            'mean_abs_error': float(error.mean()),
+            'decision_agreement': float(np.mean((approx > 0.5) == (reference > 0.5))),
+            'size_bytes': int(self.values.nbytes)
+        }
+
+    def save(self, filepath):
+        """
+        Salva a grade em formato .npz (valores float32 e eixos).
+
+        Args:
+            filepath: caminho ou objeto de arquivo de destino
+        """
+        arrays = {f'axis_{i}': axis for i, axis in enumerate(self.axes)}
+        np.savez(filepath, values=self.values, **arrays)
+
+    @classmethod
+    def load(cls, filepath, method='linear'):
+        """
+        Carrega uma grade salva por save().
+
+        Args:
+            filepath: caminho do arquivo .npz
+            method: método de consulta
+
+        Returns:
+            DecisionGrid: grade carregada
+        """
+        with np.load(filepath) as data:
+            values = data['values']
+            axes = [data[f'axis_{i}'] for i in range(values.ndim)]
+        return cls(axes, values, method=method)
@@ -0,0 +1,164 @@
+import math
+
+import numpy as np
+
+
+class DriftMonitor:
+    """
+    Monitor de deriva das features de entrada do modelo.
+
+    Cada feature tem um histograma de bins fixos (uniformes dentro dos
+    limites da feature, mais um bin de underflow e um de overflow) para as
+    leituras de referência e outro para a janela deslizante das últimas
+    window_size leituras. A janela guarda apenas o índice do bin de cada
+    leitura, então cada atualização custa O(1) e a memória é constante.
+    Leituras com algum valor ausente ou não finito ficam fora da janela e
+    são contadas em n_skipped.
+    """
+
+    def __init__(self, reference, bounds, feature_names, n_bins=20, window_size=1000):
+        """
+        Args:
+            reference: matriz (n, n_features) das leituras de referência
+            bounds: lista de (mínimo, máximo) por feature
+            feature_names: nomes das features, na ordem das colunas
+            n_bins: bins dentro dos limites de cada feature
+            window_size: leituras mantidas na janela ao vivo
+        """
+        self.feature_names = list(feature_names)
+        self.n_bins = n_bins
+        self.window_size = window_size
+
+        bounds = np.asarray(bounds, dtype=np.float64)
+        self._low = bounds[:, 0]
+        self._scale = n_bins / (bounds[:, 1] - bounds[:, 0])
+        # Cópias em listas Python para o caminho de uma leitura (sem NumPy)
+        self._low_list = self._low.tolist()
+        self._scale_list = self._scale.tolist()
+
+        reference = np.atleast_2d(np.asarray(reference, dtype=np.float64))
+        reference = reference[np.isfinite(reference).all(axis=1)]
+
+        n_features = len(self.feature_names)
+        self.reference_counts = np.zeros((n_features, n_bins + 2), dtype=np.int64)
+        for j, column in enumerate(self.bin_indices(reference).T):
+            self.reference_counts[j] = np.bincount(column, minlength=n_bins + 2)
+
+        self._live_counts = [[0] * (n_bins + 2) for _ in range(n_features)]
+        self._window = [None] * window_size
+        self._position = 0
+        self.n_live = 0
+        self.n_skipped = 0
+
+    @classmethod
+    def from_model(cls, model, reference, n_bins=20, window_size=1000):
+        """
+        Cria o monitor com os limites e a ordem das features de um
+        IrrigationModel.
+
+        A referência deve vir da mesma fonte das leituras monitoradas
+        (leituras reais recentes ou do mesmo gerador): os dados sintéticos
+        de treinamento do modelo têm outra distribuição e fariam todas as
+        features parecerem derivar.
+
+        Args:
+            model: IrrigationModel
+            reference: DataFrame com as colunas das features ou matriz
+                       (n, n_features) de leituras de referência
+        """
+        if hasattr(reference, 'columns'):
+            reference = reference[model.feature_names].to_numpy(dtype=np.float64)
+
+        bounds = [model.profile.bounds[name] for name in model.feature_names]
+        return cls(reference, bounds, model.feature_names, n_bins, window_size)
+
+    def bin_indices(self, X):
+        """
+        Índices dos bins de uma matriz de leituras (0 = underflow,
+        n_bins + 1 = overflow).
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        bins = np.floor((X - self._low) * self._scale).astype(np.int64) + 1
+        return np.clip(bins, 0, self.n_bins + 1)
+
+    def update(self, reading):
+        """
+        Adiciona uma leitura (dict com as features) à janela ao vivo.
+        """
+        n_bins = self.n_bins
+        bins = []
+        for j, name in enumerate(self.feature_names):
+            value = reading[name]
+            if value is None or not math.isfinite(value):
+                self.n_skipped += 1
+                return
+            index = int((value - self._low_list[j]) * self._scale_list[j] // 1) + 1
+            bins.append(0 if index < 0 else n_bins + 1 if index > n_bins + 1 else index)
+        self._push(bins)
+
+    def update_batch(self, X):
+        """
+        Adiciona um lote de leituras (matriz n x n_features) à janela ao vivo.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        finite = np.isfinite(X).all(axis=1)
+        if not finite.all():
+            self.n_skipped += int(np.count_nonzero(~finite))
+            X = X[finite]
+
+        for bins in self.bin_indices(X)[-self.window_size:].tolist():
+            self._push(bins)
+
+    def _push(self, bins):
+        evicted = self._window[self._position]
+        if evicted is not None:
+            for counts, index in zip(self._live_counts, evicted):
+                counts[index] -= 1
+        else:
+            self.n_live += 1
+
+        for counts, index in zip(self._live_counts, bins):
+            counts[index] += 1
+
+        self._window[self._position] = bins
+        self._position = (self._position + 1) % self.window_size
+
+    @property
+    def live_counts(self):
+        return np.array(self._live_counts, dtype=np.int64)
+
+    def drift_scores(self, epsilon=1e-4):
+        """
+        Calcula a deriva da janela ao vivo em relação à referência.
+
+        Args:
+            epsilon: proporção mínima por bin no PSI (evita log de zero)
+
+        Returns:
+            dict: {feature: {'psi': índice de estabilidade populacional,
+                             'ks': estatística de Kolmogorov-Smirnov sobre
+                                   os histogramas}}; vazio sem leituras
+        """
+        if self.n_live == 0:
+            return {}
+
+        reference = self.reference_counts / self.reference_counts.sum(axis=1, keepdims=True)
+        live = self.live_counts / self.n_live
+
+        ref_safe = np.maximum(reference, epsilon)
+        live_safe = np.maximum(live, epsilon)
+        psi = np.sum((live_safe - ref_safe) * np.log(live_safe / ref_safe), axis=1)
+        ks = np.max(np.abs(np.cumsum(live, axis=1) - np.cumsum(reference, axis=1)), axis=1)
+
+        return {name: {'psi': float(psi[j]), 'ks': float(ks[j])}
+                for j, name in enumerate(self.feature_names)}
+
+    def drifted_features(self, psi_threshold=0.2, ks_threshold=None):
+        """
+        Returns:
+            list: features cujo PSI (ou KS, se ks_threshold for informado)
+                  passa do limiar. PSI > 0,2 costuma indicar deriva relevante.
+        """
+        return [name for name, scores in self.drift_scores().items()
+                if scores['psi'] > psi_threshold
+                or (ks_threshold is not None and scores['ks'] > ks_threshold)]
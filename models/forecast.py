@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from models.training_data import leitura_solo_features
+
+
+# Última leitura de solo de cada lote, em uma única consulta
+LATEST_READING_PER_LOT_QUERY = """
+    SELECT DISTINCT ON (s.id_lote)
+        s.id_lote,
+        ls.id_sensor,
+        ls.umidade::float8,
+        ls.ph::float8,
+        ls.fosforo_ok::int,
+        ls.potassio_ok::int
+    FROM leitura_solo ls
+    JOIN sensor s ON s.id_sensor = ls.id_sensor
+    ORDER BY s.id_lote, ls.data_hora DESC, ls.id_leitura_solo DESC
+"""
+
+
+def load_latest_readings(db):
+    """
+    Carrega a última leitura de solo de cada lote. Lotes cuja última
+    leitura está fora da faixa física ficam sem previsão nesta execução;
+    se nenhum lote tiver leitura válida, o resultado é vazio.
+
+    Args:
+        db: DatabaseManager conectado
+
+    Returns:
+        pandas.DataFrame: id_lote, id_sensor e as colunas de features do modelo
+    """
+    rows = db.execute_query(LATEST_READING_PER_LOT_QUERY).fetchall()
+    data = np.array(rows, dtype=np.float64).reshape(-1, 6)
+
+    features, valid = leitura_solo_features(data[:, 2], data[:, 3], data[:, 4], data[:, 5],
+                                            allow_empty=True)
+    data = data[valid]
+    readings = pd.DataFrame(features, columns=['humidity', 'ph', 'phosphorus', 'potassium'])
+    readings.insert(0, 'id_lote', data[:, 0].astype(int))
+    readings.insert(1, 'id_sensor', data[:, 1].astype(int))
+    return readings
+
+
+def build_forecasts(model, readings, timestamp, chunk_size=None):
+    """
+    Pontua as leituras e monta as linhas da tabela previsao_irrigacao.
+
+    A umidade prevista é a última umidade medida (previsão de persistência):
+    o modelo estima a necessidade de irrigação, não a umidade futura.
+    Probabilidade e confiança são gravadas em porcentagem.
+
+    Args:
+        model: IrrigationModel treinado
+        readings: DataFrame de load_latest_readings
+        timestamp: horário da previsão
+        chunk_size: linhas por pedaço em IrrigationModel.score_batch
+
+    Returns:
+        list: tuplas (id_lote, timestamp, umidade_prevista,
+              probabilidade_irrigacao, confianca_modelo)
+    """
+    scored = model.score_batch(readings, chunk_size=chunk_size)
+
+    return list(zip(
+        scored['id_lote'].tolist(),
+        [timestamp] * len(scored),
+        np.round(readings['humidity'].to_numpy(), 2).tolist(),
+        np.round(scored['probability'].to_numpy() * 100, 2).tolist(),
+        np.round(scored['confidence'].to_numpy() * 100, 2).tolist()
+    ))
@@ -0,0 +1,161 @@
+import itertools
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+
+# Espaço de busca padrão dos hiperparâmetros da floresta
+DEFAULT_PARAM_GRID = {
+    'n_estimators': [25, 50, 100, 200],
+    'max_depth': [6, 8, 10, 14, None],
+    'min_samples_split': [5],
+    'min_samples_leaf': [1, 2, 4]
+}
+
+
+def grid_candidates(param_grid):
+    """
+    Gera todas as combinações de uma grade de hiperparâmetros.
+
+    Args:
+        param_grid: dict {parâmetro: lista de valores}
+
+    Returns:
+        list: lista de dicts de hiperparâmetros
+    """
+    names = sorted(param_grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(param_grid[name] for name in names))]
+
+
+def random_candidates(param_grid, n_iter, seed=42):
+    """
+    Sorteia combinações distintas de uma grade de hiperparâmetros.
+
+    Args:
+        param_grid: dict {parâmetro: lista de valores}
+        n_iter: número máximo de combinações
+        seed: semente do sorteio
+
+    Returns:
+        list: lista de dicts de hiperparâmetros
+    """
+    candidates = grid_candidates(param_grid)
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(candidates))[:n_iter]
+    return [candidates[i] for i in order]
+
+
+def split_validation(X_train, y_train, validation_size=0.25, random_state=42):
+    """
+    Separa uma parte do conjunto de treino para a escolha dos
+    hiperparâmetros. O conjunto de teste fica fora da busca e mede apenas
+    o modelo final.
+
+    Args:
+        X_train, y_train: conjunto de treino
+        validation_size: fração usada na validação (estratificada)
+        random_state: semente da divisão
+
+    Returns:
+        tuple: X_fit, X_val, y_fit, y_val
+    """
+    return train_test_split(X_train, y_train, test_size=validation_size,
+                            random_state=random_state, stratify=y_train)
+
+
+def evaluate_candidate(params, X_train, y_train, X_val, y_val,
+                       random_state=42, latency_rows=200):
+    """
+    Treina e avalia uma combinação de hiperparâmetros.
+
+    Executa em um processo do pool, por isso é uma função de módulo.
+
+    Returns:
+        dict: hiperparâmetros, acurácia na validação, tempo de treino,
+              latência de inferência de uma linha (mediana, µs) e tamanho
+              serializado
+    """
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_val_scaled = scaler.transform(X_val)
+
+    model = RandomForestClassifier(random_state=random_state, n_jobs=1, **params)
+
+    start = time.perf_counter()
+    model.fit(X_train_scaled, y_train)
+    fit_time = time.perf_counter() - start
+
+    accuracy = accuracy_score(y_val, model.predict(X_val_scaled))
+
+    latencies = []
+    for row in X_val[:latency_rows]:
+        start = time.perf_counter()
+        model.predict_proba(scaler.transform(row[np.newaxis, :]))
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        'params': params,
+        'accuracy': float(accuracy),
+        'fit_time_s': fit_time,
+        'latency_us': float(np.median(latencies) * 1e6),
+        'size_bytes': len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    }
+
+
+def run_search(X_train, y_train, X_val, y_val, candidates, n_jobs=None, random_state=42):
+    """
+    Avalia os candidatos em paralelo em um pool de processos.
+
+    Args:
+        X_train, y_train: dados de treino dos candidatos
+        X_val, y_val: dados de validação da escolha (ver split_validation;
+                      não use o conjunto de teste)
+        candidates: lista de dicts de hiperparâmetros
+        n_jobs: número de processos (padrão: todos os núcleos)
+        random_state: semente das florestas
+
+    Returns:
+        list: resultados de evaluate_candidate, na ordem dos candidatos
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    if n_jobs == 1:
+        return [evaluate_candidate(params, X_train, y_train, X_val, y_val, random_state)
+                for params in candidates]
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [executor.submit(evaluate_candidate, params, X_train, y_train,
+                                   X_val, y_val, random_state)
+                   for params in candidates]
+        return [future.result() for future in futures]
+
+
+def select_best(results, max_latency_us=None, max_size_bytes=None):
+    """
+    Escolhe o candidato mais preciso (na validação) dentro do orçamento de
+    latência e tamanho.
+
+    Empates de acurácia são desfeitos pela menor latência e depois pelo
+    menor tamanho.
+
+    Returns:
+        dict: resultado vencedor ou None se nenhum couber no orçamento
+    """
+    eligible = [
+        result for result in results
+        if (max_latency_us is None or result['latency_us'] <= max_latency_us)
+        and (max_size_bytes is None or result['size_bytes'] <= max_size_bytes)
+    ]
+
+    if not eligible:
+        return None
+
+    return max(eligible, key=lambda r: (r['accuracy'], -r['latency_us'], -r['size_bytes']))
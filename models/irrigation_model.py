@@ -4,13 +4,250 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.preprocessing import StandardScaler
+import sklearn
 import joblib
+import hashlib
+import json
 import os
+import tempfile
+import threading
+from collections import namedtuple
+
+from models.tree_engine import FlatForest, ARRAYS_MAGIC
+from models.decision_grid import DecisionGrid
+from models.rules import DEFAULT_RULES_ENGINE, RulesEngine
+from models.permutation_importance import compute_permutation_importance
+
+
+# Diretório padrão do cache de artefatos do modelo (pode ser sobrescrito
+# pela variável de ambiente IRRIGATION_MODEL_CACHE)
+DEFAULT_ARTIFACT_DIR = os.environ.get(
+    'IRRIGATION_MODEL_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts')
+)
+
+
+# Features do modelo, na ordem das colunas
+FEATURE_NAMES = ('humidity', 'ph', 'phosphorus', 'potassium')
+
+# Estado de inferência imutável: modelo, scaler, motor e importâncias sempre
+# trocados juntos, com um contador de versão (ver IrrigationModel.swap_model).
+# Nos modos compacto e de arrays mapeados em memória, model e scaler são None
+# e só o motor é mantido.
+ModelState = namedtuple('ModelState', ['model', 'scaler', 'engine', 'version', 'importances'])
+
+
+class CultureProfile(namedtuple('CultureProfile', [
+        'name', 'distributions', 'bounds', 'humidity_thresholds', 'ph_range', 'nutrient_minimums'])):
+    """
+    Parâmetros agronômicos de uma cultura usados para gerar os dados de
+    treinamento do modelo.
+
+    Campos:
+        name: nome da cultura
+        distributions: {feature: (média, desvio padrão)} dos dados sintéticos
+        bounds: {feature: (mínimo, máximo)} para saturar os dados
+        humidity_thresholds: umidade (crítica, baixa, moderada, alta) em %
+        ph_range: faixa ideal de pH (mínimo, máximo)
+        nutrient_minimums: {'phosphorus': ppm, 'potassium': ppm} abaixo dos
+                           quais o nutriente é considerado baixo
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_cultura(cls, nome, necessidade_agua_min, necessidade_agua_max,
+                     necessidade_ph_min, necessidade_ph_max):
+        """
+        Deriva o perfil das faixas de necessidade da tabela cultura.
+
+        A umidade e o pH seguem as faixas da cultura. Fósforo e potássio
+        chegam ao modelo como valores representativos em ppm (ver
+        models/training_data.NUTRIENT_PROXY_PPM), por isso mantêm a escala
+        e os limiares do perfil do milho.
+
+        Returns:
+            CultureProfile
+        """
+        water_min, water_max = float(necessidade_agua_min), float(necessidade_agua_max)
+        ph_min, ph_max = float(necessidade_ph_min), float(necessidade_ph_max)
+
+        # Para a faixa do milho (40-70%) isto reproduz os limiares 30/40/50/70
+        # e os limites 15-85% do perfil padrão
+        margin = (water_max - water_min) / 3
+        humidity_mean = water_min + margin
+        humidity_std = (water_max - water_min) / 2
+        ph_mean = (ph_min + ph_max) / 2
+        ph_std = (ph_max - ph_min) / 2
+
+        return cls(
+            name=nome,
+            distributions={
+                'humidity': (humidity_mean, humidity_std),
+                'ph': (ph_mean, ph_std),
+                'phosphorus': CORN_PROFILE.distributions['phosphorus'],
+                'potassium': CORN_PROFILE.distributions['potassium']
+            },
+            bounds={
+                'humidity': (max(0.0, water_min - 2.5 * margin), min(100.0, water_max + 1.5 * margin)),
+                'ph': (max(0.0, ph_mean - 3 * ph_std), ph_mean + 3 * ph_std),
+                'phosphorus': CORN_PROFILE.bounds['phosphorus'],
+                'potassium': CORN_PROFILE.bounds['potassium']
+            },
+            humidity_thresholds=(water_min - margin, water_min, water_min + margin, water_max),
+            ph_range=(ph_min, ph_max),
+            nutrient_minimums=dict(CORN_PROFILE.nutrient_minimums)
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstrói um perfil salvo com _asdict() (listas voltam a ser tuplas).
+        """
+        return cls(
+            name=data['name'],
+            distributions={k: tuple(v) for k, v in data['distributions'].items()},
+            bounds={k: tuple(v) for k, v in data['bounds'].items()},
+            humidity_thresholds=tuple(data['humidity_thresholds']),
+            ph_range=tuple(data['ph_range']),
+            nutrient_minimums=dict(data['nutrient_minimums'])
+        )
+
+
+# Perfil padrão: milho (os parâmetros originais do modelo)
+CORN_PROFILE = CultureProfile(
+    name='Milho',
+    distributions={
+        'humidity': (50, 15),     # Umidade média 50%
+        'ph': (6.5, 0.5),         # pH ideal 6.0-7.0
+        'phosphorus': (25, 10),   # Fósforo em ppm
+        'potassium': (150, 30)    # Potássio em ppm
+    },
+    bounds={
+        'humidity': (15, 85),
+        'ph': (5.5, 8.0),
+        'phosphorus': (5, 50),
+        'potassium': (80, 250)
+    },
+    humidity_thresholds=(30, 40, 50, 70),
+    ph_range=(6.0, 7.0),
+    nutrient_minimums={'phosphorus': 15, 'potassium': 120}
+)
+
+
+def _umask_file_mode():
+    # os.umask só permite ler a máscara trocando-a; feito uma vez, na importação
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Permissões de um arquivo criado normalmente (open) pelo processo
+ARTIFACT_FILE_MODE = _umask_file_mode()
+
+
+def _atomic_write(filepath, write_fn):
+    """
+    Grava um arquivo de forma atômica: escreve em um arquivo temporário no
+    mesmo diretório e renomeia, para que processos concorrentes nunca leiam
+    um arquivo parcial.
+
+    O temporário de mkstemp nasce com modo 0600; antes da renomeação ele
+    recebe as permissões derivadas da umask, para que artefatos possam ser
+    compartilhados entre usuários e processos (ex.: layout 'arrays').
+
+    Args:
+        filepath: caminho final do arquivo
+        write_fn: função que recebe o objeto de arquivo binário e o escreve
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write_fn(f)
+        os.chmod(tmp_path, ARTIFACT_FILE_MODE)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def generate_training_data(profile, n_samples, seed, feature_names=FEATURE_NAMES):
+    """
+    Gera dados de treinamento baseados nas características ideais de uma
+    cultura.
+
+    Args:
+        profile: CultureProfile da cultura
+        n_samples: número de amostras
+        seed: semente do gerador
+        feature_names: features geradas, na ordem das colunas
+
+    Returns:
+        pandas.DataFrame: features e rótulo irrigation_needed
+    """
+    # Gerador próprio para reprodutibilidade, sem alterar o estado
+    # global de np.random (usado pelo gerador de leituras do dashboard)
+    rng = np.random.RandomState(seed)
+
+    features = {}
+    for name in feature_names:
+        # Gerar features baseadas em condições reais da cultura
+        values = rng.normal(*profile.distributions[name], n_samples)
+        features[name] = np.clip(values, *profile.bounds[name])  # Limitar range realista
+
+    humidity, ph = features['humidity'], features['ph']
+    critical, low, moderate, high = profile.humidity_thresholds
+
+    # Criar labels baseados em regras agronômicas (aritmética de máscaras)
+    score = np.zeros(n_samples)
+
+    # Umidade baixa = precisa irrigar
+    score += np.select(
+        [humidity < low, humidity < moderate, humidity > high],
+        [3, 1, -2],
+        default=0
+    )
+
+    # pH fora do range ideal
+    score += (ph < profile.ph_range[0]) | (ph > profile.ph_range[1])
+
+    # Nutrientes baixos podem indicar necessidade de irrigação
+    score += features['phosphorus'] < profile.nutrient_minimums['phosphorus']
+    score += features['potassium'] < profile.nutrient_minimums['potassium']
+
+    # Condições extremas
+    score += 2 * (humidity < critical)
+
+    # Adicionar ruído para tornar mais realista (um único sorteio em lote)
+    score += rng.normal(0, 0.5, n_samples)
+
+    # Converter score para decisão binária
+    irrigation_needed = (score > 1.5).astype(float)
+
+    # Criar DataFrame
+    data = pd.DataFrame({**features, 'irrigation_needed': irrigation_needed})
+
+    return data
+
+
+def split_training_data(X, y):
+    """
+    Divide features e rótulos em treino e teste (80/20 estratificado).
+
+    Returns:
+        tuple: X_train, X_test, y_train, y_test
+    """
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 
 
 class IrrigationModel:
     """
-    Modelo preditivo para sistema de irrigação automatizada de milho.
+    Modelo preditivo para sistema de irrigação automatizada (por padrão, de
+    milho; outras culturas via CultureProfile).
     Usa Random Forest para predizer necessidade de irrigação baseado em:
     - Umidade do solo (%)
     - pH do solo
@@ -18,114 +255,545 @@ class IrrigationModel:
     - Níveis de potássio (ppm)
     """
 
-    def __init__(self):
-        self.model = None
-        self.scaler = StandardScaler()
-        self.feature_names = ['humidity', 'ph', 'phosphorus', 'potassium']
+    # Configuração de treinamento (faz parte da impressão digital do cache)
+    TRAINING_SAMPLES = 1000
+    RANDOM_SEED = 42
+    # Versão do gerador de dados sintéticos e da regra de rótulos
+    # (generate_training_data): incremente ao alterá-los, para que os
+    # artefatos treinados com a versão anterior deixem de ser reutilizados
+    TRAINING_DATA_VERSION = 1
+    MODEL_PARAMS = {
+        'n_estimators': 100,
+        'max_depth': 10,
+        'min_samples_split': 5,
+        'min_samples_leaf': 2,
+        'random_state': 42
+    }
+
+    # Limites das features do perfil padrão (os mesmos usados para saturar
+    # os dados de treino; cada instância usa self.profile.bounds)
+    FEATURE_BOUNDS = CORN_PROFILE.bounds
+
+    # Backends de inferência: 'sklearn' (RandomForest original), 'flat'
+    # (árvores exportadas para arrays NumPy, ver models/tree_engine.py) ou
+    # 'grid' (tabela pré-computada, ver models/decision_grid.py) ou
+    # 'compact' (floresta reduzida, ver compact()). 'flat' é o caminho de
+    # baixa latência para uma linha; em lotes grandes, 'sklearn' e 'grid'
+    # têm vazão bem maior.
+    INFERENCE_BACKENDS = ('sklearn', 'flat', 'grid', 'compact')
+    # Backends que podem ser escolhidos na construção (ex.: opções de linha
+    # de comando); 'compact' só existe após compact() ou ao carregar um
+    # artefato compacto, que já ativa esse backend
+    SELECTABLE_BACKENDS = ('sklearn', 'flat', 'grid')
+
+    # Opções avaliadas por compact() (árvores mantidas e profundidade máxima)
+    COMPACT_TREE_OPTIONS = (10, 25, 50, 75, 100)
+    COMPACT_DEPTH_OPTIONS = (4, 6, 8, 10)
+    # Amostras sintéticas de validação usadas na escolha (com 5000, 1 p.p.
+    # equivale a 50 amostras, e não a 2 como no teste de 200)
+    COMPACT_VALIDATION_SAMPLES = 5000
+
+    # Rótulos das features exibidos no dashboard
+    FEATURE_LABELS = {
+        'humidity': 'Umidade',
+        'ph': 'pH',
+        'phosphorus': 'Fósforo',
+        'potassium': 'Potássio'
+    }
+
+    # Pontuação em lote (frota de sensores)
+    BATCH_CHUNK_SIZE = 50_000
+    KEY_COLUMNS = ['id_sensor', 'id_lote']
+
+    def __init__(self, use_cache=True, cache_dir=None, n_samples=None,
+                 inference_backend=None, grid_resolution=16, grid_method='linear',
+                 model_params=None, artifact_path=None, mmap=True, profile=None, train=True):
+        """
+        Args:
+            use_cache: se True, reutiliza o artefato salvo para a mesma
+                       configuração de treinamento e só treina em caso de falta
+            cache_dir: diretório dos artefatos (padrão: DEFAULT_ARTIFACT_DIR)
+            n_samples: tamanho do conjunto de treinamento sintético
+                       (padrão: TRAINING_SAMPLES)
+            inference_backend: 'sklearn', 'flat' ou 'grid' (ver SELECTABLE_BACKENDS;
+                               'compact' é ativado por compact()). Padrão:
+                               'sklearn'; artefatos carregados apenas como
+                               arrays usam o backend gravado e não aceitam
+                               outro
+            grid_resolution: pontos por eixo da grade do backend 'grid'
+            grid_method: consulta da grade, 'linear' ou 'nearest'
+            model_params: hiperparâmetros da floresta (padrão: MODEL_PARAMS)
+            artifact_path: carrega este artefato em vez de usar o cache ou treinar
+            mmap: mapeia em memória artefatos no layout 'arrays' (ver load_model)
+            profile: CultureProfile da cultura (padrão: CORN_PROFILE)
+            train: se False (e sem artifact_path), não treina nem consulta o
+                   cache: o modelo fica vazio até fit ou load_model (ex.:
+                   treino com o histórico real)
+        """
+        self._state = ModelState(None, StandardScaler(), None, 0, None)
+        self._swap_lock = threading.Lock()
+        self.feature_names = list(FEATURE_NAMES)
         self.is_trained = False
-        self._train_model()
+        self.accuracy = None
+        self.n_samples = n_samples or self.TRAINING_SAMPLES
+        self.model_params = dict(model_params or self.MODEL_PARAMS)
+        self.cache_dir = cache_dir or DEFAULT_ARTIFACT_DIR
+        self.artifact_path = None
+        self.inference_backend = 'sklearn'
+        self.grid_resolution = grid_resolution
+        self.grid_method = grid_method
+        self.compact_settings = None
+        self.profile = profile or CORN_PROFILE
+        self._rules_engine = (CORN_PROFILE, DEFAULT_RULES_ENGINE)
+        # Importância por permutação da versão em uso (ver get_permutation_importance)
+        self._permutation_cache = None
+
+        if artifact_path is not None:
+            self.load_model(artifact_path, mmap=mmap)
+        elif not train:
+            pass
+        elif use_cache:
+            self._load_or_train()
+        else:
+            self._train_model()
 
-    def _generate_training_data(self, n_samples=1000):
+        if self.model is not None or not self.is_trained:
+            self.set_inference_backend(inference_backend or 'sklearn')
+        elif inference_backend not in (None, self.inference_backend):
+            raise ValueError(f"Artefato {self.artifact_path} carregado apenas como arrays, sem o "
+                             f"estimador do sklearn: só suporta o backend "
+                             f"'{self.inference_backend}', não '{inference_backend}'")
+
+    @property
+    def model(self):
+        return self._state.model
+
+    @property
+    def scaler(self):
+        return self._state.scaler
+
+    @property
+    def _engine(self):
+        return self._state.engine
+
+    @property
+    def version(self):
         """
-        Gera dados de treinamento baseados em características ideais do milho.
+        Versão do modelo em uso (incrementada a cada treino, carga ou troca).
+        """
+        return self._state.version
+
+    def swap_model(self, model, scaler, accuracy=None, artifact_path=None, base_version=None):
+        """
+        Troca atomicamente o par modelo/scaler em uso.
+
+        O motor de inferência do backend selecionado é construído antes da
+        troca, e o novo estado é publicado sob o lock junto com o artefato,
+        a acurácia e a invalidação do cache de importância. Chamadas de
+        predição em andamento continuam usando o estado que leram no
+        início, então nunca misturam modelo e scaler de versões diferentes.
+
+        Args:
+            model: RandomForestClassifier treinado
+            scaler: StandardScaler correspondente
+            accuracy: acurácia de validação do novo modelo
+            artifact_path: artefato de onde o par foi carregado. Com None
+                           (modelo novo), a grade e a importância gravadas ao
+                           lado do artefato anterior não são reaproveitadas
+            base_version: versão em uso quando o candidato foi treinado; se
+                          outro modelo foi publicado depois dela, a troca é
+                          recusada
+
+        Returns:
+            int: versão do novo modelo, ou None se a troca foi recusada
         """
-        np.random.seed(42)  # Para reprodutibilidade
+        if base_version is not None and base_version < self._state.version:
+            return None
 
-        # Gerar features baseadas em condições reais para milho
-        humidity = np.random.normal(50, 15, n_samples)  # Umidade média 50%
-        humidity = np.clip(humidity, 15, 85)  # Limitar range realista
+        engine = self._build_engine(model, scaler, artifact_path)
+        importances = model.feature_importances_
 
-        ph = np.random.normal(6.5, 0.5, n_samples)  # pH ideal 6.0-7.0
-        ph = np.clip(ph, 5.5, 8.0)
+        if self.inference_backend == 'compact':
+            # O modo compacto mantém apenas a floresta reduzida
+            model, scaler = None, None
 
-        phosphorus = np.random.normal(25, 10, n_samples)  # Fósforo em ppm
-        phosphorus = np.clip(phosphorus, 5, 50)
+        with self._swap_lock:
+            # Outra troca pode ter sido publicada enquanto o motor era construído
+            if base_version is not None and base_version < self._state.version:
+                return None
+            version = self._state.version + 1
+            self._state = ModelState(model, scaler, engine, version, importances)
+            self.artifact_path = artifact_path
+            self.accuracy = accuracy
+            self._permutation_cache = None
+            self.is_trained = True
 
-        potassium = np.random.normal(150, 30, n_samples)  # Potássio em ppm
-        potassium = np.clip(potassium, 80, 250)
+        return version
 
-        # Criar labels baseados em regras agronômicas
-        irrigation_needed = np.zeros(n_samples)
+    def _install_engine_only(self, engine, importances, accuracy, backend, artifact_path):
+        """
+        Publica um estado sem os objetos do sklearn (apenas a floresta em
+        arrays), usado pelo modo compacto e pela carga mapeada em memória.
+        """
+        with self._swap_lock:
+            self.inference_backend = backend
+            self._state = ModelState(None, None, engine, self._state.version + 1, importances)
+            self.artifact_path = artifact_path
+            self.accuracy = accuracy
+            self._permutation_cache = None
+            self.is_trained = True
 
-        for i in range(n_samples):
-            score = 0
+    def set_inference_backend(self, backend):
+        """
+        Seleciona o backend de inferência.
 
-            # Umidade baixa = precisa irrigar
-            if humidity[i] < 40:
-                score += 3
-            elif humidity[i] < 50:
-                score += 1
-            elif humidity[i] > 70:
-                score -= 2
+        Args:
+            backend: 'sklearn', 'flat' ou 'grid'
+        """
+        if backend not in self.INFERENCE_BACKENDS:
+            raise ValueError(f"Backend de inferência inválido: {backend}")
+        if backend == 'compact' and self.compact_settings is None:
+            raise ValueError("Use compact() para ativar o backend 'compact'")
+        if backend != self.inference_backend and self.is_trained and self.model is None:
+            raise ValueError("Modelo carregado apenas como arrays só suporta o backend "
+                             f"'{self.inference_backend}'")
 
-            # pH fora do range ideal
-            if ph[i] < 6.0 or ph[i] > 7.0:
-                score += 1
+        self.inference_backend = backend
+        self._refresh_engine()
 
-            # Nutrientes baixos podem indicar necessidade de irrigação
-            if phosphorus[i] < 15:
-                score += 1
-            if potassium[i] < 120:
-                score += 1
+    def _refresh_engine(self):
+        """
+        Reconstrói o motor de inferência do modelo atual (mesma versão).
+        """
+        with self._swap_lock:
+            state = self._state
+            if state.model is None:
+                # Modelo compacto: o motor é o próprio modelo
+                return
+            engine = self._build_engine(state.model, state.scaler, self.artifact_path) \
+                if self.is_trained else None
+            self._state = state._replace(engine=engine)
 
-            # Condições extremas
-            if humidity[i] < 30:
-                score += 2
+    def _build_engine(self, model, scaler, artifact_path):
+        """
+        Constrói o motor de inferência do backend selecionado para um par
+        modelo/scaler (None para o backend 'sklearn'). A grade do backend
+        'grid' é reaproveitada do lado de artifact_path, quando existir.
+        """
+        if self.inference_backend == 'sklearn':
+            return None
+        if self.inference_backend == 'flat':
+            return FlatForest.from_model(model, scaler)
+        if self.inference_backend == 'compact':
+            return FlatForest.from_model(model, scaler).compact(**self.compact_settings)
+        return self._load_or_build_grid(model, scaler, artifact_path)
 
-            # Adicionar ruído para tornar mais realista
-            score += np.random.normal(0, 0.5)
+    def compact(self, max_accuracy_loss=0.01, n_trees_options=None, max_depth_options=None,
+                X_val=None, y_val=None, X_test=None, y_test=None):
+        """
+        Reduz o ensemble para economizar memória e tempo de carga.
 
-            # Converter score para decisão binária
-            irrigation_needed[i] = 1 if score > 1.5 else 0
+        Avalia florestas com menos árvores e menor profundidade (limiares e
+        probabilidades em float32, sem os objetos do sklearn) e ativa a
+        menor delas cuja perda de acurácia em relação ao modelo completo
+        fique dentro do orçamento. A escolha usa um conjunto de validação
+        separado do teste, e a acurácia da floresta escolhida é informada
+        no teste, que não participa da escolha. Após a compactação, o
+        modelo usa o backend 'compact' e save_model grava apenas os arrays
+        da floresta reduzida.
 
-        # Criar DataFrame
-        data = pd.DataFrame({
-            'humidity': humidity,
-            'ph': ph,
-            'phosphorus': phosphorus,
-            'potassium': potassium,
-            'irrigation_needed': irrigation_needed
-        })
+        Args:
+            max_accuracy_loss: perda de acurácia tolerada (ex.: 0.01 = 1 p.p.)
+            n_trees_options: números de árvores avaliados
+            max_depth_options: profundidades avaliadas
+            X_val, y_val: dados da escolha (padrão: COMPACT_VALIDATION_SAMPLES
+                          amostras sintéticas com outra semente, fora do treino)
+            X_test, y_test: dados da acurácia final (padrão: conjunto de
+                            teste sintético, o mesmo de fit)
+
+        Returns:
+            dict: acurácias de referência (validação e teste), candidatos
+                  avaliados e escolhido
+        """
+        state = self._state
+        if state.model is None:
+            if self.compact_settings is not None:
+                raise ValueError("O modelo já está compactado")
+            raise ValueError("Modelo carregado apenas como arrays: o estimador do sklearn, "
+                             "necessário para compact(), não está disponível")
+
+        if X_val is None:
+            data = self._generate_training_data(self.COMPACT_VALIDATION_SAMPLES,
+                                                seed=self.RANDOM_SEED + 1)
+            X_val, y_val = data[self.feature_names].to_numpy(), data['irrigation_needed'].to_numpy()
+        if X_test is None:
+            data = self._generate_training_data(self.n_samples)
+            _, X_test, _, y_test = self.split_training_data(
+                data[self.feature_names].to_numpy(), data['irrigation_needed'].to_numpy())
+
+        full = FlatForest.from_model(state.model, state.scaler)
+        baseline = float(accuracy_score(y_val, full.predict(X_val)))
+
+        candidates = []
+        for n_trees in n_trees_options or self.COMPACT_TREE_OPTIONS:
+            for max_depth in max_depth_options or self.COMPACT_DEPTH_OPTIONS:
+                engine = full.compact(n_trees=n_trees, max_depth=max_depth)
+                accuracy = float(accuracy_score(y_val, engine.predict(X_val)))
+                candidates.append({
+                    'n_trees': engine.n_trees,
+                    'max_depth': engine.max_depth,
+                    'n_nodes': engine.n_nodes,
+                    'nbytes': engine.nbytes,
+                    'accuracy': accuracy,
+                    'engine': engine
+                })
+
+        eligible = [c for c in candidates if baseline - c['accuracy'] <= max_accuracy_loss]
+        if eligible:
+            chosen = min(eligible, key=lambda c: (c['nbytes'], -c['accuracy']))
+        else:
+            chosen = max(candidates, key=lambda c: c['accuracy'])
+        chosen_test_accuracy = float(accuracy_score(y_test, chosen['engine'].predict(X_test)))
+
+        self.compact_settings = {'n_trees': chosen['n_trees'], 'max_depth': chosen['max_depth']}
+        self._install_engine_only(chosen['engine'], state.importances, chosen_test_accuracy,
+                                  'compact', self.artifact_path)
+
+        summary = [{k: v for k, v in c.items() if k != 'engine'} for c in candidates]
+        return {
+            'baseline_accuracy': baseline,
+            'baseline_test_accuracy': float(accuracy_score(y_test, full.predict(X_test))),
+            'full_nbytes': full.nbytes,
+            'candidates': summary,
+            'chosen': {**{k: v for k, v in chosen.items() if k != 'engine'},
+                       'test_accuracy': chosen_test_accuracy}
+        }
+
+    def _grid_path(self, artifact_path):
+        if artifact_path is None:
+            return None
+        resolution = 'x'.join(str(n) for n in DecisionGrid._resolution_per_axis(
+            self.grid_resolution, len(self.feature_names)))
+        return f'{os.path.splitext(artifact_path)[0]}.grid{resolution}.npz'
+
+    def _load_or_build_grid(self, model, scaler, artifact_path):
+        """
+        Carrega a grade de decisão salva ao lado do artefato do modelo ou a
+        constrói (e a persiste) a partir da floresta. Se os limites do
+        perfil não formam uma grade (máximo igual ao mínimo em algum eixo),
+        devolve a floresta em arrays.
+        """
+        grid_path = self._grid_path(artifact_path)
+
+        if grid_path and os.path.exists(grid_path):
+            try:
+                return DecisionGrid.load(grid_path, method=self.grid_method)
+            except Exception as e:
+                print(f"Grade de decisão inválida, reconstruindo: {e}")
+
+        flat = FlatForest.from_model(model, scaler)
+        try:
+            grid = DecisionGrid.build(
+                lambda X: flat.predict_proba(X)[:, np.flatnonzero(flat.classes == 1)[0]],
+                [self.profile.bounds[name] for name in self.feature_names],
+                resolution=self.grid_resolution,
+                method=self.grid_method
+            )
+        except ValueError as e:
+            # Faixa degenerada da cultura: a floresta em arrays responde igual
+            print(f"Grade de decisão indisponível, usando a floresta em arrays: {e}")
+            return flat
+
+        if grid_path:
+            try:
+                _atomic_write(grid_path, grid.save)
+            except OSError as e:
+                print(f"Não foi possível gravar a grade de decisão: {e}")
+
+        return grid
+
+    def grid_error_report(self, n_samples=100_000, seed=0):
+        """
+        Mede o erro da grade de decisão em relação à floresta, para escolher
+        a resolução da grade.
+
+        Args:
+            n_samples: número de pontos aleatórios dentro de profile.bounds
+            seed: semente dos pontos
+
+        Returns:
+            dict: erro máximo/médio de probabilidade e concordância da decisão
+        """
+        state = self._state
+        if not isinstance(state.engine, DecisionGrid):
+            raise ValueError("Backend 'grid' não está ativo")
+
+        bounds = np.array([self.profile.bounds[name] for name in self.feature_names])
+        rng = np.random.default_rng(seed)
+        X = rng.uniform(bounds[:, 0], bounds[:, 1], size=(n_samples, len(bounds)))
+
+        flat = FlatForest.from_model(state.model, state.scaler)
+        reference = lambda rows: flat.predict_proba(rows)[:, np.flatnonzero(flat.classes == 1)[0]]
+        return state.engine.error_report(reference, X)
+
+    def training_fingerprint(self):
+        """
+        Calcula a impressão digital da configuração de treinamento.
 
-        return data
+        Returns:
+            str: hash que identifica o artefato correspondente no cache
+        """
+        config = {
+            'n_samples': self.n_samples,
+            'seed': self.RANDOM_SEED,
+            'training_data_version': self.TRAINING_DATA_VERSION,
+            'params': self.model_params,
+            'feature_names': self.feature_names,
+            'profile': self.profile._asdict(),
+            'sklearn_version': sklearn.__version__
+        }
+        payload = json.dumps(config, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    def _artifact_path_for(self, fingerprint):
+        return os.path.join(self.cache_dir, f'irrigation_model_{fingerprint}.joblib')
+
+    def _load_or_train(self):
+        """
+        Carrega o modelo do cache de artefatos ou treina e grava o artefato.
+        """
+        fingerprint = self.training_fingerprint()
+        artifact_path = self._artifact_path_for(fingerprint)
+
+        if os.path.exists(artifact_path):
+            try:
+                self.load_model(artifact_path)
+                self.artifact_path = artifact_path
+                return
+            except Exception as e:
+                print(f"Artefato do modelo inválido, treinando novamente: {e}")
+
+        self._train_model()
+
+        try:
+            self.save_model(artifact_path, fingerprint=fingerprint)
+            self.artifact_path = artifact_path
+        except OSError as e:
+            print(f"Não foi possível gravar o artefato do modelo: {e}")
+
+    def _generate_training_data(self, n_samples=1000, seed=None):
+        """
+        Gera dados de treinamento da cultura do modelo (self.profile; por
+        padrão, o milho). Ver generate_training_data.
+
+        Args:
+            n_samples: número de amostras
+            seed: semente (padrão: RANDOM_SEED, a dos dados de treino)
+        """
+        return generate_training_data(self.profile, n_samples,
+                                      self.RANDOM_SEED if seed is None else seed,
+                                      self.feature_names)
 
-    def _train_model(self):
+    def _train_model(self, n_samples=None):
         """
         Treina o modelo com dados sintéticos baseados em conhecimento agronômico.
+
+        Args:
+            n_samples: tamanho do conjunto de treinamento (padrão: self.n_samples)
         """
         # Gerar dados de treinamento
-        training_data = self._generate_training_data(1000)
+        training_data = self._generate_training_data(n_samples or self.n_samples)
 
         # Preparar features e target
-        X = training_data[self.feature_names]
-        y = training_data['irrigation_needed']
+        X = training_data[self.feature_names].to_numpy()
+        y = training_data['irrigation_needed'].to_numpy()
+
+        self.fit(X, y)
+
+    def split_training_data(self, X, y):
+        """
+        Divide features e rótulos em treino e teste (ver split_training_data).
+        """
+        return split_training_data(X, y)
+
+    def fit(self, X, y, model_params=None):
+        """
+        Treina o scaler e a floresta a partir de arrays de features e rótulos.
+
+        Args:
+            X: array (n_samples, 4) na ordem de feature_names
+            y: rótulos (0 = não irrigar, 1 = irrigar)
+            model_params: hiperparâmetros da floresta (padrão: self.model_params)
+        """
+        if model_params is not None:
+            self.model_params = dict(model_params)
+
+        model, scaler, accuracy = self.fit_candidate(X, y)
+
+        self.swap_model(model, scaler, accuracy)
+        print(f"Modelo treinado com acurácia: {accuracy:.3f}")
+
+    def fit_candidate(self, X, y):
+        """
+        Treina um novo par modelo/scaler sem alterar o modelo em uso.
 
+        Args:
+            X: array (n_samples, 4) na ordem de feature_names
+            y: rótulos (0 = não irrigar, 1 = irrigar)
+
+        Returns:
+            tuple: (modelo, scaler, acurácia no conjunto de teste)
+        """
         # Dividir dados
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
-        )
+        X_train, X_test, y_train, y_test = self.split_training_data(X, y)
 
         # Escalar features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
 
         # Treinar modelo
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42
-        )
-
-        self.model.fit(X_train_scaled, y_train)
+        model = RandomForestClassifier(**self.model_params)
+        model.fit(X_train_scaled, y_train)
 
         # Avaliar modelo
-        y_pred = self.model.predict(X_test_scaled)
+        y_pred = model.predict(X_test_scaled)
         accuracy = accuracy_score(y_test, y_pred)
 
-        self.is_trained = True
-        print(f"Modelo treinado com acurácia: {accuracy:.3f}")
+        return model, scaler, float(accuracy)
+
+    def _as_feature_matrix(self, features):
+        """
+        Converte a entrada para uma matriz (n_samples, 4) na ordem de feature_names.
+
+        Args:
+            features: dict de uma leitura, DataFrame com as colunas das
+                      features ou array-like 2-D
+
+        Returns:
+            numpy.ndarray: matriz float64 das features
+        """
+        if isinstance(features, dict):
+            return np.array([[features[name] for name in self.feature_names]],
+                            dtype=float)
+        if isinstance(features, pd.DataFrame):
+            return features[self.feature_names].to_numpy(dtype=float)
+        return np.asarray(features, dtype=float)
+
+    @staticmethod
+    def _classes(state):
+        if state.model is not None:
+            return state.model.classes_
+        return state.engine.classes
+
+    def _predict_proba_matrix(self, X, state):
+        """
+        Calcula probabilidades para uma matriz de features brutas usando o
+        backend de inferência de um estado (lido uma única vez pelo chamador).
+        """
+        if state.engine is not None:
+            return state.engine.predict_proba(X)
+        return state.model.predict_proba(state.scaler.transform(X))
 
     def predict(self, features):
         """
@@ -141,8 +809,9 @@ class IrrigationModel:
         if not self.is_trained:
             raise ValueError("Modelo não foi treinado ainda")
 
-        features_scaled = self.scaler.transform(features)
-        return self.model.predict(features_scaled)
+        state = self._state
+        proba = self._predict_proba_matrix(self._as_feature_matrix(features), state)
+        return self._classes(state).take(np.argmax(proba, axis=1))
 
     def predict_proba(self, features):
         """
@@ -157,8 +826,109 @@ class IrrigationModel:
         if not self.is_trained:
             raise ValueError("Modelo não foi treinado ainda")
 
-        features_scaled = self.scaler.transform(features)
-        return self.model.predict_proba(features_scaled)
+        return self._predict_proba_matrix(self._as_feature_matrix(features), self._state)
+
+    def _predict_arrays(self, X, state):
+        """
+        Classe, probabilidade de irrigação e confiança de uma matriz de
+        features com um único estado de inferência.
+        """
+        proba = self._predict_proba_matrix(X, state)
+
+        classes = self._classes(state)
+        best = np.argmax(proba, axis=1)
+        prediction = classes.take(best).astype(int)
+        probability = proba[:, np.flatnonzero(classes == 1)[0]]
+        confidence = proba[np.arange(len(proba)), best]
+
+        return prediction, probability, confidence
+
+    def predict_with_proba(self, features):
+        """
+        Prediz classe, probabilidade de irrigação e confiança em uma única
+        passagem (uma transformação do scaler e uma travessia da floresta).
+
+        Args:
+            features: dict de uma leitura ou array-like, shape (n_samples, 4)
+
+        Returns:
+            dict: 'prediction' (0/1), 'probability' (prob. de irrigar),
+                  'confidence' (prob. da classe predita) e 'model_version'.
+                  Para um dict de entrada os valores são escalares; caso
+                  contrário, arrays.
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda")
+
+        state = self._state
+        prediction, probability, confidence = self._predict_arrays(
+            self._as_feature_matrix(features), state)
+
+        if isinstance(features, dict):
+            return {
+                'prediction': int(prediction[0]),
+                'probability': float(probability[0]),
+                'confidence': float(confidence[0]),
+                'model_version': state.version
+            }
+
+        return {
+            'prediction': prediction,
+            'probability': probability,
+            'confidence': confidence,
+            'model_version': state.version
+        }
+
+    def score_batch(self, data, chunk_size=None, keys=None):
+        """
+        Pontua um bloco de leituras (ex.: a última leitura de cada sensor de
+        cada lote) em pedaços de tamanho fixo, com uma única chamada.
+
+        Args:
+            data: DataFrame com as colunas de feature_names (e, opcionalmente,
+                  as colunas de KEY_COLUMNS) ou array-like (n_samples, 4)
+            chunk_size: linhas por pedaço (padrão: BATCH_CHUNK_SIZE)
+            keys: dict {nome_coluna: valores} que identifica cada linha quando
+                  data é um array (ex.: {'id_sensor': ids})
+
+        Returns:
+            pandas.DataFrame: colunas de chave seguidas de 'prediction',
+                              'probability', 'confidence' e 'model_version'
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda")
+
+        chunk_size = chunk_size or self.BATCH_CHUNK_SIZE
+        X = self._as_feature_matrix(data)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Esperado array (n_samples, {len(self.feature_names)}), "
+                             f"recebido {X.shape}")
+
+        if isinstance(data, pd.DataFrame):
+            key_columns = {col: data[col].to_numpy()
+                           for col in self.KEY_COLUMNS if col in data.columns}
+        else:
+            key_columns = {col: np.asarray(values) for col, values in (keys or {}).items()}
+
+        n_rows = len(X)
+        prediction = np.empty(n_rows, dtype=int)
+        probability = np.empty(n_rows, dtype=float)
+        confidence = np.empty(n_rows, dtype=float)
+
+        # Todos os pedaços usam a mesma versão do modelo
+        state = self._state
+        for start in range(0, n_rows, chunk_size):
+            end = min(start + chunk_size, n_rows)
+            prediction[start:end], probability[start:end], confidence[start:end] = \
+                self._predict_arrays(X[start:end], state)
+
+        return pd.DataFrame({
+            **key_columns,
+            'prediction': prediction,
+            'probability': probability,
+            'confidence': confidence,
+            'model_version': np.full(n_rows, state.version)
+        })
 
     def get_feature_importance(self):
         """
@@ -170,15 +940,122 @@ class IrrigationModel:
         if not self.is_trained:
             raise ValueError("Modelo não foi treinado ainda")
 
-        importances = self.model.feature_importances_
+        importances = self._state.importances
 
-        return {
-            'Umidade': importances[0],
-            'pH': importances[1],
-            'Fósforo': importances[2],
-            'Potássio': importances[3]
+        return {self.FEATURE_LABELS[name]: importances[i]
+                for i, name in enumerate(self.feature_names)}
+
+    @staticmethod
+    def _importance_path(artifact_path):
+        if artifact_path is None:
+            return None
+        return f'{os.path.splitext(artifact_path)[0]}.importance.json'
+
+    def _store_permutation_cache(self, state, cached):
+        """
+        Guarda o resultado em memória apenas se o modelo avaliado ainda é o
+        que está em uso (uma troca no meio do cálculo o invalidou).
+        """
+        with self._swap_lock:
+            if self._state.version == state.version:
+                self._permutation_cache = cached
+
+    def get_permutation_importance(self, X=None, y=None, n_repeats=10, n_jobs=None, seed=0):
+        """
+        Importância por permutação (queda de acurácia ao embaralhar cada
+        feature), calculada em um pool de processos.
+
+        O resultado é guardado em memória e em um arquivo ao lado do
+        artefato do modelo. A chave do cache inclui o hash da floresta em
+        uso, então ele é invalidado quando o modelo é trocado.
+
+        Args:
+            X, y: conjunto de avaliação (padrão: parte de teste dos dados
+                  sintéticos de treinamento)
+            n_repeats: embaralhamentos por feature
+            n_jobs: número de processos (padrão: todos os núcleos)
+            seed: semente dos embaralhamentos
+
+        Returns:
+            dict: 'baseline_accuracy', 'importances' e 'std' (por rótulo de
+                  feature, como em get_feature_importance)
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ainda")
+
+        # Estado e artefato lidos juntos: o resultado é gravado ao lado do
+        # artefato do modelo avaliado, mesmo que haja uma troca no meio
+        with self._swap_lock:
+            state = self._state
+            importance_path = self._importance_path(self.artifact_path)
+        engine = state.engine if isinstance(state.engine, FlatForest) else \
+            FlatForest.from_model(state.model, state.scaler)
+
+        if X is None:
+            data = self._generate_training_data(self.n_samples)
+            _, X, _, y = self.split_training_data(data[self.feature_names].to_numpy(),
+                                                  data['irrigation_needed'].to_numpy())
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+
+        data_digest = hashlib.sha256(np.ascontiguousarray(X).tobytes() +
+                                     np.ascontiguousarray(y, dtype=np.float64).tobytes())
+        cache_key = {
+            'model': engine.digest(),
+            'data': data_digest.hexdigest()[:16],
+            'n_repeats': n_repeats,
+            'seed': seed
         }
 
+        cached = self._permutation_cache
+        if cached and cached['key'] == cache_key:
+            return cached['result']
+
+        if importance_path and os.path.exists(importance_path):
+            try:
+                with open(importance_path, encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached['key'] == cache_key:
+                    self._store_permutation_cache(state, cached)
+                    return cached['result']
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Cache de importância inválido, recalculando: {e}")
+
+        scores = compute_permutation_importance(engine, X, y, n_repeats=n_repeats,
+                                                n_jobs=n_jobs, seed=seed)
+        labels = [self.FEATURE_LABELS[name] for name in self.feature_names]
+        result = {
+            'baseline_accuracy': scores['baseline_accuracy'],
+            'importances': dict(zip(labels, scores['mean'].tolist())),
+            'std': dict(zip(labels, scores['std'].tolist()))
+        }
+
+        cached = {'key': cache_key, 'result': result}
+        self._store_permutation_cache(state, cached)
+        if importance_path:
+            try:
+                payload = json.dumps(cached, ensure_ascii=False).encode('utf-8')
+                _atomic_write(importance_path, lambda f: f.write(payload))
+            except OSError as e:
+                print(f"Não foi possível gravar o cache de importância: {e}")
+
+        return result
+
+    @property
+    def rules_engine(self):
+        """
+        Motor de regras com os limiares da cultura do modelo (ver
+        RulesEngine.from_profile), refeito quando o perfil muda.
+        """
+        profile, engine = self._rules_engine
+        if profile is not self.profile:
+            # Perfis carregados de artefatos são cópias: iguais ao milho
+            # mantêm o motor padrão
+            if profile != self.profile:
+                engine = RulesEngine.from_profile(self.profile)
+            self._rules_engine = (self.profile, engine)
+        return engine
+
     def get_recommendations(self, sensor_data):
         """
         Gera recomendações baseadas nos dados dos sensores.
@@ -187,69 +1064,105 @@ class IrrigationModel:
             sensor_data: dict com dados dos sensores
 
         Returns:
-            list: lista de recomendações
-        """
-        recommendations = []
-
-        # Análise de umidade
-        if sensor_data['humidity'] < 35:
-            recommendations.append("🚨 Irrigação urgente necessária - umidade crítica")
-        elif sensor_data['humidity'] < 45:
-            recommendations.append("💧 Considere irrigação - umidade baixa")
-        elif sensor_data['humidity'] > 75:
-            recommendations.append("⚠️ Umidade alta - verifique drenagem")
-
-        # Análise de pH
-        if sensor_data['ph'] < 6.0:
-            recommendations.append("🧪 Solo ácido - considere calcário")
-        elif sensor_data['ph'] > 7.5:
-            recommendations.append("🧪 Solo alcalino - considere enxofre")
-        else:
-            recommendations.append("✅ pH ideal para milho")
-
-        # Análise de nutrientes
-        if sensor_data['phosphorus'] < 15:
-            recommendations.append("🌱 Fósforo baixo - aplicar fertilizante fosfatado")
-        if sensor_data['potassium'] < 120:
-            recommendations.append("🌱 Potássio baixo - aplicar fertilizante potássico")
-
-        # Recomendação geral
-        if sensor_data['humidity'] > 45 and 6.0 <= sensor_data['ph'] <= 7.0:
-            recommendations.append("🌽 Condições ideais para desenvolvimento do milho")
-
-        return recommendations if recommendations else ["✅ Condições adequadas - monitoramento contínuo"]
+            list: lista de recomendações (ver models/rules.py)
+        """
+        return self.rules_engine.recommendations(sensor_data)
 
-    def save_model(self, filepath):
+    def save_model(self, filepath, fingerprint=None, layout='joblib'):
         """
         Salva o modelo treinado.
 
+        A gravação é atômica (ver _atomic_write).
+
         Args:
             filepath: caminho para salvar o modelo
+            fingerprint: impressão digital da configuração de treinamento
+            layout: 'joblib' (objetos do sklearn) ou 'arrays' (floresta em
+                    arrays brutos, carregável com mapeamento em memória e
+                    compartilhada entre processos; ver FlatForest.save_arrays)
         """
         if not self.is_trained:
             raise ValueError("Modelo não foi treinado ainda")
+        if layout not in ('joblib', 'arrays'):
+            raise ValueError(f"Layout de artefato inválido: {layout}")
+
+        state = self._state
+
+        if layout == 'arrays':
+            engine = state.engine if state.model is None else \
+                FlatForest.from_model(state.model, state.scaler)
+            metadata = {
+                'feature_names': self.feature_names,
+                'accuracy': self.accuracy,
+                'model_params': self.model_params,
+                'fingerprint': fingerprint,
+                'profile': self.profile._asdict(),
+                'importances': [float(v) for v in state.importances],
+                'compact_settings': self.compact_settings if state.model is None else None
+            }
+            _atomic_write(filepath, lambda f: engine.save_arrays(f, metadata))
+            return
 
         model_data = {
-            'model': self.model,
-            'scaler': self.scaler,
-            'feature_names': self.feature_names
+            'feature_names': self.feature_names,
+            'accuracy': self.accuracy,
+            'model_params': self.model_params,
+            'fingerprint': fingerprint,
+            'profile': self.profile._asdict()
         }
 
-        joblib.dump(model_data, filepath)
+        if state.model is None:
+            # Modelo compacto: apenas os arrays da floresta reduzida
+            model_data.update({
+                'format': 'compact',
+                'engine': state.engine.to_dict(),
+                'importances': state.importances,
+                'compact_settings': self.compact_settings
+            })
+        else:
+            model_data.update({'model': state.model, 'scaler': state.scaler})
+
+        _atomic_write(filepath, lambda f: joblib.dump(model_data, f))
 
-    def load_model(self, filepath):
+    def load_model(self, filepath, mmap=True):
         """
         Carrega um modelo salvo.
 
         Args:
             filepath: caminho do modelo salvo
+            mmap: para artefatos no layout 'arrays', mapeia os arrays em
+                  memória em vez de copiá-los
         """
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Arquivo {filepath} não encontrado")
 
+        with open(filepath, 'rb') as f:
+            is_arrays_layout = f.read(len(ARRAYS_MAGIC)) == ARRAYS_MAGIC
+
+        if is_arrays_layout:
+            engine, metadata = FlatForest.load_arrays(filepath, mmap=mmap)
+            self.feature_names = metadata['feature_names']
+            self.model_params = metadata.get('model_params') or self.model_params
+            self.compact_settings = metadata.get('compact_settings')
+            self.profile = CultureProfile.from_dict(metadata['profile']) \
+                if metadata.get('profile') else self.profile
+            self._install_engine_only(engine, np.array(metadata['importances']),
+                                      metadata.get('accuracy'),
+                                      'compact' if self.compact_settings else 'flat', filepath)
+            return
+
         model_data = joblib.load(filepath)
 
-        self.model = model_data['model']
-        self.scaler = model_data['scaler']
         self.feature_names = model_data['feature_names']
-        self.is_trained = True
+        self.model_params = model_data.get('model_params', self.model_params)
+        if model_data.get('profile'):
+            self.profile = CultureProfile.from_dict(model_data['profile'])
+
+        if model_data.get('format') == 'compact':
+            self.compact_settings = model_data['compact_settings']
+            self._install_engine_only(FlatForest.from_dict(model_data['engine']),
+                                      model_data['importances'], model_data.get('accuracy'),
+                                      'compact', filepath)
+        else:
+            self.swap_model(model_data['model'], model_data['scaler'],
+                            model_data.get('accuracy'), artifact_path=filepath)
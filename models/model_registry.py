@@ -0,0 +1,202 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from models.irrigation_model import IrrigationModel, CultureProfile, CORN_PROFILE
+
+
+# Faixas de necessidade de cada cultura (ver CultureProfile.from_cultura)
+CULTURA_PROFILE_QUERY = """
+    SELECT
+        nome,
+        necessidade_agua_min::float8,
+        necessidade_agua_max::float8,
+        necessidade_ph_min::float8,
+        necessidade_ph_max::float8
+    FROM cultura
+    WHERE id_cultura = %s
+"""
+
+LOTE_CULTURA_QUERY = "SELECT id_lote, id_cultura FROM lote"
+
+
+def cultura_profile_source(db):
+    """
+    Cria uma fonte de perfis que lê as faixas da tabela cultura.
+
+    Args:
+        db: DatabaseManager conectado
+
+    Returns:
+        função id_cultura -> CultureProfile
+    """
+    def load(id_cultura):
+        row = db.execute_query(CULTURA_PROFILE_QUERY, (id_cultura,)).fetchone()
+        if row is None:
+            raise KeyError(f"Cultura {id_cultura} não encontrada")
+        return CultureProfile.from_cultura(*row)
+
+    return load
+
+
+def load_lot_cultures(db):
+    """
+    Returns:
+        dict: {id_lote: id_cultura} de todos os lotes
+    """
+    return dict(db.execute_query(LOTE_CULTURA_QUERY).fetchall())
+
+
+class ModelRegistry:
+    """
+    Registro de modelos por cultura (id_cultura).
+
+    Cada modelo é treinado (ou carregado do cache de artefatos, cuja
+    impressão digital inclui o perfil) na primeira vez que a cultura é
+    usada. No máximo max_models ficam em memória; o menos usado
+    recentemente é descartado quando o limite é excedido.
+    """
+
+    def __init__(self, profile_source=None, max_models=4, **model_kwargs):
+        """
+        Args:
+            profile_source: função id_cultura -> CultureProfile (ex.:
+                            cultura_profile_source(db)); se None, todas as
+                            culturas usam CORN_PROFILE
+            max_models: máximo de modelos mantidos em memória
+            model_kwargs: argumentos repassados a IrrigationModel
+                          (use_cache, cache_dir, inference_backend...)
+        """
+        if max_models < 1:
+            raise ValueError("max_models deve ser pelo menos 1")
+
+        self.profile_source = profile_source or (lambda id_cultura: CORN_PROFILE)
+        self.max_models = max_models
+        self.model_kwargs = model_kwargs
+
+        self._models = OrderedDict()
+        self._profiles = {}
+        # Carregamentos em andamento: {id_cultura: Future do modelo}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def __contains__(self, id_cultura):
+        return id_cultura in self._models
+
+    def __len__(self):
+        return len(self._models)
+
+    def profile(self, id_cultura):
+        """
+        Returns:
+            CultureProfile da cultura (consultado uma vez e memorizado)
+        """
+        if id_cultura not in self._profiles:
+            self._profiles[id_cultura] = self.profile_source(id_cultura)
+        return self._profiles[id_cultura]
+
+    def get(self, id_cultura):
+        """
+        Retorna o modelo da cultura, treinando ou carregando se necessário.
+
+        O treino/carga roda fora da trava: enquanto uma cultura é
+        carregada, os modelos já em memória continuam disponíveis. Chamadas
+        simultâneas para a mesma cultura esperam o mesmo carregamento.
+
+        Args:
+            id_cultura: identificador da cultura
+
+        Returns:
+            IrrigationModel
+        """
+        with self._lock:
+            model = self._models.get(id_cultura)
+            if model is not None:
+                self._models.move_to_end(id_cultura)
+                return model
+
+            future = self._pending.get(id_cultura)
+            if future is None:
+                future = self._pending[id_cultura] = Future()
+                loader = True
+            else:
+                loader = False
+
+        if not loader:
+            return future.result()
+
+        try:
+            model = IrrigationModel(profile=self.profile(id_cultura), **self.model_kwargs)
+        except BaseException as e:
+            with self._lock:
+                del self._pending[id_cultura]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._pending[id_cultura]
+            self.loads += 1
+            self._models[id_cultura] = model
+
+            while len(self._models) > self.max_models:
+                evicted, _ = self._models.popitem(last=False)
+                self.evictions += 1
+                print(f"Modelo da cultura {evicted} removido da memória")
+
+        future.set_result(model)
+        return model
+
+    def score_batch(self, data, lot_cultures=None, chunk_size=None):
+        """
+        Pontua leituras de várias culturas, cada grupo com o modelo da sua
+        cultura.
+
+        Args:
+            data: DataFrame com as colunas de features, id_lote (e id_sensor,
+                  opcional) e, opcionalmente, id_cultura
+            lot_cultures: dict {id_lote: id_cultura} usado quando data não
+                          tem a coluna id_cultura (ver load_lot_cultures)
+            chunk_size: linhas por pedaço em IrrigationModel.score_batch
+
+        Returns:
+            pandas.DataFrame: mesmas linhas e ordem de data, com id_cultura,
+            prediction, probability, confidence e model_version
+        """
+        if 'id_cultura' in data.columns:
+            cultures = data['id_cultura'].to_numpy()
+        elif lot_cultures is not None:
+            cultures = data['id_lote'].map(lot_cultures).to_numpy()
+            if pd.isna(cultures).any():
+                missing = data.loc[pd.isna(cultures), 'id_lote'].unique()
+                raise KeyError(f"Lotes sem cultura conhecida: {list(missing)}")
+        else:
+            raise ValueError("Informe a coluna id_cultura ou lot_cultures")
+
+        key_columns = [c for c in IrrigationModel.KEY_COLUMNS if c in data.columns]
+        codes, unique_cultures = pd.factorize(cultures)
+        # Grupos contíguos por cultura, na ordem original dentro de cada grupo
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(unique_cultures) + 1))
+
+        parts = []
+        for i, id_cultura in enumerate(unique_cultures):
+            rows = order[bounds[i]:bounds[i + 1]]
+            group = data.iloc[rows]
+            keys = {column: group[column].to_numpy() for column in key_columns}
+            keys['id_cultura'] = np.full(len(rows), id_cultura)
+            model = self.get(id_cultura)
+            scored = model.score_batch(group[model.feature_names].to_numpy(),
+                                       chunk_size=chunk_size, keys=keys)
+            scored.index = rows
+            parts.append(scored)
+
+        if not parts:
+            return pd.DataFrame(columns=key_columns + ['id_cultura', 'prediction', 'probability',
+                                                       'confidence', 'model_version'])
+
+        return pd.concat(parts).sort_index().reset_index(drop=True)
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+class PumpPolicy:
+    """
+    Política do modo automático da bomba: liga quando o modelo prevê
+    irrigação com probabilidade acima de on_threshold, desliga quando a
+    probabilidade cai abaixo de off_threshold e, entre os dois limiares,
+    mantém o estado atual (histerese).
+    """
+
+    def __init__(self, on_threshold=0.7, off_threshold=0.3):
+        """
+        Args:
+            on_threshold: probabilidade mínima (exclusiva) para ligar
+            off_threshold: probabilidade máxima (exclusiva) para desligar
+        """
+        if off_threshold > on_threshold:
+            raise ValueError("off_threshold não pode ser maior que on_threshold")
+
+        self.on_threshold = on_threshold
+        self.off_threshold = off_threshold
+
+    def __repr__(self):
+        return f"PumpPolicy(on={self.on_threshold:g}, off={self.off_threshold:g})"
+
+    def step(self, pump_on, prediction, probability):
+        """
+        Próximo estado da bomba para um lote de lotes (ou um único lote).
+
+        Args:
+            pump_on: estado atual (bool ou array booleano)
+            prediction: classe predita (0/1)
+            probability: probabilidade de irrigação
+
+        Returns:
+            bool ou numpy.ndarray: novo estado da bomba
+        """
+        prediction = np.asarray(prediction)
+        probability = np.asarray(probability)
+
+        turn_on = (prediction == 1) & (probability > self.on_threshold)
+        turn_off = probability < self.off_threshold
+        state = np.where(turn_on, True, np.where(turn_off, False, pump_on))
+        return bool(state) if state.ndim == 0 else state
+
+
+DEFAULT_PUMP_POLICY = PumpPolicy()
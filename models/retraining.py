@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from sklearn.metrics import accuracy_score
+
+
+class RetrainingWorker(threading.Thread):
+    """
+    Worker em segundo plano que retreina periodicamente um IrrigationModel
+    com dados novos, valida o candidato contra o modelo em uso e o troca
+    atomicamente (IrrigationModel.swap_model) sem bloquear as predições.
+    """
+
+    def __init__(self, model, data_source, interval_seconds=3600, max_accuracy_drop=0.0,
+                 min_samples=100):
+        """
+        Args:
+            model: IrrigationModel em uso pelo dashboard/controlador
+            data_source: função sem argumentos que retorna (X, y) atualizados
+            interval_seconds: intervalo entre retreinamentos
+            max_accuracy_drop: perda de acurácia tolerada em relação ao
+                               modelo atual para aceitar o candidato
+            min_samples: mínimo de amostras para tentar retreinar
+        """
+        super().__init__(name='irrigation-retraining', daemon=True)
+        self.model = model
+        self.data_source = data_source
+        self.interval_seconds = interval_seconds
+        self.max_accuracy_drop = max_accuracy_drop
+        self.min_samples = min_samples
+
+        self.history = deque(maxlen=100)
+        self._stop_event = threading.Event()
+
+    def stop(self, timeout=None):
+        """
+        Solicita a parada do worker e aguarda o término.
+        """
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.retrain_once()
+            except Exception as e:
+                print(f"Erro no retreinamento do modelo: {e}")
+
+    def retrain_once(self):
+        """
+        Executa um ciclo de retreinamento e validação.
+
+        O candidato e o modelo atual são avaliados no mesmo conjunto de
+        teste do candidato; a troca só acontece se a acurácia do candidato
+        não cair mais que max_accuracy_drop.
+
+        Returns:
+            dict: resultado do ciclo (acurácias, se houve troca e versão)
+        """
+        start = time.perf_counter()
+        X, y = self.data_source()
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y)
+
+        if len(X) < self.min_samples or len(np.unique(y)) < 2:
+            result = {'swapped': False, 'reason': 'dados insuficientes',
+                      'n_samples': len(X), 'version': self.model.version}
+            self.history.append(result)
+            return result
+
+        # Versão do modelo comparado com o candidato: se outra troca for
+        # publicada durante o ciclo, o candidato é descartado
+        base_version = self.model.version
+        model, scaler, candidate_accuracy = self.model.fit_candidate(X, y)
+
+        # Avaliar o modelo atual nos mesmos dados de teste do candidato
+        _, X_test, _, y_test = self.model.split_training_data(X, y)
+        current_accuracy = float(accuracy_score(y_test, self.model.predict(X_test)))
+
+        swapped = candidate_accuracy >= current_accuracy - self.max_accuracy_drop
+        reason = None if swapped else 'acurácia inferior'
+        if swapped:
+            version = self.model.swap_model(model, scaler, candidate_accuracy,
+                                            base_version=base_version)
+            swapped = version is not None
+            if swapped:
+                print(f"Modelo retreinado (versão {version}) com acurácia: "
+                      f"{candidate_accuracy:.3f} (anterior: {current_accuracy:.3f})")
+            else:
+                reason = 'modelo em uso trocado durante o retreinamento'
+
+        result = {
+            'swapped': swapped,
+            'reason': reason,
+            'n_samples': len(X),
+            'candidate_accuracy': candidate_accuracy,
+            'current_accuracy': current_accuracy,
+            'version': self.model.version,
+            'duration_s': time.perf_counter() - start
+        }
+        self.history.append(result)
+        return result
+
+
+def leitura_solo_data_source(chunk_size=50_000, max_memory_mb=512, id_cultura=None):
+    """
+    Cria uma fonte de dados que lê o histórico de leitura_solo a cada ciclo.
+
+    Returns:
+        função sem argumentos que retorna (X, y)
+    """
+    def load():
+        # Importação tardia: só exige o driver do PostgreSQL quando usada
+        from src.database import DatabaseManager
+        from models.training_data import load_leitura_solo_arrays
+
+        db = DatabaseManager()
+        db.connect()
+        try:
+            return load_leitura_solo_arrays(db, chunk_size=chunk_size,
+                                            max_memory_mb=max_memory_mb,
+                                            id_cultura=id_cultura)
+        finally:
+            db.disconnect()
+
+    return load
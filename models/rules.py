@@ -0,0 +1,393 @@
+import numbers
+import operator
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+FEATURES = ['humidity', 'ph', 'phosphorus', 'potassium']
+
+# Limiares padrão (milho); podem ser derivados do perfil de uma cultura
+# (RulesEngine.from_profile / from_cultura) ou sobrescritos por chamada
+# (ex.: sliders do dashboard)
+DEFAULT_THRESHOLDS = {
+    'humidity_critical': 30,
+    'humidity_urgent': 35,
+    'humidity_low': 45,
+    'humidity_high': 75,
+    'ph_min': 6.0,
+    'ph_ideal_max': 7.0,
+    'ph_max': 7.5,
+    'phosphorus_min': 15,
+    'phosphorus_max': 35,
+    'potassium_min': 120,
+    'potassium_max': 200
+}
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+
+# Uma regra dispara quando todas as condições (feature, operador, limiar)
+# são verdadeiras; sem condições, sempre dispara. Regras do mesmo grupo são
+# exclusivas (equivalem a um if/elif): vale a primeira que disparar.
+Rule = namedtuple('Rule', ['id', 'kind', 'group', 'conditions', 'message'])
+
+RULES = (
+    # Recomendações (IrrigationModel.get_recommendations)
+    Rule('humidity_urgent', 'recommendation', 'humidity',
+         (('humidity', '<', 'humidity_urgent'),),
+         "🚨 Irrigação urgente necessária - umidade crítica"),
+    Rule('humidity_low', 'recommendation', 'humidity',
+         (('humidity', '<', 'humidity_low'),),
+         "💧 Considere irrigação - umidade baixa"),
+    Rule('humidity_high', 'recommendation', 'humidity',
+         (('humidity', '>', 'humidity_high'),),
+         "⚠️ Umidade alta - verifique drenagem"),
+    Rule('ph_acid', 'recommendation', 'ph',
+         (('ph', '<', 'ph_min'),),
+         "🧪 Solo ácido - considere calcário"),
+    Rule('ph_alkaline', 'recommendation', 'ph',
+         (('ph', '>', 'ph_max'),),
+         "🧪 Solo alcalino - considere enxofre"),
+    Rule('ph_ideal', 'recommendation', 'ph', (),
+         "✅ pH ideal para {cultura}"),
+    Rule('phosphorus_low', 'recommendation', None,
+         (('phosphorus', '<', 'phosphorus_min'),),
+         "🌱 Fósforo baixo - aplicar fertilizante fosfatado"),
+    Rule('potassium_low', 'recommendation', None,
+         (('potassium', '<', 'potassium_min'),),
+         "🌱 Potássio baixo - aplicar fertilizante potássico"),
+    Rule('ideal_conditions', 'recommendation', None,
+         (('humidity', '>', 'humidity_low'), ('ph', '>=', 'ph_min'), ('ph', '<=', 'ph_ideal_max')),
+         "🌽 Condições ideais para desenvolvimento do {cultura}"),
+
+    # Alertas do dashboard
+    Rule('alert_humidity_low', 'alert', None,
+         (('humidity', '<', 'humidity_low'),),
+         "⚠️ Umidade baixa!"),
+    Rule('alert_ph_low', 'alert', 'alert_ph',
+         (('ph', '<', 'ph_min'),),
+         "⚠️ pH fora do range!"),
+    Rule('alert_ph_high', 'alert', 'alert_ph',
+         (('ph', '>', 'ph_max'),),
+         "⚠️ pH fora do range!"),
+    Rule('alert_phosphorus_low', 'alert', None,
+         (('phosphorus', '<', 'phosphorus_min'),),
+         "⚠️ Fósforo baixo!"),
+    Rule('alert_potassium_low', 'alert', None,
+         (('potassium', '<', 'potassium_min'),),
+         "⚠️ Potássio baixo!")
+)
+
+RECOMMENDATION_FALLBACK = "✅ Condições adequadas - monitoramento contínuo"
+
+# Status de cada sensor: a primeira condição verdadeira define o status;
+# nenhuma verdadeira = 'NORMAL' (código 0)
+STATUS_LABELS = ('NORMAL', 'CRÍTICO', 'BAIXO', 'ALTO', 'FORA DO RANGE')
+
+STATUS_RULES = {
+    'humidity': (
+        ('CRÍTICO', ('humidity', '<', 'humidity_critical')),
+        ('BAIXO', ('humidity', '<', 'humidity_low')),
+        ('ALTO', ('humidity', '>', 'humidity_high'))
+    ),
+    'ph': (
+        ('FORA DO RANGE', ('ph', '<', 'ph_min')),
+        ('FORA DO RANGE', ('ph', '>', 'ph_max'))
+    ),
+    'phosphorus': (
+        ('BAIXO', ('phosphorus', '<', 'phosphorus_min')),
+        ('ALTO', ('phosphorus', '>', 'phosphorus_max'))
+    ),
+    'potassium': (
+        ('BAIXO', ('potassium', '<', 'potassium_min')),
+        ('ALTO', ('potassium', '>', 'potassium_max'))
+    )
+}
+
+
+def thresholds_from_profile(profile):
+    """
+    Deriva os limiares das regras do perfil de uma cultura, com a mesma
+    margem de umidade de CultureProfile.from_cultura: para o perfil do
+    milho, o resultado é DEFAULT_THRESHOLDS.
+
+    Args:
+        profile: CultureProfile da cultura
+
+    Returns:
+        dict: limiares no formato de DEFAULT_THRESHOLDS
+    """
+    critical, low, moderate, high = profile.humidity_thresholds
+    ph_min, ph_max = profile.ph_range
+    half_margin = (moderate - low) / 2
+
+    return {
+        **DEFAULT_THRESHOLDS,
+        'humidity_critical': critical,
+        'humidity_urgent': critical + half_margin,
+        'humidity_low': low + half_margin,
+        'humidity_high': high + half_margin,
+        'ph_min': ph_min,
+        'ph_ideal_max': ph_max,
+        'ph_max': ph_max + (ph_max - ph_min) / 2,
+        'phosphorus_min': profile.nutrient_minimums['phosphorus'],
+        'potassium_min': profile.nutrient_minimums['potassium']
+    }
+
+
+class RulesEngine:
+    """
+    Avalia a tabela de regras sobre um lote de leituras de uma vez: cada
+    condição vira uma máscara booleana NumPy sobre todas as leituras.
+    Os atalhos de uma leitura (recommendations, alerts, sensor_status)
+    passam os valores escalares pelo mesmo avaliador (_fired e
+    _status_code), sem montar arrays.
+    """
+
+    def __init__(self, rules=RULES, status_rules=STATUS_RULES, thresholds=None, cultura='milho'):
+        """
+        Args:
+            rules: tabela de regras (ver Rule)
+            status_rules: regras de status por sensor
+            thresholds: limiares (padrão: DEFAULT_THRESHOLDS)
+            cultura: nome da cultura usado nas mensagens
+        """
+        self.thresholds = dict(thresholds or DEFAULT_THRESHOLDS)
+        self.cultura = cultura
+        self.status_rules = status_rules
+
+        self.rules = {}
+        for rule in rules:
+            for feature, op, _ in rule.conditions:
+                if feature not in FEATURES or op not in OPERATORS:
+                    raise ValueError(f"Condição inválida na regra {rule.id}: {feature} {op}")
+            self.rules.setdefault(rule.kind, []).append(rule)
+
+    @classmethod
+    def from_profile(cls, profile, **kwargs):
+        """
+        Motor com os limiares e o nome de uma cultura.
+
+        Args:
+            profile: CultureProfile da cultura
+            kwargs: demais argumentos de RulesEngine (rules, status_rules)
+
+        Returns:
+            RulesEngine
+        """
+        return cls(thresholds=thresholds_from_profile(profile), cultura=profile.name.lower(),
+                   **kwargs)
+
+    @classmethod
+    def from_cultura(cls, nome, necessidade_agua_min, necessidade_agua_max,
+                     necessidade_ph_min, necessidade_ph_max, **kwargs):
+        """
+        Motor a partir de uma linha da tabela cultura (mesmas colunas de
+        CultureProfile.from_cultura).
+
+        Returns:
+            RulesEngine
+        """
+        # Importado aqui: models.irrigation_model importa este módulo
+        from models.irrigation_model import CultureProfile
+
+        profile = CultureProfile.from_cultura(nome, necessidade_agua_min, necessidade_agua_max,
+                                              necessidade_ph_min, necessidade_ph_max)
+        return cls.from_profile(profile, **kwargs)
+
+    def rule_ids(self, kind):
+        """
+        Returns:
+            list: ids das regras do tipo, na ordem das colunas de rule_masks
+        """
+        return [rule.id for rule in self.rules[kind]]
+
+    @staticmethod
+    def _columns(data):
+        """
+        Converte uma leitura (dict), um DataFrame ou uma matriz (n, 4) em
+        um dict {feature: array 1-D}.
+        """
+        if isinstance(data, (dict, pd.DataFrame)):
+            return {name: np.atleast_1d(np.asarray(data[name], dtype=np.float64))
+                    for name in FEATURES}
+
+        X = np.atleast_2d(np.asarray(data, dtype=np.float64))
+        return {name: X[:, i] for i, name in enumerate(FEATURES)}
+
+    def _condition_mask(self, columns, condition, thresholds, cache):
+        if condition not in cache:
+            feature, op, threshold = condition
+            value = thresholds[threshold] if isinstance(threshold, str) else threshold
+            cache[condition] = OPERATORS[op](columns[feature], value)
+        return cache[condition]
+
+    def _fired(self, columns, kind, thresholds):
+        """
+        Avalia as regras de um tipo sobre colunas de arrays ou de escalares
+        (uma leitura); as operações lógicas do NumPy valem para os dois.
+
+        Returns:
+            list: para cada regra, máscara booleana ou bool
+        """
+        cache = {}
+        taken = {}
+        fired = []
+        for rule in self.rules[kind]:
+            mask = True
+            for condition in rule.conditions:
+                condition_mask = self._condition_mask(columns, condition, thresholds, cache)
+                mask = np.logical_and(mask, condition_mask)
+
+            if rule.group is not None:
+                group_taken = taken.get(rule.group, False)
+                mask = np.logical_and(mask, np.logical_not(group_taken))
+                taken[rule.group] = np.logical_or(group_taken, mask)
+
+            fired.append(mask)
+        return fired
+
+    def _status_code(self, columns, feature_rules, thresholds, cache):
+        """
+        Código de status de um sensor (a primeira condição verdadeira vence),
+        sobre colunas de arrays ou de escalares, como em _fired.
+        """
+        code = 0
+        for label, condition in reversed(feature_rules):
+            code = np.where(self._condition_mask(columns, condition, thresholds, cache),
+                            STATUS_LABELS.index(label), code)
+        return np.asarray(code, dtype=np.int8)
+
+    def rule_masks(self, data, kind, thresholds=None):
+        """
+        Avalia as regras de um tipo ('recommendation' ou 'alert').
+
+        Args:
+            data: leituras (ver _columns)
+            kind: tipo das regras
+            thresholds: limiares que substituem os do motor nesta chamada
+
+        Returns:
+            numpy.ndarray: matriz booleana (n_leituras, n_regras), colunas na
+                           ordem de rule_ids(kind)
+        """
+        columns = self._columns(data)
+        n_rows = len(columns[FEATURES[0]])
+
+        masks = np.zeros((n_rows, len(self.rules[kind])), dtype=bool)
+        for j, mask in enumerate(self._fired(columns, kind, self._merged_thresholds(thresholds))):
+            masks[:, j] = mask
+        return masks
+
+    def status_codes(self, data, thresholds=None):
+        """
+        Calcula o status de cada sensor para um lote de leituras.
+
+        Returns:
+            dict: {feature: array int8 de códigos em STATUS_LABELS}
+        """
+        columns = self._columns(data)
+        thresholds = self._merged_thresholds(thresholds)
+        cache = {}
+        return {feature: self._status_code(columns, feature_rules, thresholds, cache)
+                for feature, feature_rules in self.status_rules.items()}
+
+    def evaluate(self, data, thresholds=None):
+        """
+        Avalia status, recomendações e alertas de um lote de leituras.
+
+        Returns:
+            dict: 'status' (ver status_codes), 'recommendations' e 'alerts'
+                  (ver rule_masks)
+        """
+        return {
+            'status': self.status_codes(data, thresholds),
+            'recommendations': self.rule_masks(data, 'recommendation', thresholds),
+            'alerts': self.rule_masks(data, 'alert', thresholds)
+        }
+
+    @staticmethod
+    def _scalar_values(reading):
+        """
+        Valores de uma leitura (dict) como floats, para o caminho escalar;
+        None se algum campo não for um número (ex.: arrays), caso tratado
+        pelo caminho vetorizado.
+        """
+        values = {}
+        for name in FEATURES:
+            value = reading[name]
+            if value is None:
+                value = np.nan
+            elif not isinstance(value, numbers.Real):
+                return None
+            values[name] = float(value)
+        return values
+
+    def _merged_thresholds(self, thresholds):
+        return {**self.thresholds, **thresholds} if thresholds else self.thresholds
+
+    def messages(self, kind, mask):
+        """
+        Mensagens das regras disparadas em uma linha de rule_masks(kind).
+
+        Returns:
+            list: mensagens, na ordem da tabela de regras
+        """
+        return [rule.message.format(cultura=self.cultura)
+                for rule, fired in zip(self.rules[kind], mask) if fired]
+
+    def _reading_messages(self, reading, kind, thresholds):
+        """
+        Mensagens das regras disparadas por uma leitura. Leituras escalares
+        (dict de números) são avaliadas sem montar arrays; as demais usam
+        rule_masks.
+        """
+        values = self._scalar_values(reading) if isinstance(reading, dict) else None
+        if values is None:
+            return self.messages(kind, self.rule_masks(reading, kind, thresholds)[0])
+        return self.messages(kind, self._fired(values, kind, self._merged_thresholds(thresholds)))
+
+    def recommendations(self, reading, thresholds=None):
+        """
+        Recomendações de uma leitura (dict).
+
+        Returns:
+            list: mensagens de recomendação
+        """
+        messages = self._reading_messages(reading, 'recommendation', thresholds)
+        return messages if messages else [RECOMMENDATION_FALLBACK]
+
+    def alerts(self, reading, thresholds=None):
+        """
+        Alertas de uma leitura (dict).
+
+        Returns:
+            list: mensagens de alerta
+        """
+        return self._reading_messages(reading, 'alert', thresholds)
+
+    def sensor_status(self, reading, thresholds=None):
+        """
+        Status de cada sensor de uma leitura (dict).
+
+        Returns:
+            dict: {feature: rótulo de STATUS_LABELS}
+        """
+        values = self._scalar_values(reading) if isinstance(reading, dict) else None
+        if values is None:
+            return {feature: STATUS_LABELS[codes[0]]
+                    for feature, codes in self.status_codes(reading, thresholds).items()}
+
+        thresholds = self._merged_thresholds(thresholds)
+        cache = {}
+        return {feature: STATUS_LABELS[int(self._status_code(values, rules, thresholds, cache))]
+                for feature, rules in self.status_rules.items()}
+
+
+DEFAULT_RULES_ENGINE = RulesEngine()
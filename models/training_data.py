@@ -0,0 +1,186 @@
+import numpy as np
+
+
+# A tabela leitura_solo guarda fósforo e potássio apenas como OK/Não OK.
+# Para alimentar o modelo (que usa ppm), cada estado é mapeado para um
+# valor representativo na escala de treinamento: dentro da faixa ideal
+# (média dos dados sintéticos) ou abaixo do limiar de deficiência.
+NUTRIENT_PROXY_PPM = {
+    'phosphorus': {True: 25.0, False: 10.0},
+    'potassium': {True: 150.0, False: 100.0}
+}
+
+# Faixas físicas de umidade (%) e pH
+LEITURA_SOLO_RANGES = {'umidade': (0.0, 100.0), 'ph': (0.0, 14.0)}
+
+# Capturas do ESP32 importadas sem conversão (ex.: scripts/import_data.py)
+# guardam umidade e pH multiplicados por 100
+RAW_CAPTURE_SCALE = 100.0
+
+# Leituras reais com as colunas já convertidas para tipos numéricos no
+# servidor, para que cada lote vire um array sem conversões em Python
+LEITURA_SOLO_TRAINING_QUERY = """
+    SELECT
+        ls.umidade::float8,
+        ls.ph::float8,
+        ls.fosforo_ok::int,
+        ls.potassio_ok::int,
+        (ls.irrigacao = 'Ativa')::int
+    FROM leitura_solo ls
+    JOIN sensor s ON s.id_sensor = ls.id_sensor
+    JOIN lote l ON l.id_lote = s.id_lote
+    JOIN cultura c ON c.id_cultura = l.id_cultura
+    WHERE (%(id_cultura)s IS NULL OR c.id_cultura = %(id_cultura)s)
+    ORDER BY ls.id_leitura_solo DESC
+    LIMIT %(limit)s
+"""
+
+LEITURA_SOLO_COUNT_QUERY = """
+    SELECT COUNT(*)
+    FROM leitura_solo ls
+    JOIN sensor s ON s.id_sensor = ls.id_sensor
+    JOIN lote l ON l.id_lote = s.id_lote
+    JOIN cultura c ON c.id_cultura = l.id_cultura
+    WHERE (%(id_cultura)s IS NULL OR c.id_cultura = %(id_cultura)s)
+"""
+
+# Bytes por linha carregada: 4 features float64 + rótulo int8
+BYTES_PER_ROW = 4 * 8 + 1
+
+
+def normalize_leitura_solo(umidade, ph, scale=None, allow_empty=False):
+    """
+    Converte umidade e pH de leitura_solo para % e unidades de pH.
+
+    Capturas do ESP32 importadas sem conversão guardam os dois valores
+    multiplicados por RAW_CAPTURE_SCALE. Sem scale, cada linha com umidade
+    ou pH acima da faixa física é tratada como uma dessas capturas.
+
+    Linhas que continuam fora da faixa física (ex.: leituras com defeito de
+    um sensor) são marcadas como inválidas e contadas em uma mensagem, sem
+    interromper o lote.
+
+    Args:
+        umidade: array de umidade
+        ph: array de pH
+        scale: divisor aplicado a todas as linhas (None = detecção por linha)
+        allow_empty: não gera erro quando nenhuma linha é válida (ex.: um
+                     lote de uma leitura em pedaços)
+
+    Returns:
+        tuple: (umidade, ph) em float64 e a máscara das linhas válidas
+
+    Raises:
+        ValueError: se nenhuma leitura está dentro da faixa física
+    """
+    umidade = np.asarray(umidade, dtype=np.float64)
+    ph = np.asarray(ph, dtype=np.float64)
+
+    if scale is not None:
+        umidade, ph = umidade / scale, ph / scale
+    else:
+        raw = (umidade > LEITURA_SOLO_RANGES['umidade'][1]) | (ph > LEITURA_SOLO_RANGES['ph'][1])
+        if raw.any():
+            divisor = np.where(raw, RAW_CAPTURE_SCALE, 1.0)
+            umidade, ph = umidade / divisor, ph / divisor
+
+    valid = np.ones(len(umidade), dtype=bool)
+    for name, values in (('umidade', umidade), ('ph', ph)):
+        low, high = LEITURA_SOLO_RANGES[name]
+        # Comparações com NaN são falsas: leituras nulas também são inválidas
+        valid &= (values >= low) & (values <= high)
+
+    n_invalid = int(len(valid) - valid.sum())
+    if n_invalid:
+        first = np.flatnonzero(~valid)[0]
+        message = (f"{n_invalid} de {len(valid)} leituras com umidade ou pH fora da faixa física "
+                   f"(ex.: umidade={umidade[first]:g}, ph={ph[first]:g})")
+        if n_invalid == len(valid) and not allow_empty:
+            raise ValueError(message)
+        print(f"{message} descartadas")
+
+    return umidade, ph, valid
+
+
+def leitura_solo_features(umidade, ph, fosforo_ok, potassio_ok, scale=None, allow_empty=False):
+    """
+    Converte colunas de leitura_solo na matriz de features do modelo.
+
+    Args:
+        umidade: array de umidade (%)
+        ph: array de pH
+        fosforo_ok: array booleano (fósforo dentro da faixa)
+        potassio_ok: array booleano (potássio dentro da faixa)
+        scale: divisor de umidade e pH (ver normalize_leitura_solo)
+        allow_empty: ver normalize_leitura_solo
+
+    Returns:
+        tuple: matriz (n_válidas, 4) [humidity, ph, phosphorus, potassium]
+               e a máscara (n,) das linhas de entrada mantidas
+    """
+    umidade, ph, valid = normalize_leitura_solo(umidade, ph, scale, allow_empty)
+    fosforo_ok = np.asarray(fosforo_ok, dtype=bool)[valid]
+    potassio_ok = np.asarray(potassio_ok, dtype=bool)[valid]
+
+    phosphorus = np.where(fosforo_ok, NUTRIENT_PROXY_PPM['phosphorus'][True],
+                          NUTRIENT_PROXY_PPM['phosphorus'][False])
+    potassium = np.where(potassio_ok, NUTRIENT_PROXY_PPM['potassium'][True],
+                         NUTRIENT_PROXY_PPM['potassium'][False])
+
+    X = np.column_stack([
+        umidade[valid],
+        ph[valid],
+        phosphorus,
+        potassium
+    ])
+    return X, valid
+
+
+def load_leitura_solo_arrays(db, chunk_size=50_000, max_memory_mb=512, id_cultura=None):
+    """
+    Carrega o histórico de leitura_solo em arrays NumPy pré-alocados.
+
+    As linhas são lidas por um cursor do lado do servidor em lotes de
+    chunk_size e copiadas direto para os arrays, então apenas um lote
+    existe como tuplas Python em cada momento. Se o histórico não couber
+    no orçamento de memória, são usadas as leituras mais recentes.
+
+    Args:
+        db: DatabaseManager conectado
+        chunk_size: linhas por lote lido do servidor
+        max_memory_mb: orçamento de memória dos arrays resultantes
+        id_cultura: restringe às leituras dos lotes de uma cultura
+
+    Returns:
+        tuple: X (n, 4) float64 e y (n,) int8 (1 = irrigação ativa)
+    """
+    params = {'id_cultura': id_cultura}
+    total_rows = db.execute_query(LEITURA_SOLO_COUNT_QUERY, params).fetchone()[0]
+
+    max_rows = int(max_memory_mb * 1024 * 1024 // BYTES_PER_ROW)
+    n_rows = min(total_rows, max_rows)
+    if n_rows < total_rows:
+        print(f"Histórico com {total_rows} leituras excede o orçamento de memória; "
+              f"usando as {n_rows} mais recentes")
+
+    X = np.empty((n_rows, 4), dtype=np.float64)
+    y = np.empty(n_rows, dtype=np.int8)
+
+    filled = 0
+    params['limit'] = n_rows
+    for rows in db.stream_query(LEITURA_SOLO_TRAINING_QUERY, params, chunk_size=chunk_size,
+                                cursor_name='leitura_solo_training'):
+        chunk = np.array(rows, dtype=np.float64)
+        features, valid = leitura_solo_features(chunk[:, 0], chunk[:, 1], chunk[:, 2],
+                                                chunk[:, 3], allow_empty=True)
+        end = filled + len(features)
+        X[filled:end] = features
+        y[filled:end] = chunk[valid, 4]
+        filled = end
+
+    if n_rows and not filled:
+        raise ValueError("Nenhuma leitura de solo com umidade e pH dentro da faixa física")
+
+    # Leituras inválidas ou apagadas entre a contagem e a leitura deixam o
+    # final vazio
+    return X[:filled], y[:filled]
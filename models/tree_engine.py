@@ -0,0 +1,396 @@
+import hashlib
+import json
+import struct
+
+import numpy as np
+
+
+# Layout de arquivo para carga com mapeamento em memória: cabeçalho JSON
+# seguido dos arrays, cada um alinhado em ARRAY_ALIGNMENT bytes
+ARRAYS_MAGIC = b'IRRFOREST1'
+ARRAY_ALIGNMENT = 64
+
+
+# Chaves inteiras ordenadas para floats64 (permitem bissecção exata)
+_INT64_MIN = np.int64(-0x8000000000000000)
+
+
+def _float_to_key(values):
+    bits = np.asarray(values, dtype=np.float64).view(np.int64)
+    return np.where(bits < 0, _INT64_MIN - bits, bits)
+
+
+def _key_to_float(keys):
+    bits = np.where(keys < 0, _INT64_MIN - keys, keys)
+    return bits.astype(np.int64).view(np.float64)
+
+
+def _fold_thresholds(threshold, mean, scale):
+    """
+    Converte limiares do espaço escalado para o espaço bruto.
+
+    O sklearn compara float32((x - mean) / scale) <= t. Como essa função é
+    monótona em x, existe um maior float64 T tal que a comparação equivale
+    a x <= T; ele é encontrado por bissecção sobre a representação binária,
+    garantindo decisões idênticas às da floresta original.
+
+    Args:
+        threshold: limiares no espaço escalado, shape (n_nodes,)
+        mean: média de cada nó (da feature testada), shape (n_nodes,)
+        scale: desvio de cada nó (da feature testada), shape (n_nodes,)
+
+    Returns:
+        numpy.ndarray: limiares no espaço bruto (float64)
+    """
+    def passes(x):
+        return ((x - mean) / scale).astype(np.float32) <= threshold
+
+    approx = threshold * scale + mean
+    delta = (np.abs(threshold) * scale + np.abs(mean)) * 1e-5 + 1e-300
+    lo = approx - delta
+    hi = approx + delta
+
+    if not (passes(lo).all() and not passes(hi).any()):
+        raise ValueError("Falha ao incorporar o scaler aos limiares da floresta")
+
+    lo_key = _float_to_key(lo)
+    hi_key = _float_to_key(hi)
+
+    # Invariante: passes(lo) é verdadeiro e passes(hi) é falso
+    while np.any(hi_key - lo_key > 1):
+        mid_key = lo_key + (hi_key - lo_key) // 2
+        ok = passes(_key_to_float(mid_key))
+        lo_key = np.where(ok, mid_key, lo_key)
+        hi_key = np.where(ok, hi_key, mid_key)
+
+    return _key_to_float(lo_key)
+
+
+class FlatForest:
+    """
+    Motor de inferência com as árvores de um RandomForestClassifier
+    exportadas para arrays NumPy contíguos (feature, limiar, filhos e
+    probabilidades das folhas), com o StandardScaler incorporado aos
+    limiares. Evita a validação de entrada e o despacho via joblib do
+    sklearn, que dominam a latência de predições de uma única linha.
+
+    É um caminho de baixa latência para poucas linhas: em lotes grandes a
+    travessia vetorizada nó a nó é várias vezes mais lenta que a do
+    sklearn (use o backend 'sklearn' ou 'grid' para pontuação em massa).
+    """
+
+    # Linhas processadas por vez em predict_proba (limita a memória de
+    # trabalho a n_trees x CHUNK_ROWS índices de nó)
+    CHUNK_ROWS = 32_768
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes = classes
+
+    @classmethod
+    def from_model(cls, model, scaler=None):
+        """
+        Exporta uma floresta treinada.
+
+        Args:
+            model: RandomForestClassifier treinado
+            scaler: StandardScaler aplicado às features antes da floresta
+
+        Returns:
+            FlatForest: motor equivalente operando sobre features brutas
+        """
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            # Folhas apontam para si mesmas, então a travessia pode rodar
+            # um número fixo de passos sem testar se chegou a uma folha
+            feature = np.where(is_leaf, 0, tree.feature)
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            # Mesma normalização de DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :model.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(proba / normalizer)
+            roots.append(offset)
+
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        feature = np.concatenate(features).astype(np.intp)
+        threshold = np.concatenate(thresholds).astype(np.float64)
+
+        if scaler is not None:
+            internal = np.isfinite(threshold)
+            node_feature = feature[internal]
+            threshold[internal] = _fold_thresholds(
+                threshold[internal],
+                scaler.mean_[node_feature],
+                scaler.scale_[node_feature]
+            )
+
+        return cls(
+            feature=feature,
+            threshold=threshold,
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=int(max_depth),
+            classes=np.asarray(model.classes_)
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        """
+        Memória ocupada pelos arrays de nós.
+        """
+        return sum(array.nbytes for array in self.to_dict().values()
+                   if isinstance(array, np.ndarray))
+
+    def digest(self):
+        """
+        Hash do conteúdo dos arrays: identifica a floresta (ex.: para
+        invalidar resultados calculados sobre um modelo que foi trocado).
+        """
+        sha = hashlib.sha256()
+        for name, array in sorted(self.to_dict().items()):
+            sha.update(name.encode('utf-8'))
+            sha.update(np.ascontiguousarray(array).tobytes() if isinstance(array, np.ndarray)
+                       else repr(array).encode('utf-8'))
+        return sha.hexdigest()[:16]
+
+    def compact(self, n_trees=None, max_depth=None, dtype=np.float32):
+        """
+        Gera uma floresta reduzida: apenas as primeiras n_trees árvores,
+        podadas em max_depth (nós nessa profundidade viram folhas com a
+        distribuição de classes do próprio nó) e com limiares, valores e
+        índices em tipos menores.
+
+        Args:
+            n_trees: número de árvores mantidas (padrão: todas)
+            max_depth: profundidade máxima (padrão: a atual)
+            dtype: tipo de ponto flutuante de limiares e valores
+
+        Returns:
+            FlatForest: floresta compacta
+        """
+        n_trees = min(n_trees or self.n_trees, self.n_trees)
+        max_depth = min(max_depth or self.max_depth, self.max_depth)
+
+        # Percorrer as árvores mantidas nível a nível (ordem de busca em largura)
+        levels = []
+        level = self.roots[:n_trees]
+        for depth in range(max_depth + 1):
+            levels.append(level)
+            internal = level[self.left[level] != level]
+            if depth == max_depth or len(internal) == 0:
+                break
+            level = np.concatenate([self.left[internal], self.right[internal]])
+
+        old_ids = np.concatenate(levels)
+        new_ids = np.full(self.n_nodes, -1, dtype=np.int64)
+        new_ids[old_ids] = np.arange(len(old_ids))
+
+        is_leaf = self.left[old_ids] == old_ids
+        if len(levels) == max_depth + 1:
+            # Nós no nível de corte viram folhas
+            is_leaf[len(old_ids) - len(levels[-1]):] = True
+        own_id = np.arange(len(old_ids))
+
+        index_dtype = np.int32 if len(old_ids) < 2 ** 31 else np.int64
+        feature_dtype = np.int8 if self.feature.max() < 2 ** 7 else np.intp
+
+        return FlatForest(
+            feature=np.where(is_leaf, 0, self.feature[old_ids]).astype(feature_dtype),
+            threshold=np.where(is_leaf, np.inf, self.threshold[old_ids]).astype(dtype),
+            left=np.where(is_leaf, own_id, new_ids[self.left[old_ids]]).astype(index_dtype),
+            right=np.where(is_leaf, own_id, new_ids[self.right[old_ids]]).astype(index_dtype),
+            value=self.value[old_ids].astype(dtype),
+            roots=new_ids[self.roots[:n_trees]].astype(index_dtype),
+            max_depth=len(levels) - 1,
+            classes=self.classes
+        )
+
+    def to_dict(self):
+        """
+        Exporta os arrays da floresta (para serialização).
+        """
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'left': self.left,
+            'right': self.right,
+            'value': self.value,
+            'roots': self.roots,
+            'classes': self.classes,
+            'max_depth': self.max_depth
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstrói a floresta a partir de to_dict().
+        """
+        return cls(**{**data, 'max_depth': int(data['max_depth'])})
+
+    def save_arrays(self, f, metadata=None):
+        """
+        Grava a floresta em um arquivo binário que pode ser carregado com
+        mapeamento em memória (ver load_arrays).
+
+        Args:
+            f: objeto de arquivo binário
+            metadata: dict serializável em JSON gravado no cabeçalho
+        """
+        arrays = {name: np.ascontiguousarray(value)
+                  for name, value in self.to_dict().items() if isinstance(value, np.ndarray)}
+
+        def header_bytes(offset_base):
+            entries, offset = {}, offset_base
+            for name, array in arrays.items():
+                offset = -(-offset // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+                entries[name] = {'dtype': array.dtype.str, 'shape': list(array.shape),
+                                 'offset': offset}
+                offset += array.nbytes
+            header = {'arrays': entries, 'max_depth': self.max_depth,
+                      'metadata': metadata or {}}
+            return json.dumps(header).encode('utf-8'), entries
+
+        # O cabeçalho contém os offsets, que dependem do tamanho do cabeçalho
+        prefix = len(ARRAYS_MAGIC) + 8
+        header, entries = header_bytes(prefix)
+        while True:
+            new_header, entries = header_bytes(prefix + len(header))
+            if len(new_header) == len(header):
+                header = new_header
+                break
+            header = new_header
+
+        f.write(ARRAYS_MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        position = prefix + len(header)
+        for name, array in arrays.items():
+            f.write(b'\0' * (entries[name]['offset'] - position))
+            f.write(array.tobytes())
+            position = entries[name]['offset'] + array.nbytes
+
+    @classmethod
+    def load_arrays(cls, filepath, mmap=True):
+        """
+        Carrega uma floresta gravada por save_arrays().
+
+        Com mmap=True, os arrays apontam diretamente para as páginas do
+        arquivo no cache do sistema operacional, compartilhadas por todos
+        os processos que carregam o mesmo arquivo.
+
+        Returns:
+            tuple: (FlatForest, metadata)
+        """
+        with open(filepath, 'rb') as f:
+            if f.read(len(ARRAYS_MAGIC)) != ARRAYS_MAGIC:
+                raise ValueError(f"Arquivo {filepath} não é uma floresta em arrays")
+            header_size = struct.unpack('<Q', f.read(8))[0]
+            header = json.loads(f.read(header_size).decode('utf-8'))
+
+            arrays = {}
+            for name, entry in header['arrays'].items():
+                dtype = np.dtype(entry['dtype'])
+                shape = tuple(entry['shape'])
+                if mmap:
+                    mapped = np.memmap(filepath, dtype=dtype, mode='r',
+                                       offset=entry['offset'], shape=shape)
+                    # Visão ndarray simples (sem cópia) evita o custo da subclasse
+                    arrays[name] = np.asarray(mapped)
+                else:
+                    f.seek(entry['offset'])
+                    count = int(np.prod(shape))
+                    arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+
+        forest = cls.from_dict({**arrays, 'max_depth': header['max_depth']})
+        return forest, header['metadata']
+
+    def apply(self, X):
+        """
+        Percorre todas as árvores para todas as linhas (sem divisão em
+        pedaços; para lotes grandes use predict_proba).
+
+        Args:
+            X: array (n_samples, n_features) de features brutas
+
+        Returns:
+            numpy.ndarray: índice da folha, shape (n_trees, n_samples)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        rows = np.arange(len(X))[np.newaxis, :]
+        node = np.repeat(self.roots[:, np.newaxis], len(X), axis=1)
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        return node
+
+    def predict_proba(self, X):
+        """
+        Prediz probabilidades idênticas às de RandomForestClassifier.
+
+        Args:
+            X: array (n_samples, n_features) de features brutas
+
+        Returns:
+            numpy.ndarray: probabilidades, shape (n_samples, n_classes)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        proba = np.zeros((len(X), self.value.shape[1]), dtype=np.float64)
+
+        for start in range(0, len(X), self.CHUNK_ROWS):
+            end = min(start + self.CHUNK_ROWS, len(X))
+            leaves = self.apply(X[start:end])
+            # Soma sequencial árvore a árvore, na mesma ordem do sklearn
+            for tree_leaves in leaves:
+                proba[start:end] += self.value[tree_leaves]
+
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        """
+        Prediz as classes.
+
+        Args:
+            X: array (n_samples, n_features) de features brutas
+
+        Returns:
+            numpy.ndarray: classes preditas
+        """
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DatabaseManager
+from models.irrigation_model import IrrigationModel, DEFAULT_ARTIFACT_DIR
+from models.backfill import (LEITURA_SOLO_ID_RANGE_QUERY, BackfillCheckpoint,
+                             artifact_model_version, plan_ranges, run_backfill)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Recalcula as predições de irrigação de todo o histórico de leitura_solo")
+    parser.add_argument('--artifact', default=None,
+                        help="artefato do modelo (padrão: modelo do cache)")
+    parser.add_argument('--model-version', default=None,
+                        help="rótulo gravado em versao_modelo (padrão: nome e hash "
+                             "do conteúdo do artefato)")
+    parser.add_argument('--range-size', type=int, default=50_000,
+                        help="ids de leitura_solo por faixa")
+    parser.add_argument('--n-jobs', type=int, default=None,
+                        help="processos do pool (padrão: todos os núcleos)")
+    parser.add_argument('--backend', default=None, choices=IrrigationModel.SELECTABLE_BACKENDS,
+                        help="backend de inferência dos workers (padrão: sklearn; artefatos em "
+                             "arrays usam o próprio backend)")
+    parser.add_argument('--checkpoint', default=None,
+                        help="arquivo de checkpoint (padrão: no diretório de artefatos)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Garante um artefato em disco para os workers carregarem
+    model = IrrigationModel(artifact_path=args.artifact)
+    if model.artifact_path is None:
+        print("O modelo não possui artefato em disco; use --artifact.")
+        sys.exit(1)
+
+    model_version = args.model_version or artifact_model_version(model.artifact_path)
+    checkpoint_path = args.checkpoint or os.path.join(DEFAULT_ARTIFACT_DIR,
+                                                      f'backfill_{model_version}.jsonl')
+
+    db = DatabaseManager()
+    db.connect()
+    try:
+        min_id, max_id = db.execute_query(LEITURA_SOLO_ID_RANGE_QUERY).fetchone()
+    finally:
+        db.disconnect()
+
+    ranges = plan_ranges(min_id, max_id, args.range_size)
+    if not ranges:
+        print("Nenhuma leitura de solo encontrada.")
+        return
+
+    checkpoint = BackfillCheckpoint(checkpoint_path, model_version)
+    result = run_backfill(ranges, checkpoint, model.artifact_path,
+                          inference_backend=args.backend, n_jobs=args.n_jobs)
+
+    print(f"\nBackfill concluído: {result['rows']} predições em {result['ranges']} faixas "
+          f"({result['duration_s']:.1f}s, {result['rows_per_second']:.0f} linhas/s)")
+    print(f"Checkpoint: {checkpoint_path}")
+
+
+if __name__ == "__main__":
+    main()
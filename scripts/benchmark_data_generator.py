@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_generator import SensorDataGenerator
+
+
+# (horas, frequência em minutos): dashboard (24h a cada 30 min) e séries longas
+CENARIOS = [(24, 30), (24 * 7, 5), (24 * 90, 1)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compara generate_historical_data vetorizado com o laço por leitura")
+    parser.add_argument('--max-loop-rows', type=int, default=20_000,
+                        help="acima deste número de leituras o laço é estimado por amostra")
+    return parser.parse_args()
+
+
+def gerar_em_laco(gerador, hours, frequency_minutes):
+    """
+    Implementação anterior: uma chamada a generate_current_reading por timestamp.
+    """
+    end_time = datetime.now()
+    timestamps = pd.date_range(start=end_time - timedelta(hours=hours), end=end_time,
+                               freq=f'{frequency_minutes}min')
+    df = pd.DataFrame([gerador.generate_current_reading(timestamp) for timestamp in timestamps])
+    return gerador._add_realistic_trends(df)
+
+
+def cronometrar(funcao, repeticoes=3):
+    """
+    Menor tempo de algumas execuções (após uma de aquecimento).
+
+    Returns:
+        tuple: (tempo em segundos, resultado da última execução)
+    """
+    resultado = funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    args = parse_args()
+    gerador = SensorDataGenerator()
+
+    print(f"{'cenário':<22}{'leituras':>10}{'laço (s)':>12}{'vetorizado (s)':>16}{'ganho':>10}")
+    for hours, frequency in CENARIOS:
+        tempo_vetorizado, vetorizado = cronometrar(
+            lambda: gerador.generate_historical_data(hours, frequency))
+
+        # Séries longas: mede o laço em uma amostra e extrapola
+        n_linhas = len(vetorizado)
+        horas_laco = min(hours, args.max_loop_rows * frequency / 60)
+        tempo_laco, laco = cronometrar(lambda: gerar_em_laco(gerador, horas_laco, frequency), 1)
+        tempo_laco *= n_linhas / len(laco)
+
+        assert list(laco.columns) == list(vetorizado.columns)
+        assert (laco.dtypes == vetorizado.dtypes).all()
+
+        estimado = '*' if len(laco) < n_linhas else ' '
+        print(f"{f'{hours}h a cada {frequency} min':<22}{n_linhas:>10}{tempo_laco:>11.3f}{estimado}"
+              f"{tempo_vetorizado:>16.4f}{tempo_laco / tempo_vetorizado:>9.0f}x")
+
+    print("\n* tempo do laço extrapolado a partir de uma amostra")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import sys
+import os
+import time
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.irrigation_model import IrrigationModel
+
+
+def gerar_leituras(n_rows, seed=0):
+    """
+    Gera leituras aleatórias dentro dos limites usados no treinamento.
+    """
+    rng = np.random.default_rng(seed)
+    low = np.array([15, 5.5, 5, 80])
+    high = np.array([85, 8.0, 50, 250])
+    return rng.uniform(low, high, size=(n_rows, 4))
+
+
+def medir_latencia(funcao, linhas, repeticoes=3):
+    """
+    Mede a latência de cada chamada em microssegundos.
+
+    Returns:
+        numpy.ndarray: latências de todas as chamadas
+    """
+    latencias = []
+    for _ in range(repeticoes):
+        for linha in linhas:
+            inicio = time.perf_counter()
+            funcao(linha)
+            latencias.append((time.perf_counter() - inicio) * 1e6)
+    return np.array(latencias)
+
+
+def main():
+    n_linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    sklearn_model = IrrigationModel(inference_backend='sklearn')
+    flat_model = IrrigationModel(inference_backend='flat')
+    grid_model = IrrigationModel(inference_backend='grid')
+
+    # Verificar equivalência das probabilidades
+    X = gerar_leituras(100_000, seed=1)
+    proba_sklearn = sklearn_model.predict_proba(X)
+    proba_flat = flat_model.predict_proba(X)
+    identicas = np.array_equal(proba_sklearn, proba_flat)
+    print(f"Probabilidades idênticas em {len(X)} linhas: {'SIM' if identicas else 'NÃO'}"
+          f" (diferença máxima: {np.abs(proba_sklearn - proba_flat).max():.3e})")
+
+    # Latência de uma única linha
+    linhas = [linha[np.newaxis, :] for linha in gerar_leituras(n_linhas)]
+    print(f"\nLatência por predição de uma linha ({len(linhas) * 3} chamadas):")
+    print(f"{'backend':<10}{'p50 (µs)':>12}{'p99 (µs)':>12}{'média (µs)':>12}")
+    resultados = {}
+    for nome, modelo in (('sklearn', sklearn_model), ('flat', flat_model), ('grid', grid_model)):
+        modelo.predict_proba(linhas[0])  # Aquecimento
+        latencias = medir_latencia(modelo.predict_proba, linhas)
+        resultados[nome] = latencias
+        print(f"{nome:<10}{np.percentile(latencias, 50):>12.1f}"
+              f"{np.percentile(latencias, 99):>12.1f}{latencias.mean():>12.1f}")
+
+    for nome in ('flat', 'grid'):
+        speedup = np.median(resultados['sklearn']) / np.median(resultados[nome])
+        print(f"\nGanho na mediana ({nome}): {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
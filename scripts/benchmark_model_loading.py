@@ -0,0 +1,115 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.process_metrics import (current_rss_bytes, proportional_set_size_bytes,
+                                   file_size_bytes)
+
+# Variantes comparadas: (nome, layout do artefato)
+VARIANTES = [
+    ('joblib', 'joblib'),
+    ('joblib-mmap', 'joblib'),
+    ('arrays-copia', 'arrays'),
+    ('arrays-mmap', 'arrays')
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compara tempo de carga e memória por processo dos layouts do modelo")
+    parser.add_argument('--processes', type=int, default=4,
+                        help="processos carregando o modelo ao mesmo tempo")
+    return parser.parse_args()
+
+
+def carregar(variante, caminho, barreira, fila):
+    """
+    Carrega o modelo em um processo e mede tempo, RSS e PSS.
+
+    O PSS é medido depois que todos os processos carregaram o modelo, para
+    que as páginas compartilhadas apareçam divididas entre eles.
+    """
+    import joblib
+    import numpy as np
+    from models.irrigation_model import IrrigationModel
+
+    linha = np.array([[50.0, 6.5, 25.0, 150.0]])
+    rss_antes = current_rss_bytes()
+    pss_antes = proportional_set_size_bytes()
+    inicio = time.perf_counter()
+
+    if variante == 'joblib-mmap':
+        # joblib mapeia os arrays, mas as árvores do sklearn os copiam ao carregar
+        dados = joblib.load(caminho, mmap_mode='r')
+        dados['model'].predict_proba(dados['scaler'].transform(linha))
+    else:
+        modelo = IrrigationModel(artifact_path=caminho, mmap=(variante == 'arrays-mmap'))
+        modelo.predict_proba(linha)  # Tocar as páginas usadas na inferência
+
+    tempo = time.perf_counter() - inicio
+    rss_depois = current_rss_bytes()
+
+    barreira.wait()
+    pss_depois = proportional_set_size_bytes()
+    fila.put({
+        'load_time_s': tempo,
+        'rss_bytes': rss_depois - rss_antes if rss_antes is not None else None,
+        'pss_bytes': pss_depois - pss_antes if pss_antes is not None else None
+    })
+    barreira.wait()
+
+
+def medir_variante(variante, caminho, n_processos):
+    contexto = multiprocessing.get_context('spawn')
+    barreira = contexto.Barrier(n_processos)
+    fila = contexto.Queue()
+    processos = [contexto.Process(target=carregar, args=(variante, caminho, barreira, fila))
+                 for _ in range(n_processos)]
+    for processo in processos:
+        processo.start()
+    resultados = [fila.get() for _ in processos]
+    for processo in processos:
+        processo.join()
+    return resultados
+
+
+def media(resultados, chave):
+    valores = [r[chave] for r in resultados if r[chave] is not None]
+    return sum(valores) / len(valores) if valores else None
+
+
+def formatar_mb(valor):
+    return f"{valor / 1024 / 1024:.2f}" if valor is not None else "n/d"
+
+
+def main():
+    args = parse_args()
+
+    from models.irrigation_model import IrrigationModel
+    modelo = IrrigationModel()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhos = {
+            'joblib': os.path.join(diretorio, 'modelo.joblib'),
+            'arrays': os.path.join(diretorio, 'modelo.forest')
+        }
+        for layout, caminho in caminhos.items():
+            modelo.save_model(caminho, layout=layout)
+
+        print(f"{args.processes} processos por variante\n")
+        print(f"{'variante':<14}{'arquivo (MB)':>14}{'carga (ms)':>12}"
+              f"{'RSS/proc (MB)':>15}{'PSS/proc (MB)':>15}")
+        for variante, layout in VARIANTES:
+            resultados = medir_variante(variante, caminhos[layout], args.processes)
+            print(f"{variante:<14}{formatar_mb(file_size_bytes(caminhos[layout])):>14}"
+                  f"{media(resultados, 'load_time_s') * 1000:>12.1f}"
+                  f"{formatar_mb(media(resultados, 'rss_bytes')):>15}"
+                  f"{formatar_mb(media(resultados, 'pss_bytes')):>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sklearn
+
+from models.irrigation_model import IrrigationModel
+from models.rules import DEFAULT_RULES_ENGINE
+
+
+FEATURES = ['humidity', 'ph', 'phosphorus', 'potassium']
+
+# Maior lote medido por backend (limitado também por --max-batch). O flat é o
+# caminho de baixa latência para poucas linhas; com 10^6 linhas cada medição
+# (pelo menos 3 repetições) levaria dezenas de segundos sem informar nada novo
+MAX_BATCH_PER_BACKEND = {'flat': 10**5}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Mede latência, vazão e tempo de inicialização do IrrigationModel")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="arquivo JSON com os resultados")
+    parser.add_argument('--compare', default=None,
+                        help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--backends', default='sklearn,flat,grid',
+                        help="backends de inferência medidos (separados por vírgula)")
+    parser.add_argument('--max-batch', type=int, default=10**6,
+                        help="maior tamanho de lote (potências de 10 a partir de 1)")
+    parser.add_argument('--rows', type=int, default=500,
+                        help="chamadas por medição de latência de uma linha")
+    parser.add_argument('--repeats', type=int, default=3,
+                        help="repetições das medições de inicialização")
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def gerar_leituras(n_rows, seed=0):
+    """
+    Gera leituras aleatórias dentro dos limites usados no treinamento.
+    """
+    bounds = np.array([IrrigationModel.FEATURE_BOUNDS[name] for name in FEATURES])
+    rng = np.random.default_rng(seed)
+    return rng.uniform(bounds[:, 0], bounds[:, 1], size=(n_rows, len(FEATURES)))
+
+
+def ambiente():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def resumo(tempos_s):
+    """
+    Estatísticas de uma lista de tempos, em microssegundos.
+    """
+    us = np.asarray(tempos_s) * 1e6
+    return {
+        'n': int(len(us)),
+        'p50_us': float(np.percentile(us, 50)),
+        'p90_us': float(np.percentile(us, 90)),
+        'p99_us': float(np.percentile(us, 99)),
+        'mean_us': float(us.mean()),
+        'max_us': float(us.max())
+    }
+
+
+def cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def medir_inicializacao(repeticoes):
+    """
+    Tempo de construção do modelo: treino, carga do cache (joblib) e carga
+    do layout de arrays mapeado em memória.
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        treino = cronometrar(lambda: IrrigationModel(use_cache=False), repeticoes)
+
+        modelo = IrrigationModel(cache_dir=diretorio)  # Grava o artefato no cache
+        carga = cronometrar(lambda: IrrigationModel(cache_dir=diretorio), repeticoes)
+
+        caminho_arrays = os.path.join(diretorio, 'modelo.forest')
+        modelo.save_model(caminho_arrays, layout='arrays')
+        carga_arrays = cronometrar(lambda: IrrigationModel(artifact_path=caminho_arrays),
+                                   repeticoes)
+
+    return {
+        'train': resumo(treino),
+        'load_joblib': resumo(carga),
+        'load_arrays_mmap': resumo(carga_arrays)
+    }
+
+
+def medir_latencia(modelo, leituras):
+    """
+    Latência por chamada de uma linha para cada método público.
+    """
+    linhas = [linha[np.newaxis, :] for linha in leituras]
+    dicts = [dict(zip(FEATURES, map(float, linha))) for linha in leituras]
+
+    metodos = {
+        'predict': (modelo.predict, linhas),
+        'predict_proba': (modelo.predict_proba, linhas),
+        'predict_with_proba': (modelo.predict_with_proba, dicts),
+        'get_recommendations': (modelo.get_recommendations, dicts)
+    }
+
+    resultados = {}
+    for nome, (funcao, entradas) in metodos.items():
+        funcao(entradas[0])  # Aquecimento
+        tempos = []
+        for entrada in entradas:
+            inicio = time.perf_counter()
+            funcao(entrada)
+            tempos.append(time.perf_counter() - inicio)
+        resultados[nome] = resumo(tempos)
+    return resultados
+
+
+def medir_vazao(funcao, X, tempo_minimo=0.2):
+    """
+    Vazão de uma função em lote: repete até tempo_minimo segundos (pelo
+    menos 3 vezes) e usa a mediana.
+
+    Returns:
+        dict: linhas, tempo mediano (s) e linhas por segundo
+    """
+    funcao(X[:1])  # Aquecimento
+    tempos = []
+    inicio = time.perf_counter()
+    while len(tempos) < 3 or time.perf_counter() - inicio < tempo_minimo:
+        tempos.append(cronometrar(lambda: funcao(X), 1)[0])
+    mediana = float(np.median(tempos))
+    return {'rows': len(X), 'median_s': mediana, 'rows_per_second': len(X) / mediana}
+
+
+def comparar(atual, anterior, prefixo=''):
+    """
+    Imprime a variação das métricas em relação a uma execução anterior.
+    """
+    for chave, valor in atual.items():
+        if chave not in anterior:
+            continue
+        nome = f"{prefixo}{chave}"
+        if isinstance(valor, dict):
+            comparar(valor, anterior[chave], nome + '.')
+        elif chave in ('p50_us', 'p99_us', 'rows_per_second') and anterior[chave]:
+            variacao = (valor / anterior[chave] - 1) * 100
+            print(f"{nome:<60}{anterior[chave]:>14.1f}{valor:>14.1f}{variacao:>+9.1f}%")
+
+
+def main():
+    args = parse_args()
+    backends = args.backends.split(',')
+    tamanhos = [10**i for i in range(int(np.log10(args.max_batch)) + 1)]
+    X = gerar_leituras(tamanhos[-1], seed=args.seed)
+
+    resultados = {'environment': ambiente(), 'config': vars(args)}
+
+    print("Medindo inicialização do modelo...")
+    resultados['cold_start'] = medir_inicializacao(args.repeats)
+    for nome, r in resultados['cold_start'].items():
+        print(f"  {nome:<18}{r['p50_us'] / 1000:>10.1f} ms")
+
+    resultados['latency'] = {}
+    resultados['throughput'] = {}
+    for backend in backends:
+        modelo = IrrigationModel(inference_backend=backend)
+
+        print(f"\nBackend {backend}: latência de uma linha ({args.rows} chamadas)")
+        latencias = medir_latencia(modelo, gerar_leituras(args.rows, seed=args.seed + 1))
+        resultados['latency'][backend] = latencias
+        for nome, r in latencias.items():
+            print(f"  {nome:<22}p50 {r['p50_us']:>9.1f} µs   p99 {r['p99_us']:>9.1f} µs")
+
+        print(f"Backend {backend}: vazão de predict_proba em lote")
+        resultados['throughput'][backend] = {}
+        limite = MAX_BATCH_PER_BACKEND.get(backend, args.max_batch)
+        for n in (n for n in tamanhos if n <= limite):
+            r = medir_vazao(modelo.predict_proba, X[:n])
+            resultados['throughput'][backend][str(n)] = r
+            print(f"  {n:>9} linhas: {r['rows_per_second']:>14,.0f} linhas/s")
+
+    print("\nRegras (RulesEngine.evaluate) em lote")
+    resultados['throughput']['rules'] = {}
+    for n in tamanhos:
+        r = medir_vazao(DEFAULT_RULES_ENGINE.evaluate, X[:n])
+        resultados['throughput']['rules'][str(n)] = r
+        print(f"  {n:>9} linhas: {r['rows_per_second']:>14,.0f} linhas/s")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados salvos em: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            anterior = json.load(f)
+        print(f"\nComparação com {args.compare} (commit {anterior['environment'].get('commit')}):")
+        print(f"{'métrica':<60}{'anterior':>14}{'atual':>14}{'variação':>10}")
+        for secao in ('cold_start', 'latency', 'throughput'):
+            comparar(resultados[secao], anterior.get(secao, {}), secao + '.')
+
+
+if __name__ == "__main__":
+    main()
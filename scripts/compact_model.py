@@ -0,0 +1,87 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.irrigation_model import IrrigationModel, DEFAULT_ARTIFACT_DIR
+from utils.process_metrics import current_rss_bytes, file_size_bytes
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compacta o modelo de irrigação")
+    parser.add_argument('--max-accuracy-loss', type=float, default=0.01,
+                        help="perda de acurácia tolerada (ex.: 0.01 = 1 p.p.)")
+    parser.add_argument('--source', default=None,
+                        help="artefato a compactar (padrão: modelo do cache)")
+    parser.add_argument('--output', default=os.path.join(DEFAULT_ARTIFACT_DIR,
+                                                         'irrigation_model_compact.joblib'),
+                        help="caminho do artefato compacto")
+    return parser.parse_args()
+
+
+def medir_carga(caminho):
+    """
+    Mede tempo de carga e memória residente adicionada pelo modelo.
+
+    Executa em um processo novo para que a medição não seja afetada pelo
+    que já está carregado no processo principal.
+    """
+    import numpy as np
+    rss_antes = current_rss_bytes()
+    inicio = time.perf_counter()
+    modelo = IrrigationModel(artifact_path=caminho)
+    tempo = time.perf_counter() - inicio
+    modelo.predict_proba(np.array([[50.0, 6.5, 25.0, 150.0]]))
+    rss_depois = current_rss_bytes()
+
+    return {
+        'load_time_s': tempo,
+        'rss_bytes': rss_depois - rss_antes if rss_antes is not None else None
+    }
+
+
+def formatar_mb(valor):
+    return f"{valor / 1024 / 1024:.2f} MB" if valor is not None else "n/d"
+
+
+def main():
+    args = parse_args()
+
+    modelo = IrrigationModel(artifact_path=args.source) if args.source else IrrigationModel()
+    origem = modelo.artifact_path
+
+    relatorio = modelo.compact(max_accuracy_loss=args.max_accuracy_loss)
+    modelo.save_model(args.output)
+
+    print(f"Acurácia de referência: {relatorio['baseline_accuracy']:.3f} (validação) | "
+          f"{relatorio['baseline_test_accuracy']:.3f} (teste)")
+    print(f"\n{'árvores':>8}{'prof.':>7}{'nós':>8}{'memória (KB)':>14}{'validação':>11}")
+    for candidato in relatorio['candidates']:
+        print(f"{candidato['n_trees']:>8}{candidato['max_depth']:>7}{candidato['n_nodes']:>8}"
+              f"{candidato['nbytes'] / 1024:>14.1f}{candidato['accuracy']:>11.3f}")
+
+    escolhido = relatorio['chosen']
+    print(f"\nEscolhido: {escolhido['n_trees']} árvores, profundidade {escolhido['max_depth']} "
+          f"(acurácia {escolhido['accuracy']:.3f} na validação, "
+          f"{escolhido['test_accuracy']:.3f} no teste)")
+
+    contexto = multiprocessing.get_context('spawn')
+    with contexto.Pool(1, maxtasksperchild=1) as pool:
+        antes = pool.apply(medir_carga, (origem,))
+    with contexto.Pool(1, maxtasksperchild=1) as pool:
+        depois = pool.apply(medir_carga, (args.output,))
+
+    print(f"\n{'':<22}{'original':>14}{'compacto':>14}")
+    print(f"{'tamanho do artefato':<22}{formatar_mb(file_size_bytes(origem)):>14}"
+          f"{formatar_mb(file_size_bytes(args.output)):>14}")
+    print(f"{'memória residente':<22}{formatar_mb(antes['rss_bytes']):>14}"
+          f"{formatar_mb(depois['rss_bytes']):>14}")
+    print(f"{'tempo de carga':<22}{antes['load_time_s'] * 1000:>11.1f} ms"
+          f"{depois['load_time_s'] * 1000:>11.1f} ms")
+    print(f"\nModelo compacto salvo em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.irrigation_model import IrrigationModel
+
+
+def main():
+    resolucoes = [int(r) for r in sys.argv[1:]] or [8, 12, 16, 24, 32]
+
+    print(f"{'resolução':<12}{'método':<10}{'erro máx.':>12}{'erro médio':>12}"
+          f"{'decisão':>10}{'tamanho':>12}{'construção':>12}")
+
+    for resolucao in resolucoes:
+        for metodo in ('nearest', 'linear'):
+            inicio = time.perf_counter()
+            modelo = IrrigationModel(inference_backend='grid',
+                                     grid_resolution=resolucao, grid_method=metodo)
+            tempo = time.perf_counter() - inicio
+
+            relatorio = modelo.grid_error_report()
+            print(f"{resolucao:<12}{metodo:<10}{relatorio['max_abs_error']:>12.4f}"
+                  f"{relatorio['mean_abs_error']:>12.4f}"
+                  f"{relatorio['decision_agreement']:>10.2%}"
+                  f"{relatorio['size_bytes'] / 1024:>10.0f}KB{tempo:>11.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DatabaseManager
+from models.irrigation_model import IrrigationModel
+from models.forecast import load_latest_readings, build_forecasts
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Gera previsões de irrigação para todos os lotes (tabela previsao_irrigacao)")
+    parser.add_argument('--interval', type=float, default=0,
+                        help="segundos entre execuções (0 = executa uma vez)")
+    parser.add_argument('--chunk-size', type=int, default=IrrigationModel.BATCH_CHUNK_SIZE,
+                        help="linhas por pedaço na pontuação")
+    parser.add_argument('--backend', default=None, choices=IrrigationModel.SELECTABLE_BACKENDS,
+                        help="backend de inferência do modelo (padrão: sklearn; artefatos em "
+                             "arrays usam o próprio backend)")
+    parser.add_argument('--artifact', default=None, help="artefato do modelo a carregar")
+    return parser.parse_args()
+
+
+def run_once(db, model, chunk_size):
+    inicio = time.perf_counter()
+
+    readings = load_latest_readings(db)
+    if readings.empty:
+        print("Nenhuma leitura de solo válida encontrada.")
+        return 0
+
+    previsoes = build_forecasts(model, readings, datetime.now(), chunk_size=chunk_size)
+    db.insert_previsoes(previsoes)
+
+    print(f"{len(previsoes)} previsões gravadas em {time.perf_counter() - inicio:.2f}s "
+          f"(modelo versão {model.version})")
+    return len(previsoes)
+
+
+def main():
+    args = parse_args()
+    model = IrrigationModel(artifact_path=args.artifact, inference_backend=args.backend)
+
+    db = DatabaseManager()
+    db.connect()
+    try:
+        while True:
+            run_once(db, model, args.chunk_size)
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nJob de previsão encerrado.")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.drift import DriftMonitor
+from models.irrigation_model import IrrigationModel
+from models.training_data import RAW_CAPTURE_SCALE
+from utils.replay import ReplayStream, load_csv_readings, load_leitura_solo_readings
+from utils.sensor_data import SensorData
+from utils.streaming import ReadingPipeline, run_stream
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Reproduz leituras gravadas pelo mesmo caminho das leituras ao vivo "
+                    "(modelo, alertas e SensorData)")
+    parser.add_argument('--origem', choices=['csv', 'banco'], default='csv')
+    parser.add_argument('--arquivo', default=os.path.join(os.path.dirname(__file__), 'dados_leituras.csv'),
+                        help="captura do ESP32 (com --origem csv)")
+    parser.add_argument('--id-sensor', type=int, default=None,
+                        help="sensor das leituras do CSV ou filtro da tabela leitura_solo")
+    parser.add_argument('--inicio', default=None, help="data_hora inicial (com --origem banco)")
+    parser.add_argument('--fim', default=None, help="data_hora final (com --origem banco)")
+    parser.add_argument('--escala', type=float, default=None,
+                        help="divisor de pH e umidade (padrão: 100 no CSV; no banco, detecta "
+                             "por linha as capturas importadas sem conversão)")
+    parser.add_argument('--velocidade', type=float, default=1.0,
+                        help="fator de aceleração (1 = tempo real)")
+    parser.add_argument('--sem-limite', action='store_true',
+                        help="reproduz o mais rápido possível")
+    parser.add_argument('--intervalo', type=float, default=1.0,
+                        help="segundos entre leituras sem horário")
+    parser.add_argument('--lote', type=int, default=1, help="leituras por lote")
+    parser.add_argument('--repeticoes', type=int, default=1, help="repetições da gravação")
+    parser.add_argument('--fila', type=int, default=4, help="lotes em espera antes de bloquear")
+    parser.add_argument('--backend', default='sklearn', choices=IrrigationModel.SELECTABLE_BACKENDS)
+    parser.add_argument('--deriva', action='store_true',
+                        help="monitora a deriva da janela recente em relação à gravação completa")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.origem == 'banco':
+        from src.database import DatabaseManager
+        db = DatabaseManager()
+        db.connect()
+        try:
+            readings = load_leitura_solo_readings(db, args.id_sensor, args.inicio, args.fim,
+                                                  scale=args.escala)
+        finally:
+            db.disconnect()
+    else:
+        readings = load_csv_readings(args.arquivo, id_sensor=args.id_sensor or 1,
+                                     scale=args.escala or RAW_CAPTURE_SCALE)
+
+    if readings.empty:
+        print("Nenhuma leitura para reproduzir")
+        return
+
+    stream = ReplayStream(readings, speed=None if args.sem_limite else args.velocidade,
+                          batch_size=args.lote, interval_s=args.intervalo, loops=args.repeticoes)
+    print(f"Reproduzindo {stream.n_readings} leituras "
+          f"({'horários gravados' if stream.recorded_timestamps else f'intervalo de {args.intervalo}s'}, "
+          f"{'sem limite' if args.sem_limite else f'{args.velocidade:g}x'})")
+
+    # Arquivo inexistente: começa vazio e nada é gravado (save_data não é chamado)
+    model = IrrigationModel(inference_backend=args.backend)
+    pipeline = ReadingPipeline(model, SensorData(data_file='replay_readings.json'),
+                               drift_monitor=DriftMonitor.from_model(model, readings)
+                               if args.deriva else None)
+    stats = asyncio.run(run_stream(stream, pipeline, queue_size=args.fila))
+    resultado = pipeline.stats()
+
+    print(f"Leituras processadas: {resultado['readings']} em {resultado['batches']} lotes")
+    if stats['target_rate'] is not None:
+        print(f"Taxa alvo: {stats['target_rate']:.1f}/s | obtida: {stats['achieved_rate']:.1f}/s")
+    else:
+        print(f"Taxa obtida: {stats['achieved_rate']:.0f}/s")
+    print(f"Atraso máximo em relação à gravação: {stats['max_lag_s'] * 1000:.1f} ms")
+    print(f"Irrigação prevista: {resultado['irrigate']} | alertas: {resultado['alerts']}")
+    if resultado['latency_p50_ms'] is not None:
+        print(f"Latência ponta a ponta: p50 {resultado['latency_p50_ms']:.2f} ms | "
+              f"p99 {resultado['latency_p99_ms']:.2f} ms | máx. {resultado['latency_max_ms']:.2f} ms")
+    if pipeline.drift_monitor is not None:
+        print_drift(pipeline.drift_monitor)
+
+
+def print_drift(monitor):
+    scores = monitor.drift_scores()
+    if not scores:
+        print("Deriva: nenhuma leitura válida")
+        return
+    print(f"Deriva ({monitor.n_live} leituras na janela, {monitor.n_skipped} ignoradas):")
+    drifted = monitor.drifted_features()
+    for name, score in scores.items():
+        print(f"  {name}: PSI {score['psi']:.3f} | KS {score['ks']:.3f}"
+              f"{' <- deriva' if name in drifted else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fleet_simulator import FleetSimulator
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Simula leituras de uma frota de sensores para testes de carga")
+    parser.add_argument('--lotes', type=int, default=10, help="número de lotes")
+    parser.add_argument('--sensores-por-lote', type=int, default=100)
+    parser.add_argument('--passos', type=int, default=1440, help="leituras por sensor")
+    parser.add_argument('--frequencia', type=int, default=1, help="minutos entre leituras")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processos do pool (padrão: todos os núcleos)")
+    parser.add_argument('--sensores-por-fatia', type=int, default=100)
+    parser.add_argument('--saida', default='frota', help="diretório dos arquivos gerados")
+    parser.add_argument('--formato', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--stream', action='store_true',
+                        help="emite as leituras na saída padrão em vez de gravar arquivos")
+    parser.add_argument('--taxa', type=float, default=None,
+                        help="leituras por segundo no modo --stream")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    simulador = FleetSimulator(n_lotes=args.lotes, sensors_per_lote=args.sensores_por_lote,
+                               seed=args.seed, frequency_minutes=args.frequencia)
+
+    inicio = time.perf_counter()
+    if args.stream:
+        total = 0
+        for leitura in simulador.stream(args.passos, rate=args.taxa):
+            print(leitura)
+            total += 1
+    else:
+        arquivos = simulador.write(args.passos, args.saida, args.formato, args.workers,
+                                   args.sensores_por_fatia)
+        total = simulador.n_sensors * args.passos
+        print(f"{len(arquivos)} arquivos gravados em {args.saida}")
+
+    duracao = time.perf_counter() - inicio
+    print(f"{total} leituras de {simulador.n_sensors} sensores em {duracao:.1f}s "
+          f"({total / duracao:.0f} leituras/s)", file=sys.stderr if args.stream else sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from models.irrigation_model import IrrigationModel
+from models.pump_policy import PumpPolicy
+from utils.irrigation_simulator import IrrigationSimulator
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Simula uma safra em malha fechada (modelo + bomba) em muitos lotes "
+                    "e compara limiares da bomba")
+    parser.add_argument('--lotes', type=int, default=2000)
+    parser.add_argument('--dias', type=float, default=120, help="duração da safra")
+    parser.add_argument('--passo', type=int, default=60, help="minutos por passo")
+    parser.add_argument('--politicas', default='0.7:0.3,0.6:0.4,0.8:0.2',
+                        help="pares liga:desliga da probabilidade, separados por vírgula")
+    parser.add_argument('--backend', default='grid', choices=IrrigationModel.SELECTABLE_BACKENDS,
+                        help="backend de inferência (grid é o mais rápido em lotes grandes)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--saida', default=None, help="CSV com o resumo de cada política")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    politicas = [PumpPolicy(*map(float, par.split(':'))) for par in args.politicas.split(',')]
+
+    modelo = IrrigationModel(inference_backend=args.backend)
+    simulador = IrrigationSimulator(n_lots=args.lotes, step_minutes=args.passo, seed=args.seed)
+
+    print(f"Simulando {args.lotes} lotes por {args.dias:g} dias "
+          f"({int(args.dias * 24 * 60 / args.passo)} passos de {args.passo} min)")
+    resumo = simulador.compare(modelo, politicas, days=args.dias)
+
+    colunas = {
+        'on_threshold': 'liga',
+        'off_threshold': 'desliga',
+        'water_m3_per_ha': 'água (m³/ha)',
+        'pump_hours': 'bomba (h)',
+        'pump_starts_per_day': 'partidas/dia',
+        'below_low_pct': '% umidade baixa',
+        'below_critical_pct': '% umidade crítica',
+        'runtime_s': 'tempo (s)'
+    }
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(resumo[list(colunas)].rename(columns=colunas).round(2).to_string(index=False))
+
+    if args.saida:
+        resumo.to_csv(args.saida, index=False)
+        print(f"Resumo salvo em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
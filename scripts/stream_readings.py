@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_generator import SensorDataGenerator
+from utils.sensor_data import SensorData
+from utils.streaming import run_stream, SensorDataSink, LeituraSoloSink, ReadingPipeline
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Teste de carga: emite leituras de N sensores a uma taxa alvo")
+    parser.add_argument('--sensores', type=int, default=100, help="sensores simulados")
+    parser.add_argument('--taxa', type=float, default=1000, help="leituras por segundo (agregado; 0 = sem limite)")
+    parser.add_argument('--total', type=int, default=10_000, help="leituras emitidas")
+    parser.add_argument('--lote', type=int, default=None, help="leituras por lote")
+    parser.add_argument('--fila', type=int, default=4, help="lotes em espera antes de bloquear")
+    parser.add_argument('--destino', choices=['sensor_data', 'pipeline', 'banco'], default='sensor_data',
+                        help="SensorData em memória, processamento completo (modelo, alertas e "
+                             "SensorData) ou INSERT em lote na tabela leitura_solo")
+    parser.add_argument('--id-sensor', type=int, default=None,
+                        help="com --destino banco, grava todas as leituras neste sensor")
+    parser.add_argument('--deriva', action='store_true',
+                        help="com --destino pipeline, monitora a deriva das features")
+    parser.add_argument('--referencia', type=int, default=5000,
+                        help="leituras do gerador usadas como referência da deriva")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    stream = SensorDataGenerator().stream(n_sensors=args.sensores, rate=args.taxa,
+                                          batch_size=args.lote, max_readings=args.total)
+
+    db = None
+    if args.destino == 'banco':
+        from src.database import DatabaseManager
+        db = DatabaseManager()
+        db.connect()
+        sensor_ids = [args.id_sensor] * args.sensores if args.id_sensor else None
+        sink = LeituraSoloSink(db, sensor_ids)
+    elif args.destino == 'pipeline':
+        import pandas as pd
+        from models.drift import DriftMonitor
+        from models.irrigation_model import IrrigationModel
+        model = IrrigationModel()
+        drift_monitor = None
+        if args.deriva:
+            # Referência: leituras de outro gerador com a mesma configuração
+            referencia = SensorDataGenerator()._generate_readings(
+                pd.DatetimeIndex([datetime.now()] * args.referencia))
+            drift_monitor = DriftMonitor.from_model(model, referencia)
+        # Arquivo inexistente: começa vazio e nada é gravado (save_data não é chamado)
+        sink = ReadingPipeline(model, SensorData(data_file='stream_readings.json'),
+                               drift_monitor=drift_monitor)
+    else:
+        sink = SensorDataSink(SensorData(data_file='stream_readings.json'))
+
+    try:
+        stats = asyncio.run(run_stream(stream, sink, queue_size=args.fila))
+    finally:
+        if db is not None:
+            db.disconnect()
+
+    print(f"Leituras emitidas: {stats['emitted']}")
+    if stats['target_rate'] is not None:
+        print(f"Taxa alvo: {stats['target_rate']:.0f}/s | obtida: {stats['achieved_rate']:.0f}/s")
+    else:
+        print(f"Taxa obtida: {stats['achieved_rate']:.0f}/s")
+    print(f"Atraso final: {stats['lag_s'] * 1000:.1f} ms | máximo: {stats['max_lag_s'] * 1000:.1f} ms")
+    print(f"Fila máxima: {stats['max_queue_depth']} lotes | tempo no destino: {stats['sink_time_s']:.2f}s")
+    if isinstance(sink, ReadingPipeline):
+        resultado = sink.stats()
+        print(f"Latência ponta a ponta: p50 {resultado['latency_p50_ms']:.2f} ms | "
+              f"p99 {resultado['latency_p99_ms']:.2f} ms")
+        if resultado['drifted_features'] is not None:
+            print(f"Features com deriva: {', '.join(resultado['drifted_features']) or 'nenhuma'}")
+
+
+if __name__ == "__main__":
+    main()
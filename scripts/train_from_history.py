@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import DatabaseManager
+from models.irrigation_model import IrrigationModel, DEFAULT_ARTIFACT_DIR
+from models.training_data import load_leitura_solo_arrays
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Treina o modelo de irrigação com o histórico real de leitura_solo")
+    parser.add_argument('--chunk-size', type=int, default=50_000,
+                        help="linhas por lote lido do servidor")
+    parser.add_argument('--max-memory-mb', type=float, default=512,
+                        help="orçamento de memória dos dados de treinamento")
+    parser.add_argument('--id-cultura', type=int, default=None,
+                        help="treina apenas com leituras de uma cultura")
+    parser.add_argument('--output', default=os.path.join(DEFAULT_ARTIFACT_DIR,
+                                                         'irrigation_model_history.joblib'),
+                        help="caminho do artefato treinado")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    db = DatabaseManager()
+    db.connect()
+    try:
+        inicio = time.perf_counter()
+        X, y = load_leitura_solo_arrays(db, chunk_size=args.chunk_size,
+                                        max_memory_mb=args.max_memory_mb,
+                                        id_cultura=args.id_cultura)
+        print(f"{len(X)} leituras carregadas em {time.perf_counter() - inicio:.1f}s "
+              f"({(X.nbytes + y.nbytes) / 1024 / 1024:.1f} MB)")
+    finally:
+        db.disconnect()
+
+    if len(np.unique(y)) < 2:
+        print("O histórico precisa conter leituras com irrigação ativa e inativa.")
+        sys.exit(1)
+
+    # Sem o treino sintético padrão: o modelo é treinado só com o histórico
+    model = IrrigationModel(use_cache=False, train=False)
+    model.fit(X, y)
+    model.save_model(args.output)
+    print(f"Modelo salvo em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.irrigation_model import (IrrigationModel, CORN_PROFILE, DEFAULT_ARTIFACT_DIR,
+                                     FEATURE_NAMES, generate_training_data, split_training_data)
+from models.hyperparameter_search import (DEFAULT_PARAM_GRID, grid_candidates, random_candidates,
+                                          run_search, select_best, split_validation)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Busca de hiperparâmetros e treinamento do modelo de irrigação")
+    parser.add_argument('--n-jobs', type=int, default=None,
+                        help="processos do pool (padrão: todos os núcleos)")
+    parser.add_argument('--n-samples', type=int, default=IrrigationModel.TRAINING_SAMPLES,
+                        help="tamanho do conjunto de treinamento sintético")
+    parser.add_argument('--search', choices=['grid', 'random'], default='grid',
+                        help="tipo de busca")
+    parser.add_argument('--n-iter', type=int, default=20,
+                        help="candidatos sorteados na busca aleatória")
+    parser.add_argument('--max-latency-us', type=float, default=None,
+                        help="orçamento de latência de uma predição (µs)")
+    parser.add_argument('--max-size-kb', type=float, default=None,
+                        help="orçamento de tamanho do modelo serializado (KB)")
+    parser.add_argument('--output', default=os.path.join(DEFAULT_ARTIFACT_DIR,
+                                                         'irrigation_model_tuned.joblib'),
+                        help="caminho do artefato vencedor")
+    parser.add_argument('--report', default=None,
+                        help="caminho do relatório JSON (padrão: <output>.report.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Mesmos dados e divisão do treino de IrrigationModel: a busca usa só o
+    # conjunto de treino (dividido em treino e validação) e o teste mede
+    # apenas o vencedor
+    data = generate_training_data(CORN_PROFILE, args.n_samples, IrrigationModel.RANDOM_SEED)
+    X = data[list(FEATURE_NAMES)].to_numpy()
+    y = data['irrigation_needed'].to_numpy()
+    X_train, _, y_train, _ = split_training_data(X, y)
+    X_fit, X_val, y_fit, y_val = split_validation(X_train, y_train,
+                                                  random_state=IrrigationModel.RANDOM_SEED)
+
+    if args.search == 'grid':
+        candidates = grid_candidates(DEFAULT_PARAM_GRID)
+    else:
+        candidates = random_candidates(DEFAULT_PARAM_GRID, args.n_iter)
+
+    print(f"Avaliando {len(candidates)} candidatos...")
+    start = time.perf_counter()
+    results = run_search(X_fit, y_fit, X_val, y_val, candidates,
+                         n_jobs=args.n_jobs, random_state=IrrigationModel.RANDOM_SEED)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'n_est.':>7}{'prof.':>7}{'folha':>7}{'acur. val.':>11}"
+          f"{'treino (s)':>12}{'latência (µs)':>15}{'tamanho (KB)':>14}")
+    for result in sorted(results, key=lambda r: -r['accuracy']):
+        params = result['params']
+        print(f"{params['n_estimators']:>7}{str(params['max_depth']):>7}"
+              f"{params['min_samples_leaf']:>7}{result['accuracy']:>11.3f}"
+              f"{result['fit_time_s']:>12.3f}{result['latency_us']:>15.0f}"
+              f"{result['size_bytes'] / 1024:>14.0f}")
+
+    max_size_bytes = args.max_size_kb * 1024 if args.max_size_kb else None
+    best = select_best(results, args.max_latency_us, max_size_bytes)
+    if best is None:
+        print("\nNenhum candidato atende ao orçamento de latência/tamanho.")
+        sys.exit(1)
+
+    print(f"\nBusca concluída em {elapsed:.1f}s. Vencedor: {best['params']}")
+
+    # Treinar o vencedor com o mesmo pipeline de IrrigationModel e persistir
+    winner_params = {**best['params'], 'random_state': IrrigationModel.RANDOM_SEED}
+    model = IrrigationModel(use_cache=False, n_samples=args.n_samples,
+                            model_params=winner_params)
+    print(f"Acurácia do vencedor no teste: {model.accuracy:.3f} "
+          f"(validação: {best['accuracy']:.3f})")
+    model.save_model(args.output)
+    print(f"Modelo salvo em: {args.output}")
+
+    report_path = args.report or f'{os.path.splitext(args.output)[0]}.report.json'
+    with open(report_path, 'w') as f:
+        json.dump({
+            'n_samples': args.n_samples,
+            'search': args.search,
+            'budget': {'max_latency_us': args.max_latency_us, 'max_size_bytes': max_size_bytes},
+            'elapsed_s': elapsed,
+            'best': best,
+            'test_accuracy': model.accuracy,
+            'candidates': results
+        }, f, indent=2)
+    print(f"Relatório salvo em: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import psycopg2
 from psycopg2 import Error
+from psycopg2.extras import execute_values
 from config.database_config import DB_CONFIG, TABLES
 
 class DatabaseManager:
@@ -33,6 +34,36 @@ class DatabaseManager:
             print(f"Erro ao executar query: {e}")
             raise
 
+    def stream_query(self, query, params=None, chunk_size=10000, cursor_name='stream_cursor'):
+        """
+        Executa uma consulta com cursor do lado do servidor e retorna as
+        linhas em lotes, sem carregar o resultado inteiro na memória.
+        """
+        cursor = self.connection.cursor(name=cursor_name)
+        cursor.itersize = chunk_size
+        completed = False
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+            cursor.close()
+            self.connection.commit()
+            completed = True
+        except Error as e:
+            print(f"Erro ao executar query: {e}")
+            raise
+        finally:
+            if not completed:
+                # Erro ou consumidor que parou antes do fim (break, close()):
+                # encerra a transação para a conexão não ficar "idle in
+                # transaction"
+                self.connection.rollback()
+            if not cursor.closed:
+                cursor.close()
+
     def select_all(self, table_name):
         query = f"SELECT * FROM {table_name}"
         return self.execute_query(query).fetchall()
@@ -103,6 +134,29 @@ class DatabaseManager:
             ph, ph_status, umidade, umidade_status, irrigacao
         )).fetchone()[0]
 
+    def insert_leituras_solo(self, leituras, page_size=1000):
+        """
+        Insere leituras de solo em lote (um INSERT por página).
+
+        Args:
+            leituras: lista de tuplas (id_sensor, data_hora, fosforo_ok, potassio_ok,
+                      ph, ph_status, umidade, umidade_status, irrigacao)
+        """
+        query = """
+            INSERT INTO leitura_solo (
+                id_sensor, data_hora, fosforo_ok, potassio_ok,
+                ph, ph_status, umidade, umidade_status, irrigacao
+            )
+            VALUES %s
+        """
+        try:
+            execute_values(self.cursor, query, leituras, page_size=page_size)
+            self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            print(f"Erro ao inserir leituras de solo: {e}")
+            raise
+
     def insert_ajuste(self, id_lote, tipo, data_hora, descricao, status):
         query = """
             INSERT INTO ajuste (id_lote, tipo, data_hora, descricao, status)
@@ -111,6 +165,55 @@ class DatabaseManager:
         """
         return self.execute_query(query, (id_lote, tipo, data_hora, descricao, status)).fetchone()[0]
 
+    def insert_previsoes(self, previsoes, page_size=1000):
+        """
+        Insere previsões de irrigação em lote (um INSERT por página).
+
+        Args:
+            previsoes: lista de tuplas (id_lote, timestamp, umidade_prevista,
+                       probabilidade_irrigacao, confianca_modelo)
+        """
+        query = """
+            INSERT INTO previsao_irrigacao (
+                id_lote, timestamp, umidade_prevista,
+                probabilidade_irrigacao, confianca_modelo
+            )
+            VALUES %s
+        """
+        try:
+            execute_values(self.cursor, query, previsoes, page_size=page_size)
+            self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            print(f"Erro ao inserir previsões: {e}")
+            raise
+
+    def insert_predicoes_leitura(self, predicoes, page_size=1000):
+        """
+        Insere predições por leitura de solo em lote, em uma única transação.
+        Predições já gravadas para a mesma leitura e versão do modelo são
+        ignoradas, para que reprocessar um intervalo não duplique linhas.
+
+        Args:
+            predicoes: lista de tuplas (id_leitura_solo, versao_modelo, data_hora,
+                       irrigacao_prevista, probabilidade_irrigacao, confianca_modelo)
+        """
+        query = """
+            INSERT INTO predicao_leitura_solo (
+                id_leitura_solo, versao_modelo, data_hora, irrigacao_prevista,
+                probabilidade_irrigacao, confianca_modelo
+            )
+            VALUES %s
+            ON CONFLICT (id_leitura_solo, versao_modelo) DO NOTHING
+        """
+        try:
+            execute_values(self.cursor, query, predicoes, page_size=page_size)
+            self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            print(f"Erro ao inserir predições: {e}")
+            raise
+
     def update_cultura(self, id_cultura, nome, tipo, data_plantio, data_colheita_prevista, status,
                       necessidade_agua_min, necessidade_agua_max,
                       necessidade_ph_min, necessidade_ph_max,
@@ -0,0 +1,374 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from models.irrigation_model import IrrigationModel
+from models.rules import FEATURES
+
+
+DEFAULT_SOCKET_PATH = os.environ.get('IRRIGATION_INFERENCE_SOCKET', '/tmp/irrigation_inference.sock')
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class MicroBatcher:
+    """
+    Agrupa requisições de predição concorrentes em micro-lotes.
+
+    Cada requisição entra em uma fila; o coletor pega a primeira e espera
+    até max_wait_ms por outras (ou até max_batch_size linhas), e o lote é
+    pontuado com uma única chamada a predict_with_proba.
+    """
+
+    def __init__(self, model, max_batch_size=256, max_wait_ms=2.0, latency_window=10_000):
+        """
+        Args:
+            model: IrrigationModel treinado
+            max_batch_size: máximo de linhas por lote
+            max_wait_ms: espera máxima por requisições para completar o lote
+            latency_window: quantidade de latências mantidas para os percentis
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self.queue = asyncio.Queue()
+        self.latencies = deque(maxlen=latency_window)
+        self.batch_sizes = deque(maxlen=latency_window)
+        self.n_requests = 0
+        self.n_batches = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, X):
+        """
+        Enfileira uma matriz de features e aguarda o resultado do lote.
+
+        Returns:
+            dict: listas 'prediction', 'probability', 'confidence' e 'model_version'
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((X, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            n_rows = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while n_rows < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                n_rows += len(item[0])
+
+            # A inferência roda fora do loop para não atrasar novas conexões
+            try:
+                result = await loop.run_in_executor(None, self._score, pending)
+            except Exception as e:
+                for _, future, _ in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            end = time.perf_counter()
+            for (_, future, start), response in zip(pending, result):
+                self.latencies.append(end - start)
+                if not future.done():
+                    future.set_result(response)
+
+            self.n_requests += len(pending)
+            self.n_batches += 1
+            self.batch_sizes.append(n_rows)
+
+    def _score(self, pending):
+        X = np.concatenate([item[0] for item in pending])
+        result = self.model.predict_with_proba(X)
+
+        responses = []
+        offset = 0
+        for item in pending:
+            end = offset + len(item[0])
+            responses.append({
+                'prediction': result['prediction'][offset:end].tolist(),
+                'probability': result['probability'][offset:end].tolist(),
+                'confidence': result['confidence'][offset:end].tolist(),
+                'model_version': result['model_version']
+            })
+            offset = end
+        return responses
+
+    def stats(self):
+        """
+        Returns:
+            dict: profundidade da fila, totais e latência p50/p99 (ms)
+        """
+        latencies = np.array(self.latencies) * 1000
+        return {
+            'queue_depth': self.queue.qsize(),
+            'requests': self.n_requests,
+            'batches': self.n_batches,
+            'mean_batch_size': float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0,
+            'latency_p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+            'latency_p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else None,
+            'model_version': self.model.version
+        }
+
+
+class InferenceServer:
+    """
+    Serviço local de inferência: um IrrigationModel compartilhado por
+    vários consumidores através de um socket Unix ou TCP em localhost.
+
+    Protocolo: uma mensagem JSON por linha. Operações:
+        {"op": "predict", "data": {feature: valor}}     -> valores escalares
+        {"op": "predict", "rows": [[h, ph, p, k], ...]} -> listas
+        {"op": "feature_importance"}
+        {"op": "permutation_importance"}
+        {"op": "recommendations", "data": {...}}
+        {"op": "stats"}
+    """
+
+    def __init__(self, model, max_batch_size=256, max_wait_ms=2.0):
+        self.model = model
+        self.batcher = MicroBatcher(model, max_batch_size, max_wait_ms)
+        # Operações longas (a importância por permutação abre seu próprio
+        # pool de processos) rodam uma por vez neste executor, e não no
+        # executor padrão usado pela pontuação dos micro-lotes
+        self._slow_executor = ThreadPoolExecutor(max_workers=1,
+                                                 thread_name_prefix='inference-slow-op')
+
+    async def handle_request(self, request):
+        op = request.get('op')
+
+        if op == 'predict':
+            if 'data' in request:
+                X = self.model._as_feature_matrix(request['data'])
+                result = await self.batcher.predict(X)
+                return {key: value[0] if isinstance(value, list) else value
+                        for key, value in result.items()}
+            X = np.asarray(request['rows'], dtype=np.float64).reshape(-1, len(self.model.feature_names))
+            return await self.batcher.predict(X)
+        if op == 'feature_importance':
+            return {name: float(value) for name, value in self.model.get_feature_importance().items()}
+        if op == 'permutation_importance':
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._slow_executor,
+                                              self.model.get_permutation_importance)
+        if op == 'recommendations':
+            return self.model.get_recommendations(request['data'])
+        if op == 'stats':
+            return self.batcher.stats()
+
+        raise ValueError(f"Operação desconhecida: {op}")
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = {'ok': True, 'result': await self.handle_request(json.loads(line))}
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Atende conexões até ser cancelado.
+
+        Args:
+            socket_path: caminho do socket Unix; se None, usa TCP em host:port
+        """
+        self.batcher.start()
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self._handle_connection, path=socket_path)
+            print(f"Servidor de inferência ouvindo em {socket_path}")
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port)
+            print(f"Servidor de inferência ouvindo em {host}:{port}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+            self._slow_executor.shutdown(wait=False)
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+
+class InferenceClient:
+    """
+    Cliente síncrono do InferenceServer, com a mesma interface usada pelo
+    dashboard no IrrigationModel (predict_with_proba, get_feature_importance,
+    get_permutation_importance e get_recommendations).
+    """
+
+    def __init__(self, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5.0):
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._socket = None
+        self._file = None
+        # A mesma conexão pode ser usada por várias sessões do dashboard
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self):
+        if self.socket_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+        else:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._socket = sock
+        self._file = sock.makefile('rwb')
+
+    def close(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        """
+        Descarta a conexão atual. Depois de um timeout a resposta atrasada
+        ainda pode chegar por ela e seria lida como resposta da próxima
+        requisição; a próxima chamada abre uma conexão nova.
+        """
+        for resource in (self._file, self._socket):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+        self._file = None
+        self._socket = None
+
+    def _request(self, request):
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._connect()
+                self._file.write(json.dumps(request).encode() + b'\n')
+                self._file.flush()
+                line = self._file.readline()
+            except OSError:
+                # Inclui socket.timeout: a conexão fica em estado desconhecido
+                self._reset()
+                raise
+            if not line:
+                self._reset()
+                raise ConnectionError("Servidor de inferência encerrou a conexão")
+
+        response = json.loads(line)
+        if not response['ok']:
+            raise ValueError(response['error'])
+        return response['result']
+
+    @staticmethod
+    def _feature_payload(reading):
+        """
+        Campos de uma leitura usados pelo modelo e pelas regras. Os demais
+        (ex.: o timestamp datetime do dashboard) não são serializáveis em
+        JSON e não são usados pelo servidor.
+        """
+        return {name: reading[name] for name in FEATURES if name in reading}
+
+    def predict_with_proba(self, features):
+        """
+        Equivalente a IrrigationModel.predict_with_proba executado no servidor.
+        """
+        if isinstance(features, dict):
+            return self._request({'op': 'predict', 'data': self._feature_payload(features)})
+
+        result = self._request({'op': 'predict', 'rows': np.asarray(features, dtype=float).tolist()})
+        for key in ('prediction', 'probability', 'confidence'):
+            result[key] = np.asarray(result[key])
+        return result
+
+    @property
+    def version(self):
+        """
+        Versão do modelo em uso no servidor.
+        """
+        return self.stats()['model_version']
+
+    def get_feature_importance(self):
+        return self._request({'op': 'feature_importance'})
+
+    def get_permutation_importance(self):
+        return self._request({'op': 'permutation_importance'})
+
+    def get_recommendations(self, sensor_data):
+        return self._request({'op': 'recommendations', 'data': self._feature_payload(sensor_data)})
+
+    def stats(self):
+        return self._request({'op': 'stats'})
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Servidor local de inferência do modelo de irrigação")
+    parser.add_argument('--socket', default=None,
+                        help=f"socket Unix (padrão: {DEFAULT_SOCKET_PATH}, a menos que --port seja usado)")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=None, help="usa TCP em vez do socket Unix")
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--backend', default=None, choices=IrrigationModel.SELECTABLE_BACKENDS,
+                        help="padrão: sklearn; artefatos em arrays usam o próprio backend")
+    parser.add_argument('--artifact', default=None,
+                        help="artefato do modelo a carregar (artefatos compactos usam o "
+                             "backend 'compact' automaticamente)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    model = IrrigationModel(artifact_path=args.artifact, inference_backend=args.backend)
+    server = InferenceServer(model, args.max_batch_size, args.max_wait_ms)
+
+    socket_path = None if args.port else (args.socket or DEFAULT_SOCKET_PATH)
+    try:
+        asyncio.run(server.serve(socket_path, args.host, args.port or DEFAULT_PORT))
+    except KeyboardInterrupt:
+        print("\nServidor de inferência encerrado.")
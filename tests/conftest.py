@@ -0,0 +1,15 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from models.irrigation_model import IrrigationModel
+
+
+@pytest.fixture(scope='session')
+def model():
+    """
+    Modelo padrão (carregado do cache de artefatos ou treinado uma vez).
+    """
+    return IrrigationModel()
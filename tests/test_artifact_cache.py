@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pytest
+
+from models.irrigation_model import ARTIFACT_FILE_MODE, IrrigationModel
+
+
+SMALL_PARAMS = {'n_estimators': 5, 'max_depth': 4, 'random_state': 42}
+
+
+@pytest.fixture
+def trainings(monkeypatch):
+    """
+    Conta os treinos feitos por IrrigationModel.
+    """
+    calls = []
+    train = IrrigationModel._train_model
+
+    def counting_train(self, n_samples=None):
+        calls.append(self.training_fingerprint())
+        train(self, n_samples)
+
+    monkeypatch.setattr(IrrigationModel, '_train_model', counting_train)
+    return calls
+
+
+def small_model(cache_dir, **kwargs):
+    return IrrigationModel(cache_dir=str(cache_dir), n_samples=200,
+                           model_params=kwargs.pop('model_params', SMALL_PARAMS), **kwargs)
+
+
+def test_same_configuration_reuses_artifact(tmp_path, trainings):
+    first = small_model(tmp_path)
+    second = small_model(tmp_path)
+
+    assert len(trainings) == 1
+    assert second.artifact_path == first.artifact_path
+    X = np.array([[35.0, 6.5, 20.0, 150.0], [70.0, 7.2, 30.0, 200.0]])
+    np.testing.assert_array_equal(second.predict_proba(X), first.predict_proba(X))
+
+
+def test_changed_hyperparameters_force_retrain(tmp_path, trainings):
+    first = small_model(tmp_path)
+    second = small_model(tmp_path, model_params={**SMALL_PARAMS, 'max_depth': 3})
+
+    assert len(trainings) == 2
+    assert second.artifact_path != first.artifact_path
+    assert second.model.max_depth == 3
+
+
+def test_changed_training_data_version_forces_retrain(tmp_path, trainings, monkeypatch):
+    first = small_model(tmp_path)
+    monkeypatch.setattr(IrrigationModel, 'TRAINING_DATA_VERSION',
+                        IrrigationModel.TRAINING_DATA_VERSION + 1)
+    second = small_model(tmp_path)
+
+    assert len(trainings) == 2
+    assert second.artifact_path != first.artifact_path
+    assert os.path.exists(first.artifact_path) and os.path.exists(second.artifact_path)
+
+
+@pytest.mark.parametrize('damage', ['garbage', 'truncated'])
+def test_corrupt_artifact_is_rebuilt(tmp_path, trainings, damage):
+    path = small_model(tmp_path).artifact_path
+    if damage == 'garbage':
+        with open(path, 'wb') as f:
+            f.write(b'not a joblib file')
+    else:
+        with open(path, 'rb') as f:
+            content = f.read()
+        with open(path, 'wb') as f:
+            f.write(content[:len(content) // 2])
+
+    model = small_model(tmp_path)
+
+    assert len(trainings) == 2
+    assert model.is_trained and model.artifact_path == path
+    # O artefato regravado volta a ser carregado sem treino
+    small_model(tmp_path)
+    assert len(trainings) == 2
+
+
+def test_artifacts_use_umask_permissions(tmp_path, model):
+    umask = os.umask(0)
+    os.umask(umask)
+    assert ARTIFACT_FILE_MODE == 0o666 & ~umask
+
+    # mkstemp cria o temporário com 0600; o artefato final segue a umask
+    for layout in ('joblib', 'arrays'):
+        path = tmp_path / f'model.{layout}'
+        model.save_model(str(path), layout=layout)
+        assert path.stat().st_mode & 0o777 == ARTIFACT_FILE_MODE
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from models import backfill
+from models.backfill import BackfillCheckpoint, artifact_model_version, backfill_range
+from models.irrigation_model import IrrigationModel
+
+
+class FakePredictionDB:
+    """
+    Substitui o DatabaseManager de um worker: devolve linhas fixas de
+    leitura_solo e aplica o ON CONFLICT (id_leitura_solo, versao_modelo)
+    DO NOTHING de insert_predicoes_leitura.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.predicoes = {}
+
+    def execute_query(self, query, params=None):
+        start, end = params
+        rows = [row for row in self.rows if start <= row[0] <= end]
+        return type('Cursor', (), {'fetchall': lambda _: rows})()
+
+    def insert_predicoes_leitura(self, predicoes):
+        for predicao in predicoes:
+            self.predicoes.setdefault(predicao[:2], predicao)
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    rng = np.random.default_rng(0)
+    rows = [(i, float(rng.uniform(10, 90)), float(rng.uniform(5, 8)), i % 2, i % 3 > 0)
+            for i in range(1, 101)]
+    db = FakePredictionDB(rows)
+    monkeypatch.setattr(backfill, '_worker', {'db': db})
+    return db
+
+
+def test_retrained_artifact_at_same_path_gets_new_predictions(model, worker, tmp_path):
+    path = str(tmp_path / 'irrigation_model.joblib')
+    checkpoint_path = str(tmp_path / 'backfill.jsonl')
+
+    model.save_model(path)
+    first_version = artifact_model_version(path)
+    backfill._worker['model'] = IrrigationModel(artifact_path=path)
+    backfill_range(1, 100, first_version)
+    BackfillCheckpoint(checkpoint_path, first_version).mark_done(1, 100, 100)
+
+    # Retreino com rótulos invertidos gravado no mesmo caminho
+    retrained = IrrigationModel(artifact_path=path)
+    data = retrained._generate_training_data(retrained.n_samples)
+    retrained.fit(data[retrained.feature_names].to_numpy(),
+                  1 - data['irrigation_needed'].to_numpy())
+    retrained.save_model(path)
+
+    second_version = artifact_model_version(path)
+    assert second_version != first_version
+    assert len(second_version) <= backfill.MODEL_VERSION_MAX_LENGTH
+    assert BackfillCheckpoint(checkpoint_path, second_version).pending([(1, 100)]) == [(1, 100)]
+
+    backfill._worker['model'] = IrrigationModel(artifact_path=path)
+    _, _, n_rows = backfill_range(1, 100, second_version)
+
+    first = {key[0]: p for key, p in worker.predicoes.items() if key[1] == first_version}
+    second = {key[0]: p for key, p in worker.predicoes.items() if key[1] == second_version}
+    assert n_rows == 100
+    assert len(first) == len(second) == 100
+    # As predições do modelo retreinado (quase sempre opostas) foram
+    # gravadas, não descartadas
+    assert sum(first[i][3] != second[i][3] for i in first) > 50
+
+
+def test_same_artifact_keeps_model_version(model, tmp_path):
+    path = str(tmp_path / 'irrigation_model.joblib')
+    model.save_model(path)
+
+    assert artifact_model_version(path) == artifact_model_version(path)
+    assert artifact_model_version(path).startswith('irrigation_model-')
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from models.irrigation_model import IrrigationModel
+from models.tree_engine import FlatForest
+
+
+@pytest.fixture(scope='module')
+def compacted(model):
+    compact = IrrigationModel(artifact_path=model.artifact_path)
+    report = compact.compact(n_trees_options=(10, 50), max_depth_options=(4, 8))
+    return compact, report
+
+
+def readings(model, n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    bounds = np.array([model.profile.bounds[name] for name in model.feature_names])
+    return rng.uniform(bounds[:, 0], bounds[:, 1], (n_rows, len(bounds)))
+
+
+def test_compact_chooses_smallest_within_budget_on_validation(compacted):
+    compact, report = compacted
+    chosen = report['chosen']
+
+    eligible = [c for c in report['candidates']
+                if report['baseline_accuracy'] - c['accuracy'] <= 0.01]
+    assert chosen['nbytes'] == min(c['nbytes'] for c in eligible)
+    assert chosen['nbytes'] < report['full_nbytes']
+    assert compact.inference_backend == 'compact' and compact.model is None
+    # A acurácia publicada é a do teste, fora da escolha
+    assert compact.accuracy == chosen['test_accuracy']
+
+
+def test_selection_does_not_use_test_split(model):
+    data = model._generate_training_data(model.n_samples)
+    X_test = data[model.feature_names].to_numpy()[:200]
+    y_test = data['irrigation_needed'].to_numpy()[:200]
+
+    options = {'n_trees_options': (10, 50), 'max_depth_options': (4, 8)}
+    reference = IrrigationModel(artifact_path=model.artifact_path).compact(**options)
+    # Rótulos de teste invertidos mudam só a acurácia informada
+    inverted = IrrigationModel(artifact_path=model.artifact_path).compact(
+        X_test=X_test, y_test=1 - y_test, **options)
+
+    assert {k: inverted['chosen'][k] for k in ('n_trees', 'max_depth')} == \
+        {k: reference['chosen'][k] for k in ('n_trees', 'max_depth')}
+    assert inverted['chosen']['test_accuracy'] < 0.5
+
+
+@pytest.mark.parametrize('layout', ['joblib', 'arrays'])
+def test_compact_save_load_round_trip(compacted, tmp_path, layout):
+    compact, _ = compacted
+    path = str(tmp_path / f'compact.{layout}')
+    compact.save_model(path, layout=layout)
+
+    loaded = IrrigationModel(artifact_path=path)
+    X = readings(compact)
+
+    assert loaded.inference_backend == 'compact'
+    assert loaded.compact_settings == compact.compact_settings
+    assert isinstance(loaded._engine, FlatForest) and loaded.model is None
+    assert loaded.accuracy == compact.accuracy
+    np.testing.assert_array_equal(loaded.predict_proba(X), compact.predict_proba(X))
+    assert loaded.get_feature_importance() == pytest.approx(compact.get_feature_importance())
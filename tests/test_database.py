@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip('psycopg2')
+
+from src.database import DatabaseManager
+
+
+class FakeCursor:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchmany(self, size):
+        return self.chunks.pop(0) if self.chunks else []
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """
+    Conexão que registra como a transação do cursor nomeado terminou.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.events = []
+
+    def cursor(self, name=None):
+        return FakeCursor(self.chunks)
+
+    def commit(self):
+        self.events.append('commit')
+
+    def rollback(self):
+        self.events.append('rollback')
+
+
+def manager(chunks):
+    db = DatabaseManager()
+    db.connection = FakeConnection(chunks)
+    return db
+
+
+def test_stream_query_commits_when_exhausted():
+    db = manager([[(1,), (2,)], [(3,)]])
+    assert [row for rows in db.stream_query("SELECT 1") for row in rows] == [(1,), (2,), (3,)]
+    assert db.connection.events == ['commit']
+
+
+def test_stream_query_rolls_back_when_consumer_stops():
+    db = manager([[(1,), (2,)], [(3,)]])
+    stream = db.stream_query("SELECT 1")
+    for rows in stream:
+        break
+    del stream
+    assert db.connection.events == ['rollback']
+
+    stream = db.stream_query("SELECT 1")
+    next(stream)
+    stream.close()
+    assert db.connection.events == ['rollback', 'rollback']
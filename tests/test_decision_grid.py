@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from models.decision_grid import DecisionGrid
+from models.irrigation_model import CultureProfile, IrrigationModel
+from models.tree_engine import FlatForest
+
+
+def test_build_rejects_degenerate_axis():
+    bounds = [(15, 85), (6.5, 6.5), (5, 50), (80, 250)]
+    with pytest.raises(ValueError, match='eixo 1'):
+        DecisionGrid.build(lambda X: np.zeros(len(X)), bounds, resolution=4)
+
+    with pytest.raises(ValueError, match='crescente'):
+        DecisionGrid([np.array([1.0, 1.0]), np.array([0.0, 1.0])], np.zeros((2, 2)))
+
+
+def test_grid_backend_falls_back_to_flat_forest_for_degenerate_profile(model, tmp_path):
+    # Cultura com pH fixo: ph_min == ph_max
+    profile = CultureProfile.from_cultura('pH fixo', 40, 70, 6.5, 6.5)
+    assert profile.bounds['ph'][0] == profile.bounds['ph'][1]
+
+    path = str(tmp_path / 'irrigation_model.joblib')
+    model.save_model(path)
+    degenerate = IrrigationModel(artifact_path=path)
+    degenerate.profile = profile
+    degenerate.set_inference_backend('grid')
+
+    X = np.array([[40.0, 6.5, 20.0, 150.0], [70.0, 7.0, 30.0, 200.0]])
+    assert isinstance(degenerate._engine, FlatForest)
+    assert np.all(np.isfinite(degenerate.predict_proba(X)))
+    np.testing.assert_array_equal(degenerate.predict(X), model.predict(X))
@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.drift import DriftMonitor
+from models.rules import FEATURES
+from utils.data_generator import SensorDataGenerator
+
+
+def generator_readings(n_rows, seed):
+    # Mesmo caminho das leituras de SensorDataGenerator.stream
+    generator = SensorDataGenerator(np.random.default_rng(seed))
+    return generator._generate_readings(pd.DatetimeIndex([pd.Timestamp('2024-01-01 12:00')] * n_rows))
+
+
+@pytest.fixture
+def monitor(model):
+    return DriftMonitor.from_model(model, generator_readings(5000, seed=0))
+
+
+def test_no_drift_on_in_distribution_readings(monitor):
+    monitor.update_batch(generator_readings(1000, seed=1)[FEATURES].to_numpy())
+
+    assert monitor.n_live == monitor.window_size
+    assert monitor.drifted_features() == []
+
+
+def test_drift_on_shifted_window(monitor):
+    readings = generator_readings(1000, seed=1)
+    readings['humidity'] += 15
+
+    monitor.update_batch(readings[FEATURES].to_numpy())
+
+    assert monitor.drifted_features() == ['humidity']
+
+
+def test_psi_and_ks_against_hand_computed_values():
+    # 2 bins em [0, 2) mais underflow/overflow
+    monitor = DriftMonitor([[0.5], [0.5], [1.5], [1.5]], [(0.0, 2.0)], ['x'], n_bins=2,
+                           window_size=4)
+    for value in (0.5, 1.5, 1.5, 1.5):
+        monitor.update({'x': value})
+
+    np.testing.assert_array_equal(monitor.reference_counts, [[0, 2, 2, 0]])
+    np.testing.assert_array_equal(monitor.live_counts, [[0, 1, 3, 0]])
+
+    # Proporções 0,5/0,5 contra 0,25/0,75; os bins vazios nos dois lados
+    # (epsilon) não contribuem
+    scores = monitor.drift_scores()['x']
+    assert scores['psi'] == pytest.approx(0.25 * math.log(2) + 0.25 * math.log(1.5))
+    assert scores['ks'] == pytest.approx(0.25)
+
+
+def test_window_evicts_oldest_and_skips_non_finite():
+    monitor = DriftMonitor([[0.5], [1.5]], [(0.0, 2.0)], ['x'], n_bins=2, window_size=2)
+    monitor.update_batch([[0.5], [1.5], [np.nan], [1.5], [5.0]])
+    monitor.update({'x': None})
+
+    # Restam as duas últimas leituras válidas (1.5 e o overflow 5.0)
+    np.testing.assert_array_equal(monitor.live_counts, [[0, 0, 1, 1]])
+    assert monitor.n_skipped == 2
@@ -0,0 +1,17 @@
+import pandas as pd
+
+from utils.fleet_simulator import FleetSimulator
+
+
+def test_stream_matches_generate_in_time_order():
+    # Pedaços que não dividem o número de passos
+    simulator = FleetSimulator(n_lotes=2, sensors_per_lote=3, chunk_steps=4)
+    n_steps = 10
+
+    streamed = pd.DataFrame(list(simulator.stream(n_steps)))
+    generated = pd.concat(simulator.generate(n_steps, n_workers=1, sensors_per_shard=4),
+                          ignore_index=True)
+    expected = generated.sort_values(['timestamp', 'id_sensor'], kind='stable')
+
+    assert len(streamed) == simulator.n_sensors * n_steps
+    pd.testing.assert_frame_equal(streamed, expected.reset_index(drop=True))
@@ -0,0 +1,30 @@
+from models.forecast import build_forecasts, load_latest_readings
+
+
+class FakeLatestDB:
+    """
+    DatabaseManager com a última leitura fixa de cada lote (colunas de
+    LATEST_READING_PER_LOT_QUERY).
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute_query(self, query, params=None):
+        return type('Cursor', (), {'fetchall': lambda _: self.rows})()
+
+
+def test_invalid_lots_are_skipped(model):
+    db = FakeLatestDB([(1, 10, 45.0, 6.5, 1, 1), (2, 20, -5.0, 6.5, 1, 0), (3, 30, 60.0, 6.8, 0, 1)])
+    readings = load_latest_readings(db)
+
+    assert readings['id_lote'].tolist() == [1, 3]
+    assert readings['id_sensor'].tolist() == [10, 30]
+    assert [row[0] for row in build_forecasts(model, readings, None)] == [1, 3]
+
+
+def test_all_invalid_lots_give_empty_batch():
+    readings = load_latest_readings(FakeLatestDB([(1, 10, -5.0, 6.5, 1, 1), (2, 20, 50.0, -1.0, 1, 0)]))
+    assert readings.empty
+
+    assert load_latest_readings(FakeLatestDB([])).empty
@@ -0,0 +1,39 @@
+import numpy as np
+
+from models.hyperparameter_search import run_search, select_best, split_validation
+from models.irrigation_model import (IrrigationModel, CORN_PROFILE, FEATURE_NAMES,
+                                     generate_training_data, split_training_data)
+
+
+def training_arrays(n_samples=IrrigationModel.TRAINING_SAMPLES):
+    data = generate_training_data(CORN_PROFILE, n_samples, IrrigationModel.RANDOM_SEED)
+    return data[list(FEATURE_NAMES)].to_numpy(), data['irrigation_needed'].to_numpy()
+
+
+def test_generate_training_data_matches_model(model):
+    data = generate_training_data(CORN_PROFILE, model.n_samples, IrrigationModel.RANDOM_SEED)
+    assert data.equals(model._generate_training_data(model.n_samples))
+
+
+def test_validation_split_excludes_test_rows():
+    X, y = training_arrays()
+    X_train, X_test, y_train, _ = split_training_data(X, y)
+    X_fit, X_val, _, _ = split_validation(X_train, y_train)
+
+    test_rows = {tuple(row) for row in X_test}
+    assert not test_rows & {tuple(row) for row in X_val}
+    assert not test_rows & {tuple(row) for row in X_fit}
+    assert len(X_fit) + len(X_val) == len(X_train)
+
+
+def test_search_selects_on_validation():
+    X, y = training_arrays()
+    X_train, _, y_train, _ = split_training_data(X, y)
+    X_fit, X_val, y_fit, y_val = split_validation(X_train, y_train)
+
+    candidates = [{'n_estimators': 10, 'max_depth': 2}, {'n_estimators': 25, 'max_depth': 8}]
+    results = run_search(X_fit, y_fit, X_val, y_val, candidates, n_jobs=1)
+    best = select_best(results)
+
+    assert best['accuracy'] == max(r['accuracy'] for r in results)
+    assert all(np.isfinite(r['latency_us']) for r in results)
@@ -0,0 +1,185 @@
+import asyncio
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from models.rules import FEATURES
+from src.inference_server import InferenceClient, InferenceServer, MicroBatcher
+from utils.data_generator import SensorDataGenerator
+
+
+async def cancel_pending_tasks():
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+@pytest.fixture
+def server(model, tmp_path):
+    """
+    InferenceServer atendendo em um socket Unix temporário, em uma thread
+    com seu próprio loop de eventos. Devolve (servidor, caminho do socket).
+    """
+    socket_path = str(tmp_path / 'inference.sock')
+    server = InferenceServer(model)
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(server.serve(socket_path))
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Conexões ainda abertas (ex.: uma resposta atrasada) terminam
+            # antes de o loop ser fechado
+            loop.run_until_complete(cancel_pending_tasks())
+            loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    yield server, socket_path
+
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(timeout=5)
+
+
+def connect(socket_path, **kwargs):
+    for _ in range(200):
+        try:
+            return InferenceClient(socket_path=socket_path, **kwargs)
+        except (FileNotFoundError, ConnectionRefusedError):
+            time.sleep(0.01)
+    pytest.fail("Servidor de inferência não iniciou")
+
+
+@pytest.fixture
+def client(server):
+    """
+    Cliente conectado ao servidor da fixture server.
+    """
+    client = connect(server[1])
+    yield client
+    client.close()
+
+
+def random_rows(n_rows, seed=0):
+    generator = SensorDataGenerator(np.random.default_rng(seed))
+    return np.array([[reading[name] for name in FEATURES]
+                     for reading in (generator.generate_current_reading() for _ in range(n_rows))])
+
+
+def test_round_trip_with_dashboard_reading(model, client):
+    # Leitura do dashboard, com timestamp datetime e campos extras
+    reading = SensorDataGenerator(np.random.default_rng(1)).generate_current_reading()
+
+    remote = client.predict_with_proba(reading)
+    local = model.predict_with_proba(reading)
+
+    assert remote['prediction'] == local['prediction']
+    assert remote['probability'] == pytest.approx(local['probability'])
+    assert client.get_recommendations(reading) == model.get_recommendations(reading)
+
+
+def test_round_trip_batch(model, client):
+    generator = SensorDataGenerator(np.random.default_rng(2))
+    X = np.array([[reading[name] for name in FEATURES]
+                  for reading in (generator.generate_current_reading() for _ in range(32))])
+
+    remote = client.predict_with_proba(X)
+    local = model.predict_with_proba(X)
+
+    np.testing.assert_array_equal(remote['prediction'], local['prediction'])
+    np.testing.assert_allclose(remote['probability'], local['probability'])
+
+
+def test_concurrent_requests_coalesce_into_one_batch(model):
+    X = random_rows(8)
+
+    async def run():
+        batcher = MicroBatcher(model, max_batch_size=256, max_wait_ms=200)
+        batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.predict(X[i:i + 1]) for i in range(len(X))))
+        finally:
+            await batcher.stop()
+        return results, batcher.stats()
+
+    results, stats = asyncio.run(run())
+
+    assert stats['batches'] == 1
+    assert stats['requests'] == len(X)
+    assert stats['mean_batch_size'] == len(X)
+    assert stats['queue_depth'] == 0
+    assert stats['latency_p50_ms'] is not None
+    assert stats['latency_p50_ms'] <= stats['latency_p99_ms']
+    # Cada requisição recebe a sua fatia do lote
+    local = model.predict_with_proba(X)
+    assert [r['probability'][0] for r in results] == pytest.approx(local['probability'].tolist())
+
+
+def test_batch_size_limit_splits_batches(model):
+    X = random_rows(6)
+
+    async def run():
+        batcher = MicroBatcher(model, max_batch_size=4, max_wait_ms=200)
+        batcher.start()
+        try:
+            await asyncio.gather(*(batcher.predict(X[i:i + 2]) for i in range(0, len(X), 2)))
+        finally:
+            await batcher.stop()
+        return batcher.stats()
+
+    stats = asyncio.run(run())
+
+    assert stats['requests'] == 3
+    assert stats['batches'] == 2
+    assert stats['mean_batch_size'] == 3
+
+
+def test_stats_count_served_requests(model, client):
+    client.predict_with_proba(random_rows(5))
+    client.predict_with_proba(random_rows(3, seed=1))
+
+    stats = client.stats()
+    assert stats['requests'] == 2
+    assert 1 <= stats['batches'] <= 2
+    assert stats['model_version'] == model.version == client.version
+
+
+def test_error_response_keeps_connection_usable(client):
+    with pytest.raises(ValueError, match="Operação desconhecida"):
+        client._request({'op': 'unknown'})
+    with pytest.raises(ValueError):
+        client.predict_with_proba(np.zeros((2, 3)))
+
+    assert len(client.predict_with_proba(random_rows(2))['prediction']) == 2
+
+
+def test_timeout_discards_late_reply(model, server):
+    server, socket_path = server
+    handle_request = server.handle_request
+
+    async def slow_stats(request):
+        if request.get('op') == 'stats':
+            await asyncio.sleep(0.5)
+        return await handle_request(request)
+
+    server.handle_request = slow_stats
+    client = connect(socket_path, timeout=0.2)
+    try:
+        with pytest.raises(socket.timeout):
+            client.stats()
+
+        # A resposta atrasada de stats chega pela conexão descartada; a
+        # predição seguinte usa uma conexão nova e recebe a sua resposta
+        X = random_rows(4)
+        remote = client.predict_with_proba(X)
+        np.testing.assert_allclose(remote['probability'], model.predict_with_proba(X)['probability'])
+    finally:
+        client.close()
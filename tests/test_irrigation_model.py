@@ -0,0 +1,162 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from models import irrigation_model
+from models.irrigation_model import IrrigationModel
+from models.tree_engine import FlatForest
+
+
+@pytest.fixture(scope='module')
+def inverted_candidate(model):
+    """
+    Par modelo/scaler treinado com os rótulos invertidos: decisões opostas
+    às do modelo padrão.
+    """
+    data = model._generate_training_data(model.n_samples)
+    X = data[model.feature_names].to_numpy()
+    y = 1 - data['irrigation_needed'].to_numpy()
+    return model.fit_candidate(X, y)
+
+
+def reference_points(model, n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    bounds = np.array([model.profile.bounds[name] for name in model.feature_names])
+    return rng.uniform(bounds[:, 0], bounds[:, 1], (n_rows, len(bounds)))
+
+
+@pytest.mark.parametrize('backend', ['flat', 'grid'])
+def test_swap_model_serves_new_forest(inverted_candidate, backend):
+    # Carregado do cache de artefatos: a grade fica salva ao lado do artefato
+    model = IrrigationModel(inference_backend=backend)
+    assert model.artifact_path is not None
+
+    X = reference_points(model)
+    before = model.predict_with_proba(X)['probability']
+
+    candidate, scaler, accuracy = inverted_candidate
+    version = model.swap_model(candidate, scaler, accuracy)
+    after = model.predict_with_proba(X)
+
+    expected = FlatForest.from_model(candidate, scaler).predict_proba(X)[:, 1]
+    assert after['model_version'] == version
+    assert model.artifact_path is None
+    # A grade interpola a floresta; o erro médio é pequeno e o estado antigo
+    # (probabilidades opostas) ficaria muito longe
+    assert np.mean(np.abs(after['probability'] - expected)) < 0.05
+    assert np.mean(np.abs(before - expected)) > 0.5
+
+
+def test_swap_model_invalidates_permutation_importance(model, inverted_candidate):
+    model = IrrigationModel(artifact_path=model.artifact_path)
+    X = reference_points(model, 500)
+    y = model.predict(X)
+
+    before = model.get_permutation_importance(X, y, n_repeats=2, n_jobs=1)
+    model.swap_model(*inverted_candidate)
+    after = model.get_permutation_importance(X, y, n_repeats=2, n_jobs=1)
+
+    # Com o modelo invertido, os rótulos de referência ficam quase todos errados
+    assert before['baseline_accuracy'] == 1.0
+    assert after['baseline_accuracy'] < 0.5
+
+
+def test_training_data_does_not_touch_global_rng(model):
+    np.random.seed(123)
+    expected = np.random.random(3)
+
+    np.random.seed(123)
+    model._generate_training_data(100)
+    np.testing.assert_array_equal(np.random.random(3), expected)
+
+
+def test_swap_rejects_candidate_from_older_version(model, inverted_candidate):
+    model = IrrigationModel(artifact_path=model.artifact_path)
+    base_version = model.version
+    model.swap_model(*inverted_candidate)
+    current = model._state
+
+    assert model.swap_model(*inverted_candidate, base_version=base_version) is None
+    assert model._state is current
+    assert model.swap_model(*inverted_candidate, base_version=model.version) == current.version + 1
+
+
+def test_concurrent_swaps_publish_state_and_artifact_together(model, inverted_candidate,
+                                                              monkeypatch):
+    model = IrrigationModel(artifact_path=model.artifact_path, inference_backend='flat')
+    candidate, scaler, _ = inverted_candidate
+    build_engine = IrrigationModel._build_engine
+    second_published = threading.Event()
+
+    def slow_build(self, model_, scaler_, artifact_path):
+        # A primeira troca só publica depois da segunda
+        if artifact_path == 'first.joblib':
+            second_published.wait(5)
+        return build_engine(self, model_, scaler_, artifact_path)
+
+    monkeypatch.setattr(IrrigationModel, '_build_engine', slow_build)
+    first = threading.Thread(target=model.swap_model,
+                             args=(candidate, scaler, 0.1, 'first.joblib'))
+    first.start()
+    model.swap_model(model.model, model.scaler, 0.2, 'second.joblib')
+    second_published.set()
+    first.join()
+
+    assert model.model is candidate
+    assert (model.artifact_path, model.accuracy) == ('first.joblib', 0.1)
+
+
+def test_importance_of_swapped_out_model_is_not_cached(model, inverted_candidate,
+                                                       monkeypatch, tmp_path):
+    path = str(tmp_path / 'irrigation_model.joblib')
+    model.save_model(path)
+    model = IrrigationModel(artifact_path=path)
+    X = reference_points(model, 200)
+    y = model.predict(X)
+
+    new_path = str(tmp_path / 'retrained.joblib')
+    compute = irrigation_model.compute_permutation_importance
+
+    def swap_during_compute(*args, **kwargs):
+        model.swap_model(*inverted_candidate, artifact_path=new_path)
+        return compute(*args, **kwargs)
+
+    monkeypatch.setattr(irrigation_model, 'compute_permutation_importance', swap_during_compute)
+    result = model.get_permutation_importance(X, y, n_repeats=2, n_jobs=1)
+
+    # Calculado para o modelo antigo: fica ao lado do artefato antigo,
+    # nunca no cache do modelo novo
+    assert result['baseline_accuracy'] == 1.0
+    assert model._permutation_cache is None
+    assert os.path.exists(model._importance_path(path))
+    assert not os.path.exists(model._importance_path(new_path))
+
+
+def test_arrays_artifact_rejects_other_backends(model, tmp_path):
+    path = str(tmp_path / 'model.arrays')
+    model.save_model(path, layout='arrays')
+
+    loaded = IrrigationModel(artifact_path=path)
+    assert loaded.inference_backend == 'flat' and loaded.model is None
+    assert IrrigationModel(artifact_path=path, inference_backend='flat').inference_backend == 'flat'
+    for backend in ('sklearn', 'grid'):
+        with pytest.raises(ValueError, match="apenas como arrays"):
+            IrrigationModel(artifact_path=path, inference_backend=backend)
+
+    with pytest.raises(ValueError, match="estimador do sklearn"):
+        loaded.compact()
+
+
+def test_train_false_builds_empty_model(model, monkeypatch):
+    def no_training(self, n_samples=None):
+        raise AssertionError("treino sintético inesperado")
+
+    monkeypatch.setattr(IrrigationModel, '_train_model', no_training)
+    empty = IrrigationModel(use_cache=False, train=False, inference_backend='flat')
+    assert not empty.is_trained and empty.model is None
+
+    data = model._generate_training_data(model.n_samples)
+    empty.fit(data[model.feature_names].to_numpy(), data['irrigation_needed'].to_numpy())
+    assert empty.is_trained and isinstance(empty._state.engine, FlatForest)
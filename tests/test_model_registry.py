@@ -0,0 +1,109 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from models import model_registry
+from models.irrigation_model import CORN_PROFILE, CultureProfile
+from models.model_registry import ModelRegistry
+
+
+class FakeModel:
+    """
+    Substitui IrrigationModel no registro: registra as construções e pode
+    demorar ou falhar, sem treinar florestas.
+    """
+
+    created = []
+    delay = 0.0
+    fail = set()
+
+    def __init__(self, profile=None, **kwargs):
+        time.sleep(self.delay)
+        if profile.name in self.fail:
+            raise RuntimeError(f"falha ao carregar {profile.name}")
+        self.profile = profile
+        self.kwargs = kwargs
+        FakeModel.created.append(profile.name)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    monkeypatch.setattr(model_registry, 'IrrigationModel', FakeModel)
+    monkeypatch.setattr(FakeModel, 'created', [])
+    monkeypatch.setattr(FakeModel, 'delay', 0.0)
+    monkeypatch.setattr(FakeModel, 'fail', set())
+    return FakeModel
+
+
+def culture_profiles(id_cultura):
+    return CultureProfile.from_cultura(f'cultura {id_cultura}', 40 + id_cultura, 70, 5.5, 6.8)
+
+
+def test_evicts_least_recently_used_at_capacity(fake_model):
+    registry = ModelRegistry(culture_profiles, max_models=2, use_cache=False)
+
+    first = registry.get(1)
+    registry.get(2)
+    # Uso recente da cultura 1: a cultura 2 é a próxima a sair
+    assert registry.get(1) is first
+    registry.get(3)
+
+    assert 1 in registry and 3 in registry and 2 not in registry
+    assert len(registry) == 2
+    assert (registry.loads, registry.evictions) == (3, 1)
+
+    # Voltar a usar uma cultura descartada a carrega de novo
+    registry.get(2)
+    assert 1 not in registry
+    assert fake_model.created == ['cultura 1', 'cultura 2', 'cultura 3', 'cultura 2']
+
+
+def test_concurrent_requests_share_one_load(fake_model):
+    fake_model.delay = 0.2
+    registry = ModelRegistry(culture_profiles, max_models=2)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(executor.map(registry.get, [5] * 8))
+
+    assert all(model is models[0] for model in models)
+    assert fake_model.created == ['cultura 5']
+    assert registry.loads == 1
+
+
+def test_loader_exception_reaches_all_waiters(fake_model):
+    fake_model.delay = 0.2
+    fake_model.fail = {'cultura 7'}
+    registry = ModelRegistry(culture_profiles)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(registry.get, 7) for _ in range(4)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match='cultura 7'):
+            future.result()
+
+    assert 7 not in registry
+    assert registry.loads == 0
+
+    # A falha não fica registrada: a próxima chamada tenta de novo
+    fake_model.fail = set()
+    assert registry.get(7).profile.name == 'cultura 7'
+
+
+def test_profiles_are_per_culture_and_memoized(fake_model):
+    calls = []
+
+    def source(id_cultura):
+        calls.append(id_cultura)
+        return culture_profiles(id_cultura)
+
+    registry = ModelRegistry(source, max_models=1, cache_dir='unused')
+    registry.get(1)
+    registry.get(2)
+    model = registry.get(1)
+
+    assert model.profile == culture_profiles(1)
+    assert model.kwargs == {'cache_dir': 'unused'}
+    assert calls == [1, 2]
+    # Sem fonte de perfis, todas as culturas usam o milho
+    assert ModelRegistry().profile(3) is CORN_PROFILE
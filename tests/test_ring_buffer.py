@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.ring_buffer import ReadingRingBuffer, NUMERIC_FIELDS, to_epoch_us
+from utils.sensor_data import SensorData
+
+
+class ListHistory:
+    """
+    Histórico em lista de dicts, como o SensorData antes do buffer circular
+    (referência para os testes de paridade).
+    """
+
+    def __init__(self, max_readings):
+        self.max_readings = max_readings
+        self.historical_data = []
+
+    def add_sensor_reading(self, reading):
+        reading = dict(reading)
+        if isinstance(reading.get('timestamp'), datetime):
+            reading['timestamp'] = reading['timestamp'].isoformat()
+        self.historical_data.append(reading)
+        self.historical_data = self.historical_data[-self.max_readings:]
+
+    def get_recent_data(self, hours):
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+        return [reading for reading in self.historical_data
+                if datetime.fromisoformat(reading['timestamp']) >= cutoff_time]
+
+    def get_sensor_statistics(self, hours):
+        df = pd.DataFrame(self.get_recent_data(hours))
+        return {col: {'mean': float(df[col].mean()), 'min': float(df[col].min()),
+                      'max': float(df[col].max()), 'std': float(df[col].std()),
+                      'median': float(df[col].median())}
+                for col in ['humidity', 'ph', 'phosphorus', 'potassium']}
+
+    def analyze_trends(self, parameter, hours):
+        df = pd.DataFrame(self.get_recent_data(hours))
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        values = df.sort_values('timestamp', kind='stable')[parameter].values
+        return {
+            'slope': float(np.polyfit(np.arange(len(values)), values, 1)[0]),
+            'change_percent': float((values[-1] - values[0]) / values[0] * 100),
+            'current_value': float(values[-1]),
+            'initial_value': float(values[0])
+        }
+
+
+def make_readings(n, shuffle=False, seed=0):
+    """
+    Leituras a cada minuto terminando agora (48 h para n = 2880), com
+    horários embaralhados opcionalmente.
+    """
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    offsets = np.arange(n)[::-1]
+    if shuffle:
+        rng.shuffle(offsets)
+    return [{
+        'timestamp': now - timedelta(minutes=int(offset)),
+        'humidity': float(rng.uniform(20, 80)),
+        'ph': float(rng.uniform(5.5, 8.0)),
+        'phosphorus': float(rng.uniform(5, 50)),
+        'potassium': float(rng.uniform(80, 250)),
+        'temperature': float(rng.uniform(15, 35)),
+        'light_intensity': float(rng.uniform(0, 1000)),
+        'irrigation_prediction': int(rng.integers(2))
+    } for offset in offsets]
+
+
+@pytest.fixture
+def sensor_data(tmp_path):
+    # Arquivo inexistente: começa vazio
+    return SensorData(data_file=str(tmp_path / 'sensor_data.json'))
+
+
+def test_wraparound_keeps_last_readings():
+    buffer = ReadingRingBuffer(capacity=5)
+    readings = make_readings(12)
+    buffer.extend(readings)
+
+    assert len(buffer) == 5
+    records = buffer.records()
+    assert [r['timestamp'] for r in records] == [r['timestamp'].isoformat() for r in readings[-5:]]
+    assert [list(r) for r in records] == [list(r) for r in readings[-5:]]
+    assert [r['irrigation_prediction'] for r in records] == \
+        [r['irrigation_prediction'] for r in readings[-5:]]
+
+    view = buffer.view()
+    for name in NUMERIC_FIELDS:
+        np.testing.assert_array_equal(view[name], [r[name] for r in readings[-5:]])
+
+
+def test_ordered_view_is_read_only_window():
+    buffer = ReadingRingBuffer(capacity=100)
+    readings = make_readings(250)
+    buffer.extend(readings)
+
+    since = readings[-30]['timestamp']
+    view = buffer.view(since=since)
+
+    assert buffer.is_ordered
+    assert len(view['humidity']) == 30
+    assert not view['humidity'].flags.writeable
+    assert view['humidity'].base is not None
+    np.testing.assert_array_equal(view['timestamp'], [to_epoch_us(r['timestamp']) for r in readings[-30:]])
+
+
+def test_out_of_order_view_is_sorted():
+    buffer = ReadingRingBuffer(capacity=100)
+    readings = make_readings(100, shuffle=True)
+    buffer.extend(readings)
+
+    since = datetime.now() - timedelta(minutes=40)
+    view = buffer.view(since=since)
+    expected = sorted((r for r in readings if r['timestamp'] >= since), key=lambda r: r['timestamp'])
+
+    assert not buffer.is_ordered
+    np.testing.assert_array_equal(view['ph'], [r['ph'] for r in expected])
+
+
+@pytest.mark.parametrize('shuffle', [False, True])
+def test_sensor_data_matches_list_history(sensor_data, shuffle):
+    reference = ListHistory(SensorData.MAX_READINGS)
+    for reading in make_readings(2 * SensorData.MAX_READINGS, shuffle=shuffle):
+        sensor_data.add_sensor_reading(reading)
+        reference.add_sensor_reading(reading)
+
+    assert sensor_data.historical_data == reference.historical_data
+    assert sensor_data.get_recent_data(6) == reference.get_recent_data(6)
+
+    statistics = sensor_data.get_sensor_statistics(12)
+    for name, expected in reference.get_sensor_statistics(12).items():
+        assert statistics[name] == pytest.approx(expected)
+
+    trend = sensor_data.analyze_trends('humidity', 12)
+    for key, expected in reference.analyze_trends('humidity', 12).items():
+        assert trend[key] == pytest.approx(expected)
+
+
+def test_add_sensor_reading_converts_timestamp_in_place(sensor_data):
+    reading = make_readings(1)[0]
+    timestamp = reading['timestamp']
+    sensor_data.add_sensor_reading(reading)
+
+    assert reading['timestamp'] == timestamp.isoformat()
+    assert sensor_data.current_session_data[-1] is reading
+    assert sensor_data.historical_data[-1]['timestamp'] == timestamp.isoformat()
+
+
+def test_records_keep_timestamp_text(sensor_data):
+    readings = [dict(r, timestamp=r['timestamp'].replace(microsecond=0).strftime('%Y-%m-%dT%H:%M:%S.%f'))
+                for r in make_readings(3)]
+    sensor_data.historical_data = readings
+
+    assert sensor_data.historical_data == readings
+    assert readings[0]['timestamp'].endswith('.000000')
@@ -0,0 +1,188 @@
+import numpy as np
+import pytest
+
+from models.irrigation_model import CORN_PROFILE, CultureProfile
+from models.rules import (DEFAULT_RULES_ENGINE, DEFAULT_THRESHOLDS, FEATURES, RECOMMENDATION_FALLBACK,
+                          STATUS_LABELS, RulesEngine, thresholds_from_profile)
+
+
+# Cadeias if/elif originais (IrrigationModel.get_recommendations,
+# SensorDataGenerator.get_sensor_status e alertas do app.py), referência
+# de paridade do motor
+def baseline_recommendations(sensor_data):
+    recommendations = []
+
+    if sensor_data['humidity'] < 35:
+        recommendations.append("🚨 Irrigação urgente necessária - umidade crítica")
+    elif sensor_data['humidity'] < 45:
+        recommendations.append("💧 Considere irrigação - umidade baixa")
+    elif sensor_data['humidity'] > 75:
+        recommendations.append("⚠️ Umidade alta - verifique drenagem")
+
+    if sensor_data['ph'] < 6.0:
+        recommendations.append("🧪 Solo ácido - considere calcário")
+    elif sensor_data['ph'] > 7.5:
+        recommendations.append("🧪 Solo alcalino - considere enxofre")
+    else:
+        recommendations.append("✅ pH ideal para milho")
+
+    if sensor_data['phosphorus'] < 15:
+        recommendations.append("🌱 Fósforo baixo - aplicar fertilizante fosfatado")
+    if sensor_data['potassium'] < 120:
+        recommendations.append("🌱 Potássio baixo - aplicar fertilizante potássico")
+
+    if sensor_data['humidity'] > 45 and 6.0 <= sensor_data['ph'] <= 7.0:
+        recommendations.append("🌽 Condições ideais para desenvolvimento do milho")
+
+    return recommendations if recommendations else ["✅ Condições adequadas - monitoramento contínuo"]
+
+
+def baseline_sensor_status(reading):
+    status = {}
+
+    if reading['humidity'] < 30:
+        status['humidity'] = 'CRÍTICO'
+    elif reading['humidity'] < 45:
+        status['humidity'] = 'BAIXO'
+    elif reading['humidity'] > 75:
+        status['humidity'] = 'ALTO'
+    else:
+        status['humidity'] = 'NORMAL'
+
+    if reading['ph'] < 6.0 or reading['ph'] > 7.5:
+        status['ph'] = 'FORA DO RANGE'
+    else:
+        status['ph'] = 'NORMAL'
+
+    if reading['phosphorus'] < 15:
+        status['phosphorus'] = 'BAIXO'
+    elif reading['phosphorus'] > 35:
+        status['phosphorus'] = 'ALTO'
+    else:
+        status['phosphorus'] = 'NORMAL'
+
+    if reading['potassium'] < 120:
+        status['potassium'] = 'BAIXO'
+    elif reading['potassium'] > 200:
+        status['potassium'] = 'ALTO'
+    else:
+        status['potassium'] = 'NORMAL'
+
+    return status
+
+
+def baseline_alerts(current_data, humidity_threshold, ph_min, ph_max):
+    alerts = []
+    if current_data['humidity'] < humidity_threshold:
+        alerts.append("⚠️ Umidade baixa!")
+    if current_data['ph'] < ph_min or current_data['ph'] > ph_max:
+        alerts.append("⚠️ pH fora do range!")
+    if current_data['phosphorus'] < 15:
+        alerts.append("⚠️ Fósforo baixo!")
+    if current_data['potassium'] < 120:
+        alerts.append("⚠️ Potássio baixo!")
+    return alerts
+
+
+def boundary_readings():
+    # Cada limiar exatamente, e logo abaixo e acima dele, em todas as
+    # combinações das quatro features
+    axes = {
+        'humidity': [29.99, 30, 30.01, 35, 44.99, 45, 45.01, 60, 74.99, 75, 75.01],
+        'ph': [5.99, 6.0, 6.01, 6.5, 7.0, 7.01, 7.49, 7.5, 7.51],
+        'phosphorus': [14.99, 15, 15.01, 35, 35.01],
+        'potassium': [119.99, 120, 120.01, 200, 200.01]
+    }
+    grid = np.meshgrid(*axes.values(), indexing='ij')
+    return [dict(zip(FEATURES, row)) for row in np.column_stack([g.ravel() for g in grid]).tolist()]
+
+
+def readings(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([rng.uniform(10, 95, n), rng.uniform(4.5, 9, n),
+                         rng.uniform(0, 60, n), rng.uniform(50, 300, n)])
+    X[::50, 1] = np.nan
+    # Valores exatamente nos limiares padrão
+    X[1] = [45, 6.0, 15, 120]
+    X[2] = [75, 7.5, 35, 200]
+    X[3] = [35, 7.0, 15, 120]
+    return X
+
+
+@pytest.mark.parametrize('thresholds', [None, {'humidity_low': 60},
+                                        {'humidity_critical': 25, 'humidity_urgent': 30,
+                                         'humidity_low': 40, 'humidity_high': 70,
+                                         'ph_min': 5.5, 'ph_ideal_max': 6.8, 'ph_max': 7.3}])
+def test_single_reading_matches_mask_path(thresholds):
+    engine = DEFAULT_RULES_ENGINE
+    X = readings()
+    recommendations = engine.rule_masks(X, 'recommendation', thresholds)
+    alerts = engine.rule_masks(X, 'alert', thresholds)
+    status = engine.status_codes(X, thresholds)
+
+    for i, row in enumerate(X.tolist()):
+        reading = {'timestamp': None, **dict(zip(FEATURES, row))}
+        assert engine.recommendations(reading, thresholds) == \
+            (engine.messages('recommendation', recommendations[i]) or [RECOMMENDATION_FALLBACK])
+        assert engine.alerts(reading, thresholds) == engine.messages('alert', alerts[i])
+        assert engine.sensor_status(reading, thresholds) == \
+            {feature: STATUS_LABELS[codes[i]] for feature, codes in status.items()}
+
+
+def test_dict_of_arrays_uses_mask_path():
+    reading = {'humidity': np.array([40.0]), 'ph': 6.5, 'phosphorus': 20, 'potassium': 150}
+    scalar = {'humidity': 40.0, 'ph': 6.5, 'phosphorus': 20, 'potassium': 150}
+
+    assert DEFAULT_RULES_ENGINE.recommendations(reading) == DEFAULT_RULES_ENGINE.recommendations(scalar)
+    assert DEFAULT_RULES_ENGINE.sensor_status(reading) == DEFAULT_RULES_ENGINE.sensor_status(scalar)
+
+
+def test_matches_baseline_if_chains():
+    engine = DEFAULT_RULES_ENGINE
+    for reading in boundary_readings():
+        assert engine.recommendations(reading) == baseline_recommendations(reading)
+        assert engine.sensor_status(reading) == baseline_sensor_status(reading)
+        for humidity_threshold, ph_min, ph_max in ((45, 6.0, 7.5), (30, 5.8, 7.0)):
+            thresholds = {'humidity_low': humidity_threshold, 'ph_min': ph_min, 'ph_max': ph_max}
+            assert engine.alerts(reading, thresholds) == \
+                baseline_alerts(reading, humidity_threshold, ph_min, ph_max)
+
+
+def test_mask_path_matches_baseline_if_chains():
+    engine = DEFAULT_RULES_ENGINE
+    batch = boundary_readings()
+    recommendations = engine.rule_masks(np.array([[r[name] for name in FEATURES] for r in batch]),
+                                        'recommendation')
+    for reading, mask in zip(batch, recommendations):
+        assert (engine.messages('recommendation', mask) or [RECOMMENDATION_FALLBACK]) == \
+            baseline_recommendations(reading)
+
+
+def test_thresholds_from_cultura():
+    assert thresholds_from_profile(CORN_PROFILE) == DEFAULT_THRESHOLDS
+    assert RulesEngine.from_cultura('Milho', 40, 70, 6.0, 7.0).thresholds == DEFAULT_THRESHOLDS
+
+    engine = RulesEngine.from_cultura('Soja', 50, 80, 6.0, 6.8)
+    profile = CultureProfile.from_cultura('Soja', 50, 80, 6.0, 6.8)
+    assert engine.thresholds == thresholds_from_profile(profile)
+    assert engine.thresholds['humidity_critical'] == profile.humidity_thresholds[0]
+    assert engine.thresholds['ph_min'] == 6.0 and engine.thresholds['ph_ideal_max'] == 6.8
+    assert engine.recommendations({'humidity': 60, 'ph': 6.5, 'phosphorus': 20, 'potassium': 150}) == \
+        ["✅ pH ideal para soja", "🌽 Condições ideais para desenvolvimento do soja"]
+    # Umidade adequada para o milho, baixa para a soja
+    assert engine.sensor_status({'humidity': 50, 'ph': 6.5, 'phosphorus': 20, 'potassium': 150}) == \
+        {'humidity': 'BAIXO', 'ph': 'NORMAL', 'phosphorus': 'NORMAL', 'potassium': 'NORMAL'}
+
+
+def test_model_uses_profile_rules(model):
+    assert model.rules_engine is DEFAULT_RULES_ENGINE
+
+    profile = CultureProfile.from_cultura('Soja', 50, 80, 6.0, 6.8)
+    original = model.profile
+    try:
+        model.profile = profile
+        assert model.rules_engine.thresholds == thresholds_from_profile(profile)
+        assert model.rules_engine is model.rules_engine
+    finally:
+        model.profile = original
+    assert model.rules_engine.thresholds == DEFAULT_THRESHOLDS
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from models.training_data import (LEITURA_SOLO_COUNT_QUERY, LEITURA_SOLO_TRAINING_QUERY,
+                                  leitura_solo_features, load_leitura_solo_arrays,
+                                  normalize_leitura_solo)
+
+
+class FakeHistoryDB:
+    """
+    DatabaseManager com leituras fixas de leitura_solo para o carregador
+    (colunas de LEITURA_SOLO_TRAINING_QUERY).
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute_query(self, query, params=None):
+        count = len(self.rows)
+        return type('Cursor', (), {'fetchone': lambda _: (count,)})()
+
+    def stream_query(self, query, params=None, chunk_size=10000, cursor_name=None):
+        rows = self.rows[:params['limit']]
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+
+def test_invalid_rows_are_dropped_not_fatal(capsys):
+    # Linha 1: captura x100 (convertida); linha 2: pH impossível; linha 3: nula
+    umidade = [45.0, 4500.0, 50.0, np.nan, 60.0]
+    ph = [6.5, 650.0, -1.0, 6.0, 7.0]
+
+    X, valid = leitura_solo_features(umidade, ph, [1, 0, 1, 1, 0], [1, 1, 0, 1, 0])
+
+    np.testing.assert_array_equal(valid, [True, True, False, False, True])
+    np.testing.assert_allclose(X[:, :2], [[45.0, 6.5], [45.0, 6.5], [60.0, 7.0]])
+    np.testing.assert_allclose(X[:, 2], [25.0, 10.0, 10.0])
+    assert '2 de 5 leituras' in capsys.readouterr().out
+
+
+def test_raises_only_when_nothing_is_valid():
+    with pytest.raises(ValueError, match='fora da faixa física'):
+        normalize_leitura_solo([50.0, -60.0], [-1.0, 6.5])
+
+    _, _, valid = normalize_leitura_solo([50.0], [-1.0], allow_empty=True)
+    assert not valid.any()
+    # Entrada vazia não é erro
+    assert len(normalize_leitura_solo([], [])[2]) == 0
+
+
+def test_loader_skips_invalid_rows_across_chunks():
+    rows = [(40.0 + i, 6.5, 1, 1, i % 2) for i in range(10)]
+    # Um pedaço inteiro inválido não interrompe a carga
+    rows[2:4] = [(50.0, -1.0, 1, 1, 1), (-5.0, 6.5, 1, 1, 1)]
+
+    X, y = load_leitura_solo_arrays(FakeHistoryDB(rows), chunk_size=2)
+
+    assert len(X) == len(y) == 8
+    np.testing.assert_array_equal(X[:, 0], [40, 41, 44, 45, 46, 47, 48, 49])
+    np.testing.assert_array_equal(y, [0, 1, 0, 1, 0, 1, 0, 1])
+
+    with pytest.raises(ValueError, match='Nenhuma leitura'):
+        load_leitura_solo_arrays(FakeHistoryDB(rows[2:4]), chunk_size=2)
+
+
+def test_count_query_filters_like_training_query():
+    # As duas consultas precisam contar e ler as mesmas linhas
+    def from_clause(query):
+        return query.split('FROM', 1)[1].split('ORDER BY')[0].split()
+
+    assert from_clause(LEITURA_SOLO_COUNT_QUERY) == from_clause(LEITURA_SOLO_TRAINING_QUERY)
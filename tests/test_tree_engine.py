@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from models.tree_engine import FlatForest
+
+
+def random_readings(model, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    bounds = np.array([model.profile.bounds[name] for name in model.feature_names])
+    # Inclui pontos fora dos limites do treinamento
+    low, high = bounds[:, 0] * 0.8, bounds[:, 1] * 1.2
+    return rng.uniform(low, high, (n_rows, len(bounds)))
+
+
+@pytest.fixture(scope='module')
+def flat(model):
+    return FlatForest.from_model(model.model, model.scaler)
+
+
+def test_predict_proba_matches_sklearn(model, flat):
+    X = random_readings(model, 5000)
+    expected = model.model.predict_proba(model.scaler.transform(X))
+
+    np.testing.assert_array_equal(flat.predict_proba(X), expected)
+    np.testing.assert_array_equal(flat.predict(X), model.model.predict(model.scaler.transform(X)))
+
+
+def test_chunked_predict_proba_matches_single_pass(model, flat, monkeypatch):
+    X = random_readings(model, 1000, seed=1)
+    expected = flat.predict_proba(X)
+
+    # Lotes que não são múltiplos do pedaço, inclusive menores que ele
+    monkeypatch.setattr(FlatForest, 'CHUNK_ROWS', 7)
+    for n in (1, 6, 7, 8, 1000):
+        np.testing.assert_array_equal(flat.predict_proba(X[:n]), expected[:n])
+
+
+def test_arrays_round_trip(model, flat, tmp_path):
+    path = tmp_path / 'forest.arrays'
+    with open(path, 'wb') as f:
+        flat.save_arrays(f, {'feature_names': model.feature_names})
+
+    loaded, metadata = FlatForest.load_arrays(str(path))
+    X = random_readings(model, 500, seed=2)
+
+    assert metadata['feature_names'] == model.feature_names
+    assert loaded.digest() == flat.digest()
+    np.testing.assert_array_equal(loaded.predict_proba(X), flat.predict_proba(X))
@@ -3,6 +3,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 import random
 
+from models.rules import DEFAULT_RULES_ENGINE
+from utils.streaming import ReadingStream
+
 
 class SensorDataGenerator:
     """
@@ -10,7 +13,14 @@ class SensorDataGenerator:
     Simula leituras realistas baseadas em padrões de cultivo de milho.
     """
 
-    def __init__(self):
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng: numpy.random.Generator próprio do sensor (ex.: simulação de
+                 frota); se None, usa o estado global de np.random
+        """
+        self.rng = rng if rng is not None else np.random
+
         self.base_humidity = 50  # Umidade base
         self.base_ph = 6.5  # pH base
         self.base_phosphorus = 25  # Fósforo base em ppm
@@ -40,11 +50,26 @@ class SensorDataGenerator:
 
         return hour_factor + day_factor
 
+    def _get_time_factors(self, timestamps):
+        """
+        Versão vetorizada de _get_time_factor para uma série de timestamps.
+
+        Args:
+            timestamps: pandas.DatetimeIndex
+
+        Returns:
+            numpy.ndarray: fator de tempo de cada timestamp
+        """
+        hour_factor = np.sin(2 * np.pi * timestamps.hour.to_numpy() / 24) * 0.1
+        day_factor = np.sin(2 * np.pi * timestamps.weekday.to_numpy() / 7) * 0.05
+
+        return hour_factor + day_factor
+
     def _add_realistic_noise(self, value, noise_level=0.02):
         """
         Adiciona ruído realista para simular variações dos sensores.
         """
-        noise = np.random.normal(0, noise_level * value)
+        noise = self.rng.normal(0, noise_level * value)
         return value + noise
 
     def generate_current_reading(self, timestamp=None):
@@ -61,22 +86,22 @@ class SensorDataGenerator:
 
         # Gerar umidade com variações naturais
         humidity = self.base_humidity + (time_factor * 20) + \
-                   np.random.normal(0, self.humidity_variation)
+                   self.rng.normal(0, self.humidity_variation)
         humidity = np.clip(humidity, 15, 85)
         humidity = self._add_realistic_noise(humidity)
 
         # Gerar pH com menor variação
-        ph = self.base_ph + np.random.normal(0, self.ph_variation)
+        ph = self.base_ph + self.rng.normal(0, self.ph_variation)
         ph = np.clip(ph, 5.5, 8.0)
         ph = self._add_realistic_noise(ph, 0.01)
 
         # Gerar fósforo com variação gradual
-        phosphorus = self.base_phosphorus + np.random.normal(0, self.phosphorus_variation)
+        phosphorus = self.base_phosphorus + self.rng.normal(0, self.phosphorus_variation)
         phosphorus = np.clip(phosphorus, 5, 50)
         phosphorus = self._add_realistic_noise(phosphorus)
 
         # Gerar potássio com variação gradual
-        potassium = self.base_potassium + np.random.normal(0, self.potassium_variation)
+        potassium = self.base_potassium + self.rng.normal(0, self.potassium_variation)
         potassium = np.clip(potassium, 80, 250)
         potassium = self._add_realistic_noise(potassium)
 
@@ -86,13 +111,30 @@ class SensorDataGenerator:
             'ph': float(ph),
             'phosphorus': float(phosphorus),
             'potassium': float(potassium),
-            'temperature': float(np.random.normal(25, 3)),  # Temperatura ambiente
-            'light_intensity': float(np.random.normal(50, 10))  # Intensidade luminosa
+            'temperature': float(self.rng.normal(25, 3)),  # Temperatura ambiente
+            'light_intensity': float(self.rng.normal(50, 10))  # Intensidade luminosa
         }
 
+    def stream(self, n_sensors=1, rate=None, batch_size=None, max_readings=None):
+        """
+        Modo de fluxo: leituras de N sensores a uma taxa agregada alvo.
+
+        Args:
+            n_sensors: número de sensores simulados
+            rate: leituras por segundo (None = sem limite)
+            batch_size: leituras por lote (padrão: n_sensors)
+            max_readings: total de leituras (None = infinito)
+
+        Returns:
+            ReadingStream: iterável (síncrono ou assíncrono) de lotes de
+            leituras, com stats() de taxa obtida e atraso (ver utils/streaming.py)
+        """
+        return ReadingStream(self, n_sensors, rate, batch_size, max_readings)
+
     def generate_historical_data(self, hours=24, frequency_minutes=30):
         """
-        Gera dados históricos para um período específico.
+        Gera dados históricos para um período específico. Todas as leituras
+        são geradas em uma única passada vetorizada (ver _generate_readings).
 
         Args:
             hours: número de horas para gerar dados
@@ -111,40 +153,77 @@ class SensorDataGenerator:
             freq=f'{frequency_minutes}min'
         )
 
-        historical_data = []
-
-        for timestamp in timestamps:
-            reading = self.generate_current_reading(timestamp)
-            historical_data.append(reading)
-
-        df = pd.DataFrame(historical_data)
+        df = self._generate_readings(timestamps)
 
         # Adicionar tendências realistas
         df = self._add_realistic_trends(df)
 
         return df
 
+    def _generate_readings(self, timestamps):
+        """
+        Gera as leituras de todos os timestamps de uma vez, com as mesmas
+        distribuições de generate_current_reading (sorteios, ruído e
+        saturação aplicados a arrays inteiros).
+
+        Args:
+            timestamps: pandas.DatetimeIndex
+
+        Returns:
+            pandas.DataFrame: uma leitura por timestamp
+        """
+        n = len(timestamps)
+        time_factor = self._get_time_factors(timestamps)
+
+        # Umidade com variações naturais
+        humidity = self.base_humidity + (time_factor * 20) + \
+                   self.rng.normal(0, self.humidity_variation, n)
+        humidity = np.clip(humidity, 15, 85)
+        humidity = self._add_realistic_noise(humidity)
+
+        # pH com menor variação
+        ph = self.base_ph + self.rng.normal(0, self.ph_variation, n)
+        ph = np.clip(ph, 5.5, 8.0)
+        ph = self._add_realistic_noise(ph, 0.01)
+
+        # Fósforo e potássio com variação gradual
+        phosphorus = self.base_phosphorus + self.rng.normal(0, self.phosphorus_variation, n)
+        phosphorus = np.clip(phosphorus, 5, 50)
+        phosphorus = self._add_realistic_noise(phosphorus)
+
+        potassium = self.base_potassium + self.rng.normal(0, self.potassium_variation, n)
+        potassium = np.clip(potassium, 80, 250)
+        potassium = self._add_realistic_noise(potassium)
+
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'humidity': humidity,
+            'ph': ph,
+            'phosphorus': phosphorus,
+            'potassium': potassium,
+            'temperature': self.rng.normal(25, 3, n),  # Temperatura ambiente
+            'light_intensity': self.rng.normal(50, 10, n)  # Intensidade luminosa
+        })
+
     def _add_realistic_trends(self, df):
         """
-        Adiciona tendências realistas aos dados históricos.
+        Adiciona tendências realistas aos dados históricos (operações sobre
+        os arrays das colunas, sem aritmética de Series do pandas).
         """
+        timestamps = df['timestamp'].to_numpy()
+        hours_passed = (timestamps - timestamps[0]) / np.timedelta64(1, 'h')
+
         # Simular depleção gradual de umidade
-        hours_passed = (df['timestamp'] - df['timestamp'].iloc[0]).dt.total_seconds() / 3600
         humidity_trend = -0.5 * hours_passed  # Perda de 0.5% por hora
-        df['humidity'] = df['humidity'] + humidity_trend
-        df['humidity'] = df['humidity'].clip(15, 85)
+        df['humidity'] = np.clip(df['humidity'].to_numpy() + humidity_trend, 15, 85)
 
         # Simular variação de pH mais estável
-        df['ph'] = df['ph'] + np.random.normal(0, 0.05, len(df))
-        df['ph'] = df['ph'].clip(5.5, 8.0)
+        df['ph'] = np.clip(df['ph'].to_numpy() + self.rng.normal(0, 0.05, len(df)), 5.5, 8.0)
 
         # Simular depleção gradual de nutrientes
         nutrient_trend = -0.1 * hours_passed  # Perda gradual
-        df['phosphorus'] = df['phosphorus'] + nutrient_trend
-        df['potassium'] = df['potassium'] + nutrient_trend * 2
-
-        df['phosphorus'] = df['phosphorus'].clip(5, 50)
-        df['potassium'] = df['potassium'].clip(80, 250)
+        df['phosphorus'] = np.clip(df['phosphorus'].to_numpy() + nutrient_trend, 5, 50)
+        df['potassium'] = np.clip(df['potassium'].to_numpy() + nutrient_trend * 2, 80, 250)
 
         return df
 
@@ -162,17 +241,17 @@ class SensorDataGenerator:
         post_irrigation_data = pre_irrigation_data.copy()
 
         # Aumento da umidade
-        humidity_increase = np.random.uniform(15, 25)
+        humidity_increase = self.rng.uniform(15, 25)
         post_irrigation_data['humidity'] = min(85,
                                                pre_irrigation_data['humidity'] + humidity_increase)
 
         # Leve alteração no pH devido à diluição
-        ph_change = np.random.uniform(-0.1, 0.1)
+        ph_change = self.rng.uniform(-0.1, 0.1)
         post_irrigation_data['ph'] = np.clip(
             pre_irrigation_data['ph'] + ph_change, 5.5, 8.0)
 
         # Leve diluição dos nutrientes
-        nutrient_dilution = np.random.uniform(0.95, 0.98)
+        nutrient_dilution = self.rng.uniform(0.95, 0.98)
         post_irrigation_data['phosphorus'] *= nutrient_dilution
         post_irrigation_data['potassium'] *= nutrient_dilution
 
@@ -188,43 +267,9 @@ class SensorDataGenerator:
             reading: dicionário com dados dos sensores
 
         Returns:
-            dict: status de cada sensor
+            dict: status de cada sensor (ver models/rules.py)
         """
-        status = {}
-
-        # Status da umidade
-        if reading['humidity'] < 30:
-            status['humidity'] = 'CRÍTICO'
-        elif reading['humidity'] < 45:
-            status['humidity'] = 'BAIXO'
-        elif reading['humidity'] > 75:
-            status['humidity'] = 'ALTO'
-        else:
-            status['humidity'] = 'NORMAL'
-
-        # Status do pH
-        if reading['ph'] < 6.0 or reading['ph'] > 7.5:
-            status['ph'] = 'FORA DO RANGE'
-        else:
-            status['ph'] = 'NORMAL'
-
-        # Status do fósforo
-        if reading['phosphorus'] < 15:
-            status['phosphorus'] = 'BAIXO'
-        elif reading['phosphorus'] > 35:
-            status['phosphorus'] = 'ALTO'
-        else:
-            status['phosphorus'] = 'NORMAL'
-
-        # Status do potássio
-        if reading['potassium'] < 120:
-            status['potassium'] = 'BAIXO'
-        elif reading['potassium'] > 200:
-            status['potassium'] = 'ALTO'
-        else:
-            status['potassium'] = 'NORMAL'
-
-        return status
+        return DEFAULT_RULES_ENGINE.sensor_status(reading)
 
     def generate_alert_conditions(self, probability=0.1):
         """
@@ -238,19 +283,19 @@ class SensorDataGenerator:
         """
         reading = self.generate_current_reading()
 
-        if np.random.random() < probability:
+        if self.rng.random() < probability:
             # Simular condição de alerta
-            alert_type = np.random.choice(['humidity', 'ph', 'nutrients'])
+            alert_type = self.rng.choice(['humidity', 'ph', 'nutrients'])
 
             if alert_type == 'humidity':
-                reading['humidity'] = np.random.uniform(15, 35)
+                reading['humidity'] = self.rng.uniform(15, 35)
             elif alert_type == 'ph':
-                reading['ph'] = np.random.choice([
-                    np.random.uniform(5.0, 5.8),
-                    np.random.uniform(7.8, 8.5)
+                reading['ph'] = self.rng.choice([
+                    self.rng.uniform(5.0, 5.8),
+                    self.rng.uniform(7.8, 8.5)
                 ])
             elif alert_type == 'nutrients':
-                reading['phosphorus'] = np.random.uniform(5, 12)
-                reading['potassium'] = np.random.uniform(80, 110)
+                reading['phosphorus'] = self.rng.uniform(5, 12)
+                reading['potassium'] = self.rng.uniform(80, 110)
 
         return reading
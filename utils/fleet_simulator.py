@@ -0,0 +1,206 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.data_generator import SensorDataGenerator
+from utils.rate_control import RateLimiter
+
+
+# Variação dos níveis base entre lotes: (média, desvio padrão, mínimo, máximo)
+LOT_BASE_LEVELS = {
+    'base_humidity': (50, 8, 25, 75),
+    'base_ph': (6.5, 0.3, 5.5, 7.8),
+    'base_phosphorus': (25, 5, 8, 45),
+    'base_potassium': (150, 20, 90, 230)
+}
+
+# Domínios das sementes derivadas (lotes e sensores nunca compartilham fluxos)
+_LOT_STREAM = 0
+_SENSOR_STREAM = 1
+
+
+def _generate_shard(simulator, sensor_ids, n_steps):
+    # Executa em um processo do pool, por isso é uma função de módulo
+    return simulator.generate_sensors(sensor_ids, n_steps)
+
+
+class FleetSimulator:
+    """
+    Simulador de uma frota de sensores distribuídos em vários lotes.
+
+    Cada lote sorteia seus próprios níveis base e cada sensor tem seu
+    próprio np.random.Generator, derivado de (seed, id do sensor) por
+    SeedSequence. Os dados de um sensor não dependem de quais outros
+    sensores são gerados junto, então o resultado é o mesmo para a mesma
+    semente com qualquer número de processos.
+    """
+
+    def __init__(self, n_lotes=10, sensors_per_lote=100, seed=42, start=None,
+                 frequency_minutes=1, chunk_steps=1440, first_id_lote=1, first_id_sensor=1):
+        """
+        Args:
+            n_lotes: número de lotes
+            sensors_per_lote: sensores em cada lote
+            seed: semente da frota
+            start: horário da primeira leitura (padrão: 01/01/2024 00:00,
+                   fixo para que a mesma semente gere os mesmos dados)
+            frequency_minutes: intervalo entre leituras de um sensor
+            chunk_steps: leituras de um sensor geradas por vez
+            first_id_lote, first_id_sensor: primeiros ids atribuídos
+        """
+        self.n_lotes = n_lotes
+        self.sensors_per_lote = sensors_per_lote
+        self.seed = seed
+        self.start = start or datetime(2024, 1, 1)
+        self.frequency_minutes = frequency_minutes
+        self.chunk_steps = chunk_steps
+
+        self.id_lotes = np.arange(first_id_lote, first_id_lote + n_lotes)
+        self.id_sensors = np.arange(first_id_sensor, first_id_sensor + n_lotes * sensors_per_lote)
+        self.sensor_lotes = np.repeat(self.id_lotes, sensors_per_lote)
+        self._lot_of_sensor = dict(zip(self.id_sensors.tolist(), self.sensor_lotes.tolist()))
+
+    @property
+    def n_sensors(self):
+        return len(self.id_sensors)
+
+    def _rng(self, stream, entity_id):
+        sequence = np.random.SeedSequence(self.seed, spawn_key=(stream, int(entity_id)))
+        return np.random.default_rng(sequence)
+
+    def lot_base_levels(self, id_lote):
+        """
+        Returns:
+            dict: níveis base do lote (atributos base_* de SensorDataGenerator)
+        """
+        rng = self._rng(_LOT_STREAM, id_lote)
+        return {name: float(np.clip(rng.normal(mean, std), low, high))
+                for name, (mean, std, low, high) in LOT_BASE_LEVELS.items()}
+
+    def sensor_generator(self, id_sensor):
+        """
+        Cria o SensorDataGenerator de um sensor, com seu próprio fluxo
+        aleatório e os níveis base do seu lote.
+        """
+        generator = SensorDataGenerator(rng=self._rng(_SENSOR_STREAM, id_sensor))
+        for name, value in self.lot_base_levels(self._lot_of_sensor[int(id_sensor)]).items():
+            setattr(generator, name, value)
+        return generator
+
+    def timestamps(self, first_step, n_steps):
+        start = pd.Timestamp(self.start) + pd.Timedelta(minutes=self.frequency_minutes * first_step)
+        return pd.date_range(start=start, periods=n_steps, freq=f'{self.frequency_minutes}min')
+
+    def _chunks(self, n_steps):
+        for first_step in range(0, n_steps, self.chunk_steps):
+            yield first_step, min(self.chunk_steps, n_steps - first_step)
+
+    def _sensor_chunk(self, generator, id_sensor, first_step, n_steps):
+        readings = generator._generate_readings(self.timestamps(first_step, n_steps))
+        readings.insert(0, 'id_lote', self._lot_of_sensor[int(id_sensor)])
+        readings.insert(0, 'id_sensor', int(id_sensor))
+        return readings
+
+    def generate_sensors(self, sensor_ids, n_steps):
+        """
+        Gera todas as leituras de alguns sensores.
+
+        Returns:
+            pandas.DataFrame: id_sensor, id_lote e as colunas de
+            SensorDataGenerator, ordenado por sensor e horário
+        """
+        parts = []
+        for id_sensor in sensor_ids:
+            generator = self.sensor_generator(id_sensor)
+            for first_step, steps in self._chunks(n_steps):
+                parts.append(self._sensor_chunk(generator, id_sensor, first_step, steps))
+        return pd.concat(parts, ignore_index=True)
+
+    def shards(self, sensors_per_shard):
+        """
+        Divide os sensores em fatias fixas (independentes do número de processos).
+        """
+        return [self.id_sensors[i:i + sensors_per_shard].tolist()
+                for i in range(0, self.n_sensors, sensors_per_shard)]
+
+    def generate(self, n_steps, n_workers=None, sensors_per_shard=100):
+        """
+        Gera as fatias da frota em paralelo.
+
+        Args:
+            n_steps: leituras por sensor
+            n_workers: processos do pool (padrão: todos os núcleos)
+            sensors_per_shard: sensores por fatia
+
+        Returns:
+            iterador de DataFrames, um por fatia, na ordem dos sensores
+        """
+        shards = self.shards(sensors_per_shard)
+        n_workers = n_workers or os.cpu_count() or 1
+
+        if n_workers == 1:
+            for sensor_ids in shards:
+                yield self.generate_sensors(sensor_ids, n_steps)
+            return
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            yield from executor.map(_generate_shard, [self] * len(shards), shards,
+                                    [n_steps] * len(shards))
+
+    def write(self, n_steps, output_dir, file_format='csv', n_workers=None, sensors_per_shard=100):
+        """
+        Grava a frota em arquivos, um por fatia.
+
+        Args:
+            file_format: 'csv' ou 'parquet' (exige pyarrow)
+
+        Returns:
+            list: caminhos dos arquivos gravados
+        """
+        if file_format not in ('csv', 'parquet'):
+            raise ValueError(f"Formato inválido: {file_format}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for i, shard in enumerate(self.generate(n_steps, n_workers, sensors_per_shard)):
+            path = os.path.join(output_dir, f'frota_{i:05d}.{file_format}')
+            if file_format == 'parquet':
+                shard.to_parquet(path, index=False)
+            else:
+                shard.to_csv(path, index=False)
+            paths.append(path)
+        return paths
+
+    def stream(self, n_steps, rate=None):
+        """
+        Emite as leituras da frota em ordem de horário (todos os sensores
+        de um instante antes do próximo), opcionalmente limitadas a uma
+        taxa. Os valores são os mesmos de generate.
+
+        Args:
+            n_steps: leituras por sensor
+            rate: leituras por segundo (None = sem limite)
+
+        Returns:
+            iterador de dicts de leitura
+        """
+        limiter = RateLimiter(rate) if rate else None
+        generators = {id_sensor: self.sensor_generator(id_sensor)
+                      for id_sensor in self.id_sensors.tolist()}
+
+        for first_step, steps in self._chunks(n_steps):
+            chunk = pd.concat([self._sensor_chunk(generator, id_sensor, first_step, steps)
+                               for id_sensor, generator in generators.items()],
+                              ignore_index=True)
+            # Ordem de emissão: horário, depois sensor. O pedaço fica em
+            # colunas e os dicts são criados um instante por vez (um por
+            # sensor), não para o pedaço inteiro
+            rows_by_step = np.arange(len(chunk)).reshape(len(generators), steps).T
+            for rows in rows_by_step:
+                for reading in chunk.take(rows).to_dict('records'):
+                    if limiter is not None:
+                        limiter.acquire()
+                    yield reading
@@ -0,0 +1,224 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.pump_policy import DEFAULT_PUMP_POLICY
+from models.rules import DEFAULT_THRESHOLDS
+from utils.fleet_simulator import LOT_BASE_LEVELS
+
+
+class IrrigationSimulator:
+    """
+    Simulação em malha fechada de muitos lotes ao longo de uma safra.
+
+    O estado de todos os lotes fica em arrays NumPy e cada passo avança
+    todos de uma vez: o modelo pontua as leituras de todos os lotes em uma
+    chamada, a política da bomba (PumpPolicy) decide quais irrigam e a
+    umidade, o pH e os nutrientes evoluem (evapotranspiração diurna, chuva,
+    irrigação, drenagem e diluição dos nutrientes).
+
+    Os sorteios aleatórios de cada passo não dependem das decisões da
+    bomba, então a mesma semente dá o mesmo clima para todas as políticas
+    comparadas.
+    """
+
+    def __init__(self, n_lots=1000, step_minutes=60, seed=42, thresholds=None,
+                 et_mm_day=(3.5, 6.5), mm_per_point=1.5, irrigation_rate=10.0,
+                 rain_probability=0.01, rain_mean_mm=10.0):
+        """
+        Args:
+            n_lots: número de lotes simulados
+            step_minutes: duração de um passo
+            seed: semente da simulação (níveis base, clima e ruído)
+            thresholds: limiares de umidade do relatório (padrão:
+                        DEFAULT_THRESHOLDS; usa humidity_low e humidity_critical)
+            et_mm_day: faixa da evapotranspiração média de cada lote (mm/dia)
+            mm_per_point: lâmina de água (mm) que corresponde a um ponto
+                          percentual de umidade
+            irrigation_rate: aumento da umidade por hora de bomba ligada
+                             (pontos/h; ~20 pontos em 2 h, como em
+                             SensorDataGenerator.simulate_irrigation_event)
+            rain_probability: probabilidade de chuva por hora em cada lote
+            rain_mean_mm: lâmina média de uma chuva (mm)
+        """
+        self.n_lots = n_lots
+        self.step_minutes = step_minutes
+        self.seed = seed
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.et_mm_day = et_mm_day
+        self.mm_per_point = mm_per_point
+        self.irrigation_rate = irrigation_rate
+        self.rain_probability = rain_probability
+        self.rain_mean_mm = rain_mean_mm
+
+        # Dinâmica do solo (por hora)
+        self.humidity_bounds = (5.0, 85.0)
+        self.drainage_rate = 0.1       # Fração do excesso acima de humidity_high drenada
+        self.nutrient_recovery = 0.01  # Retorno dos nutrientes ao nível base do lote
+        self.ph_recovery = 0.005
+        self.dilution_range = (0.975, 0.99)  # Diluição por hora de irrigação
+
+    @property
+    def step_hours(self):
+        return self.step_minutes / 60
+
+    def initial_state(self, rng):
+        """
+        Sorteia os níveis base e os parâmetros de cada lote.
+
+        Returns:
+            dict: arrays (n_lots,) do estado inicial
+        """
+        n = self.n_lots
+        base = {name: np.clip(rng.normal(mean, std, n), low, high)
+                for name, (mean, std, low, high) in LOT_BASE_LEVELS.items()}
+
+        return {
+            'humidity': base['base_humidity'].copy(),
+            'ph': base['base_ph'].copy(),
+            'phosphorus': base['base_phosphorus'].copy(),
+            'potassium': base['base_potassium'].copy(),
+            'base_ph': base['base_ph'],
+            'base_phosphorus': base['base_phosphorus'],
+            'base_potassium': base['base_potassium'],
+            'et_mm_day': rng.uniform(*self.et_mm_day, n),
+            'dilution': rng.uniform(*self.dilution_range, n),
+            'pump_on': np.zeros(n, dtype=bool)
+        }
+
+    def _et_weights(self, n_steps):
+        """
+        Peso da evapotranspiração em cada passo: zero à noite e uma senoide
+        durante o dia, com média 1 ao longo das 24 h.
+        """
+        hours = (np.arange(n_steps) * self.step_hours) % 24
+        return np.pi * np.maximum(0.0, np.sin(2 * np.pi * (hours - 6) / 24))
+
+    def run(self, model, policy=DEFAULT_PUMP_POLICY, days=120):
+        """
+        Simula uma safra.
+
+        Args:
+            model: IrrigationModel (ou objeto com predict_with_proba em lote)
+            policy: PumpPolicy aplicada a todos os lotes em cada passo
+            days: duração da safra
+
+        Returns:
+            dict: arrays (n_lots,) acumulados por lote ('water_mm',
+                  'pump_hours', 'below_low_hours', 'below_critical_hours',
+                  'pump_starts', 'final_humidity'), mais 'days',
+                  'n_steps' e 'runtime_s'
+        """
+        rng = np.random.default_rng(self.seed)
+        state = self.initial_state(rng)
+        n, dt = self.n_lots, self.step_hours
+        n_steps = int(round(days * 24 / dt))
+
+        humidity_low = self.thresholds['humidity_low']
+        humidity_critical = self.thresholds['humidity_critical']
+        humidity_high = self.thresholds['humidity_high']
+
+        # Fatores constantes de cada passo
+        et_points = state['et_mm_day'] / 24 * dt / self.mm_per_point
+        dilution = state['dilution'] ** dt
+        drainage = 1 - np.exp(-self.drainage_rate * dt)
+        nutrient_recovery = 1 - np.exp(-self.nutrient_recovery * dt)
+        ph_recovery = 1 - np.exp(-self.ph_recovery * dt)
+        rain_probability = 1 - (1 - self.rain_probability) ** dt
+        irrigation_points = self.irrigation_rate * dt
+        et_weights = self._et_weights(n_steps)
+
+        humidity, ph = state['humidity'], state['ph']
+        phosphorus, potassium = state['phosphorus'], state['potassium']
+        pump_on = state['pump_on']
+
+        totals = {
+            'water_mm': np.zeros(n),
+            'pump_hours': np.zeros(n),
+            'below_low_hours': np.zeros(n),
+            'below_critical_hours': np.zeros(n),
+            'pump_starts': np.zeros(n, dtype=np.int64)
+        }
+        X = np.empty((n, 4))
+
+        start = time.perf_counter()
+        for step in range(n_steps):
+            # Leitura atual de todos os lotes -> decisão da bomba
+            X[:, 0], X[:, 1], X[:, 2], X[:, 3] = humidity, ph, phosphorus, potassium
+            result = model.predict_with_proba(X)
+            new_pump = policy.step(pump_on, result['prediction'], result['probability'])
+            totals['pump_starts'] += new_pump & ~pump_on
+            pump_on = new_pump
+
+            totals['below_low_hours'] += (humidity < humidity_low) * dt
+            totals['below_critical_hours'] += (humidity < humidity_critical) * dt
+
+            # Sorteios do passo (mesma quantidade para qualquer decisão)
+            rain_mm = (rng.random(n) < rain_probability) * rng.exponential(self.rain_mean_mm, n)
+            ph_noise = rng.normal(0, 0.01, n)
+            ph_irrigation = rng.uniform(-0.05, 0.05, n)
+
+            # Umidade: evapotranspiração, chuva, irrigação e drenagem
+            humidity -= et_points * et_weights[step]
+            humidity += rain_mm / self.mm_per_point
+            humidity += pump_on * irrigation_points
+            humidity -= np.maximum(0.0, humidity - humidity_high) * drainage
+            np.clip(humidity, *self.humidity_bounds, out=humidity)
+
+            # Nutrientes: diluídos pela irrigação, recuperam o nível base
+            pump_dilution = np.where(pump_on, dilution, 1.0)
+            phosphorus *= pump_dilution
+            potassium *= pump_dilution
+            phosphorus += (state['base_phosphorus'] - phosphorus) * nutrient_recovery
+            potassium += (state['base_potassium'] - potassium) * nutrient_recovery
+
+            # pH: pequena variação na irrigação e retorno ao nível base
+            ph += ph_noise + pump_on * ph_irrigation
+            ph += (state['base_ph'] - ph) * ph_recovery
+            np.clip(ph, 5.5, 8.0, out=ph)
+
+            totals['water_mm'] += pump_on * irrigation_points * self.mm_per_point
+            totals['pump_hours'] += pump_on * dt
+
+        return {
+            **totals,
+            'final_humidity': humidity.copy(),
+            'days': days,
+            'n_steps': n_steps,
+            'runtime_s': time.perf_counter() - start
+        }
+
+    @staticmethod
+    def summarize(result):
+        """
+        Resume uma simulação em médias por lote.
+
+        Returns:
+            dict: lâmina de água (mm e m³/ha), horas de bomba, partidas por
+                  dia e fração do tempo abaixo dos limiares de umidade
+        """
+        season_hours = result['days'] * 24
+        return {
+            'water_mm': float(result['water_mm'].mean()),
+            'water_m3_per_ha': float(result['water_mm'].mean() * 10),
+            'pump_hours': float(result['pump_hours'].mean()),
+            'pump_starts_per_day': float(result['pump_starts'].mean() / result['days']),
+            'below_low_pct': float(result['below_low_hours'].mean() / season_hours * 100),
+            'below_critical_pct': float(result['below_critical_hours'].mean() / season_hours * 100),
+            'runtime_s': result['runtime_s']
+        }
+
+    def compare(self, model, policies, days=120):
+        """
+        Simula a mesma safra (mesma semente) com cada política.
+
+        Returns:
+            pandas.DataFrame: uma linha de summarize por política
+        """
+        rows = []
+        for policy in policies:
+            summary = self.summarize(self.run(model, policy, days))
+            rows.append({'on_threshold': policy.on_threshold,
+                         'off_threshold': policy.off_threshold, **summary})
+        return pd.DataFrame(rows)
@@ -0,0 +1,55 @@
+import os
+import sys
+
+
+def current_rss_bytes():
+    """
+    Memória residente (RSS) atual do processo.
+
+    Returns:
+        int: RSS em bytes, ou None se a plataforma não expuser a informação
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # Sem /proc, usa o pico de RSS (KB no Linux, bytes no macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def proportional_set_size_bytes():
+    """
+    Memória proporcional (PSS) do processo: páginas compartilhadas entre
+    processos (ex.: arquivos mapeados em memória) são divididas entre eles.
+
+    Returns:
+        int: PSS em bytes, ou None fora do Linux
+    """
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def file_size_bytes(path):
+    """
+    Tamanho em disco de um arquivo ou diretório (soma dos arquivos).
+    """
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    return os.path.getsize(path)
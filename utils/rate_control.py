@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Controla a taxa de emissão de itens (leituras/s).
+
+    Cada item tem um horário agendado (início + itens_emitidos / taxa);
+    acquire espera até esse horário. Quando o consumidor atrasa, nada é
+    descartado: o atraso em relação à agenda fica registrado em lag e os
+    itens seguintes são liberados sem espera até recuperar.
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate: taxa alvo em itens por segundo
+        """
+        if rate <= 0:
+            raise ValueError("A taxa deve ser positiva")
+
+        self.rate = float(rate)
+        self.count = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._start = None
+
+    def _delay(self, n):
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+
+        delay = self._start + self.count / self.rate - now
+        self.lag = max(0.0, -delay)
+        self.max_lag = max(self.max_lag, self.lag)
+        self.count += n
+        return delay
+
+    def acquire(self, n=1):
+        """
+        Bloqueia até que n itens possam ser emitidos.
+        """
+        delay = self._delay(n)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, n=1):
+        """
+        Versão assíncrona de acquire.
+        """
+        delay = self._delay(n)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self):
+        """
+        Returns:
+            dict: taxa alvo, taxa obtida, itens emitidos e atraso (s)
+        """
+        elapsed = time.perf_counter() - self._start if self._start is not None else 0.0
+        return {
+            'target_rate': self.rate,
+            'achieved_rate': self.count / elapsed if elapsed > 0 else 0.0,
+            'count': self.count,
+            'lag_s': self.lag,
+            'max_lag_s': self.max_lag
+        }
@@ -0,0 +1,229 @@
+import asyncio
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from models.training_data import leitura_solo_features, RAW_CAPTURE_SCALE
+from utils.streaming import stamp_received
+
+
+REPLAY_COLUMNS = ['id_sensor', 'timestamp', 'humidity', 'ph', 'phosphorus', 'potassium']
+
+# Colunas do CSV exportado do ESP32 (scripts/dados_leituras.csv)
+CSV_COLUMNS = {
+    'fosforo_ok': 'Fósforo_OK',
+    'potassio_ok': 'Potássio_OK',
+    'ph': 'pH',
+    'umidade': 'Umidade'
+}
+
+# Colunas de horário aceitas no CSV, quando a captura as tiver
+CSV_TIMESTAMP_COLUMNS = ('Data_Hora', 'data_hora', 'timestamp')
+
+LEITURA_SOLO_REPLAY_QUERY = """
+    SELECT
+        id_sensor,
+        data_hora,
+        umidade::float8,
+        ph::float8,
+        fosforo_ok::int,
+        potassio_ok::int
+    FROM leitura_solo
+    WHERE (%(id_sensor)s IS NULL OR id_sensor = %(id_sensor)s)
+      AND (%(inicio)s IS NULL OR data_hora >= %(inicio)s)
+      AND (%(fim)s IS NULL OR data_hora < %(fim)s)
+    ORDER BY data_hora, id_leitura_solo
+    LIMIT %(limit)s
+"""
+
+
+def _replay_frame(id_sensor, timestamp, umidade, ph, fosforo_ok, potassio_ok, scale):
+    X, valid = leitura_solo_features(umidade, ph, fosforo_ok, potassio_ok, scale=scale)
+    readings = pd.DataFrame(X, columns=REPLAY_COLUMNS[2:])
+    readings.insert(0, 'timestamp', pd.to_datetime(pd.Series(timestamp))[valid].reset_index(drop=True))
+    readings.insert(0, 'id_sensor', np.asarray(id_sensor)[valid])
+    return readings
+
+
+def load_csv_readings(filepath, id_sensor=1, scale=RAW_CAPTURE_SCALE, encoding='latin1'):
+    """
+    Carrega uma captura do ESP32 no formato de scripts/dados_leituras.csv.
+
+    O CSV traz pH e umidade multiplicados por 100 e fósforo/potássio apenas
+    como Sim/Não; os nutrientes viram os valores representativos de
+    leitura_solo_features, como no treino com o histórico real.
+
+    Args:
+        filepath: caminho do CSV (separado por ';')
+        id_sensor: sensor atribuído às leituras
+        scale: divisor de pH e umidade (None = detecção por linha, ver
+               normalize_leitura_solo)
+        encoding: codificação do arquivo
+
+    Returns:
+        pandas.DataFrame: colunas de REPLAY_COLUMNS; timestamp é NaT quando
+                          o arquivo não tem coluna de horário
+    """
+    data = pd.read_csv(filepath, sep=';', encoding=encoding)
+    timestamp_column = next((c for c in CSV_TIMESTAMP_COLUMNS if c in data.columns), None)
+    timestamp = data[timestamp_column] if timestamp_column else [pd.NaT] * len(data)
+
+    def number(column):
+        return pd.to_numeric(data[column].astype(str).str.replace(',', '.'))
+
+    def flag(column):
+        return data[column].astype(str).str.strip().str.lower() == 'sim'
+
+    return _replay_frame([id_sensor] * len(data), timestamp, number(CSV_COLUMNS['umidade']),
+                         number(CSV_COLUMNS['ph']), flag(CSV_COLUMNS['fosforo_ok']),
+                         flag(CSV_COLUMNS['potassio_ok']), scale)
+
+
+def load_leitura_solo_readings(db, id_sensor=None, inicio=None, fim=None, limit=1_000_000,
+                               scale=None):
+    """
+    Carrega leituras gravadas na tabela leitura_solo, em ordem de horário.
+
+    Args:
+        db: DatabaseManager conectado
+        id_sensor: restringe a um sensor
+        inicio, fim: intervalo [inicio, fim) de data_hora
+        limit: máximo de leituras
+        scale: divisor de pH e umidade (padrão: detecta por linha as
+               capturas importadas sem conversão, ver normalize_leitura_solo)
+
+    Returns:
+        pandas.DataFrame: colunas de REPLAY_COLUMNS
+    """
+    params = {'id_sensor': id_sensor, 'inicio': inicio, 'fim': fim, 'limit': limit}
+    rows = db.execute_query(LEITURA_SOLO_REPLAY_QUERY, params).fetchall()
+    if not rows:
+        return pd.DataFrame(columns=REPLAY_COLUMNS)
+
+    id_sensor, timestamp, umidade, ph, fosforo_ok, potassio_ok = zip(*rows)
+    return _replay_frame(id_sensor, timestamp, umidade, ph, fosforo_ok, potassio_ok, scale)
+
+
+class ReplayStream:
+    """
+    Reproduz leituras gravadas com a mesma interface de ReadingStream
+    (iteração síncrona ou assíncrona de lotes e stats()), para alimentar
+    pump/run_stream e o mesmo ReadingPipeline das leituras ao vivo.
+
+    Com horários, cada leitura é liberada no seu instante original
+    dividido pela velocidade (1 = tempo real, N = N vezes mais rápido),
+    preservando os intervalos entre chegadas; sem horários, as leituras
+    são espaçadas por interval_s. Com speed=None não há espera.
+    """
+
+    def __init__(self, readings, speed=1.0, batch_size=1, interval_s=1.0, loops=1):
+        """
+        Args:
+            readings: DataFrame com as colunas de REPLAY_COLUMNS
+            speed: fator de aceleração (None = sem limite)
+            batch_size: leituras por lote; um lote é liberado quando a sua
+                        última leitura é devida
+            interval_s: intervalo entre leituras sem horário
+            loops: repetições da gravação (para cargas mais longas)
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("A velocidade deve ser positiva")
+
+        self.readings = readings.reset_index(drop=True)
+        self.speed = speed
+        self.batch_size = batch_size
+        self.loops = loops
+
+        timestamps = pd.to_datetime(self.readings['timestamp'])
+        if len(timestamps) and timestamps.notna().all():
+            offsets = (timestamps - timestamps.iloc[0]).dt.total_seconds().to_numpy()
+            # Horários fora de ordem não voltam a agenda
+            offsets = np.maximum.accumulate(offsets)
+            self.recorded_timestamps = True
+        else:
+            offsets = np.arange(len(self.readings)) * float(interval_s)
+            self.recorded_timestamps = False
+
+        self.offsets = offsets
+        # Duração de uma repetição; a seguinte começa um intervalo depois
+        self.span = offsets[-1] + interval_s if len(offsets) else 0.0
+
+        self.emitted = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._start = None
+
+    @property
+    def n_readings(self):
+        return len(self.readings) * self.loops
+
+    @property
+    def recorded_rate(self):
+        """
+        Taxa da gravação em tempo real (leituras/s).
+        """
+        return float(len(self.readings) / self.span) if self.span > 0 else None
+
+    def _batches(self):
+        records = self.readings.to_dict('records')
+        for loop in range(self.loops):
+            for start in range(0, len(records), self.batch_size):
+                end = min(start + self.batch_size, len(records))
+                batch = []
+                for record in records[start:end]:
+                    reading = dict(record)
+                    if pd.isna(reading['timestamp']):
+                        reading['timestamp'] = datetime.now()
+                    else:
+                        reading['timestamp'] = reading['timestamp'].to_pydatetime()
+                    batch.append(reading)
+                yield loop * self.span + self.offsets[end - 1], batch
+
+    def _delay(self, offset, n):
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+        self.emitted += n
+        if self.speed is None:
+            return 0.0
+
+        delay = self._start + offset / self.speed - now
+        self.lag = max(0.0, -delay)
+        self.max_lag = max(self.max_lag, self.lag)
+        return delay
+
+    def __iter__(self):
+        self._start = None
+        for offset, batch in self._batches():
+            delay = self._delay(offset, len(batch))
+            if delay > 0:
+                time.sleep(delay)
+            yield stamp_received(batch)
+
+    async def __aiter__(self):
+        self._start = None
+        for offset, batch in self._batches():
+            delay = self._delay(offset, len(batch))
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield stamp_received(batch)
+
+    def stats(self):
+        """
+        Returns:
+            dict: leituras emitidas, taxa alvo e obtida (leituras/s) e
+                  atraso em relação à agenda (s), como em ReadingStream
+        """
+        elapsed = time.perf_counter() - self._start if self._start is not None else 0.0
+        recorded_rate = self.recorded_rate
+        return {
+            'emitted': self.emitted,
+            'speed': self.speed,
+            'target_rate': (recorded_rate * self.speed
+                            if recorded_rate is not None and self.speed is not None else None),
+            'achieved_rate': self.emitted / elapsed if elapsed > 0 else 0.0,
+            'lag_s': self.lag,
+            'max_lag_s': self.max_lag
+        }
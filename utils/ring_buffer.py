@@ -0,0 +1,214 @@
+import numbers
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+# Campos numéricos guardados em colunas (ver SensorDataGenerator.generate_current_reading)
+NUMERIC_FIELDS = ('humidity', 'ph', 'phosphorus', 'potassium', 'temperature', 'light_intensity')
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(timestamp):
+    """
+    Converte um horário (datetime ou string ISO, sem fuso) em microssegundos
+    desde 01/01/1970.
+    """
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(epoch_us):
+    """
+    Inverso de to_epoch_us.
+    """
+    return _EPOCH + timedelta(microseconds=int(epoch_us))
+
+
+class ReadingRingBuffer:
+    """
+    Buffer circular colunar de leituras com capacidade fixa.
+
+    Cada campo numérico é um array float64 e o horário é um array int64
+    (microssegundos desde a época). Cada leitura é gravada duas vezes, nas
+    posições p e p + capacity de arrays com o dobro da capacidade, de modo
+    que as últimas n leituras sempre formam uma fatia contígua: janelas
+    são views, sem cópia, e inserção e descarte são O(1).
+
+    Campos não numéricos (ou fora de fields) ficam em um dict por posição,
+    usado apenas pela visão de lista de dicts (records). Horários recebidos
+    como string também são guardados como vieram, para que records devolva
+    o mesmo texto lido ou gravado no JSON.
+    """
+
+    def __init__(self, capacity=1000, fields=NUMERIC_FIELDS):
+        """
+        Args:
+            capacity: número máximo de leituras mantidas
+            fields: campos numéricos guardados em colunas
+        """
+        if capacity <= 0:
+            raise ValueError("A capacidade deve ser positiva")
+
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._columns = {name: np.full(2 * capacity, np.nan) for name in self.fields}
+        self._column_keys = {'timestamp', *self.fields}
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._extras = [None] * capacity
+        self._keys = [None] * capacity
+        self._timestamp_text = [None] * capacity
+        self._key_orders = {}
+
+        self._head = 0            # Próxima posição a gravar
+        self._size = 0
+        self._appended = 0        # Total de leituras já inseridas
+        self._last_inversion = -1  # Índice da última leitura fora de ordem
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self._appended = 0
+        self._last_inversion = -1
+        self._extras = [None] * self.capacity
+        self._keys = [None] * self.capacity
+        self._timestamp_text = [None] * self.capacity
+
+    def append(self, reading):
+        """
+        Insere uma leitura (dict), descartando a mais antiga se o buffer
+        estiver cheio.
+        """
+        timestamp = reading.get('timestamp')
+        epoch_us = to_epoch_us(timestamp if timestamp is not None else datetime.now())
+
+        p, q = self._head, self._head + self.capacity
+        if self._size and epoch_us < self._timestamps[q - 1]:
+            self._last_inversion = self._appended
+        self._timestamps[p] = self._timestamps[q] = epoch_us
+        self._timestamp_text[p] = timestamp if isinstance(timestamp, str) else None
+
+        extras = {}
+        for name, column in self._columns.items():
+            value = reading.get(name)
+            if type(value) is float or (isinstance(value, numbers.Real)
+                                        and not isinstance(value, bool)):
+                column[p] = column[q] = value
+            else:
+                column[p] = column[q] = np.nan
+                if name in reading:
+                    extras[name] = value
+        for key in reading.keys() - self._column_keys:
+            extras[key] = reading[key]
+
+        # A ordem das chaves é compartilhada entre leituras com o mesmo formato
+        keys = tuple(reading)
+        self._keys[p] = self._key_orders.setdefault(keys, keys)
+        self._extras[p] = extras or None
+
+        self._head = (p + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self._appended += 1
+
+    def extend(self, readings):
+        for reading in readings:
+            self.append(reading)
+
+    @property
+    def is_ordered(self):
+        """
+        True se os horários das leituras no buffer não decrescem.
+        """
+        return self._last_inversion < self._appended - self._size + 1
+
+    def _window(self, since=None):
+        """
+        Fatia (início, fim) dos arrays duplicados com as leituras a partir
+        de since (horário em microssegundos), na ordem de inserção.
+        """
+        end = self._head + self.capacity
+        start = end - self._size
+        if since is not None and self._size:
+            start += int(np.searchsorted(self._timestamps[start:end], since, side='left'))
+        return start, end
+
+    def view(self, since=None):
+        """
+        Colunas das leituras a partir de um horário.
+
+        Com horários em ordem, os arrays devolvidos são views do buffer
+        (somente leitura, válidas até a próxima inserção); caso contrário,
+        são cópias filtradas e ordenadas por horário.
+
+        Args:
+            since: datetime, string ISO ou None (todas as leituras)
+
+        Returns:
+            dict: {'timestamp': int64 (µs), campo: float64}
+        """
+        since_us = to_epoch_us(since) if since is not None else None
+
+        if self.is_ordered:
+            start, end = self._window(since_us)
+            columns = {'timestamp': self._timestamps[start:end]}
+            columns.update({name: values[start:end] for name, values in self._columns.items()})
+            for values in columns.values():
+                values.flags.writeable = False
+            return columns
+
+        start, end = self._window()
+        timestamps = self._timestamps[start:end]
+        order = np.argsort(timestamps, kind='stable')
+        if since_us is not None:
+            order = order[timestamps[order] >= since_us]
+        columns = {'timestamp': timestamps[order]}
+        columns.update({name: values[start:end][order] for name, values in self._columns.items()})
+        return columns
+
+    def records(self, since=None):
+        """
+        Visão de compatibilidade: leituras como lista de dicts, com o
+        horário em string ISO (formato gravado no JSON do SensorData).
+
+        Horários inseridos como string voltam com o texto original; os
+        inseridos como datetime (ou ausentes) são gerados por isoformat(),
+        que omite os microssegundos quando são zero.
+
+        Args:
+            since: datetime, string ISO ou None (todas as leituras)
+
+        Returns:
+            list: dicts de leitura, na ordem de inserção
+        """
+        since_us = to_epoch_us(since) if since is not None else None
+        start, end = self._window()
+
+        timestamps = self._timestamps[start:end].tolist()
+        columns = {name: values[start:end].tolist() for name, values in self._columns.items()}
+
+        records = []
+        for i, epoch_us in enumerate(timestamps):
+            if since_us is not None and epoch_us < since_us:
+                continue
+            p = (start + i) % self.capacity
+            extras = self._extras[p] or {}
+            text = self._timestamp_text[p] or from_epoch_us(epoch_us).isoformat()
+
+            record = {}
+            for key in self._keys[p]:
+                if key == 'timestamp':
+                    record[key] = text
+                elif key in extras:
+                    record[key] = extras[key]
+                else:
+                    record[key] = columns[key][i]
+            if 'timestamp' not in record:
+                record['timestamp'] = text
+            records.append(record)
+        return records
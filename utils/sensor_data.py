@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 import json
 import os
 
+from utils.ring_buffer import ReadingRingBuffer, NUMERIC_FIELDS
+
 
 class SensorData:
     """
@@ -11,11 +13,30 @@ class SensorData:
     recuperação e análise de dados históricos.
     """
 
+    # Leituras mantidas no histórico
+    MAX_READINGS = 1000
+
     def __init__(self, data_file="sensor_data.json"):
         self.data_file = data_file
         self.current_session_data = []
+        # Histórico em colunas (buffer circular); historical_data é a visão
+        # de lista de dicts
+        self.readings = ReadingRingBuffer(capacity=self.MAX_READINGS)
         self.load_data()
 
+    @property
+    def historical_data(self):
+        """
+        Histórico de leituras como lista de dicts (cópia; use add_sensor_reading
+        para inserir).
+        """
+        return self.readings.records()
+
+    @historical_data.setter
+    def historical_data(self, readings):
+        self.readings.clear()
+        self.readings.extend(readings[-self.MAX_READINGS:])
+
     def load_data(self):
         """
         Carrega dados históricos do arquivo.
@@ -69,13 +90,10 @@ class SensorData:
         if isinstance(reading.get('timestamp'), datetime):
             reading['timestamp'] = reading['timestamp'].isoformat()
 
-        self.historical_data.append(reading)
+        # O buffer descarta a leitura mais antiga quando cheio (O(1))
+        self.readings.append(reading)
         self.current_session_data.append(reading)
 
-        # Manter apenas os últimos 1000 registros
-        if len(self.historical_data) > 1000:
-            self.historical_data = self.historical_data[-1000:]
-
     def add_irrigation_event(self, event_type, details=None):
         """
         Registra um evento de irrigação.
@@ -129,17 +147,7 @@ class SensorData:
             list: dados dos sensores das últimas N horas
         """
         cutoff_time = datetime.now() - timedelta(hours=hours)
-
-        recent_data = []
-        for reading in self.historical_data:
-            timestamp = reading['timestamp']
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp)
-
-            if timestamp >= cutoff_time:
-                recent_data.append(reading)
-
-        return recent_data
+        return self.readings.records(since=cutoff_time)
 
     def get_sensor_statistics(self, hours=24):
         """
@@ -151,30 +159,25 @@ class SensorData:
         Returns:
             dict: estatísticas dos sensores
         """
-        recent_data = self.get_recent_data(hours)
-
-        if not recent_data:
-            return {}
-
-        df = pd.DataFrame(recent_data)
-
-        # Converter colunas numéricas
-        numeric_columns = ['humidity', 'ph', 'phosphorus', 'potassium']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        # Janela sem cópia sobre as colunas do buffer
+        window = self.readings.view(since=datetime.now() - timedelta(hours=hours))
 
         statistics = {}
 
-        for col in numeric_columns:
-            if col in df.columns:
-                statistics[col] = {
-                    'mean': float(df[col].mean()),
-                    'min': float(df[col].min()),
-                    'max': float(df[col].max()),
-                    'std': float(df[col].std()),
-                    'median': float(df[col].median())
-                }
+        for col in ['humidity', 'ph', 'phosphorus', 'potassium']:
+            values = window[col]
+            # Valores ausentes ou não numéricos ficam como NaN e são ignorados
+            valid = values[~np.isnan(values)]
+            if len(valid) == 0:
+                continue
+
+            statistics[col] = {
+                'mean': float(valid.mean()),
+                'min': float(valid.min()),
+                'max': float(valid.max()),
+                'std': float(valid.std(ddof=1)) if len(valid) > 1 else float('nan'),
+                'median': float(np.median(valid))
+            }
 
         return statistics
 
@@ -244,20 +247,31 @@ class SensorData:
         Returns:
             dict: análise de tendência
         """
-        recent_data = self.get_recent_data(hours)
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+
+        if parameter in NUMERIC_FIELDS:
+            # Janela sem cópia, já ordenada por horário
+            values = self.readings.view(since=cutoff_time)[parameter]
+            if len(values) < 2:
+                return {'trend': 'insufficient_data', 'change': 0}
+            if np.isnan(values).all():
+                return {'trend': 'parameter_not_found', 'change': 0}
+        else:
+            recent_data = self.readings.records(since=cutoff_time)
 
-        if not recent_data or len(recent_data) < 2:
-            return {'trend': 'insufficient_data', 'change': 0}
+            if not recent_data or len(recent_data) < 2:
+                return {'trend': 'insufficient_data', 'change': 0}
 
-        df = pd.DataFrame(recent_data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp')
+            df = pd.DataFrame(recent_data)
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df = df.sort_values('timestamp')
 
-        if parameter not in df.columns:
-            return {'trend': 'parameter_not_found', 'change': 0}
+            if parameter not in df.columns:
+                return {'trend': 'parameter_not_found', 'change': 0}
+
+            values = df[parameter].values
 
         # Calcular tendência linear
-        values = df[parameter].values
         x = np.arange(len(values))
 
         # Regressão linear simples
@@ -336,10 +350,7 @@ class SensorData:
         cutoff_time = datetime.now() - timedelta(days=days)
 
         # Filtrar dados históricos
-        self.historical_data = [
-            reading for reading in self.historical_data
-            if datetime.fromisoformat(reading['timestamp']) >= cutoff_time
-        ]
+        self.historical_data = self.readings.records(since=cutoff_time)
 
         # Filtrar eventos de irrigação
         self.irrigation_events = [
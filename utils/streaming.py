@@ -0,0 +1,345 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from models.rules import DEFAULT_RULES_ENGINE, FEATURES, STATUS_LABELS
+from utils.rate_control import RateLimiter
+
+
+# Chave com o instante de chegada da leitura (time.perf_counter), marcada
+# pela fonte ao emitir o lote; ReadingPipeline a usa para medir a latência
+# ponta a ponta e os destinos a removem antes de armazenar a leitura
+RECEIVED_AT = 'received_at'
+
+
+def stamp_received(batch):
+    """
+    Marca o instante de chegada em todas as leituras de um lote.
+    """
+    now = time.perf_counter()
+    for reading in batch:
+        reading[RECEIVED_AT] = now
+    return batch
+
+
+class ReadingStream:
+    """
+    Fluxo de leituras de N sensores a partir de um SensorDataGenerator.
+
+    Cada rodada gera uma leitura por sensor em uma única chamada vetorizada
+    e a entrega em lotes de batch_size. Com rate, os lotes são liberados na
+    taxa agregada alvo (leituras/s). O fluxo é puxado pelo consumidor: se
+    ele atrasa, nada é descartado e o atraso aparece em stats() (lag).
+    """
+
+    def __init__(self, generator, n_sensors=1, rate=None, batch_size=None, max_readings=None):
+        """
+        Args:
+            generator: SensorDataGenerator
+            n_sensors: número de sensores simulados (id_sensor 1..N)
+            rate: taxa agregada alvo em leituras/s (None = sem limite)
+            batch_size: leituras por lote (padrão: n_sensors)
+            max_readings: encerra após este número de leituras (None = infinito)
+        """
+        self.generator = generator
+        self.n_sensors = n_sensors
+        self.batch_size = batch_size or n_sensors
+        self.max_readings = max_readings
+        self.limiter = RateLimiter(rate) if rate else None
+
+        self.emitted = 0
+        self._start = None
+
+    def _batches(self):
+        sensor_ids = np.arange(1, self.n_sensors + 1)
+        while self.max_readings is None or self.emitted < self.max_readings:
+            now = datetime.now()
+            readings = self.generator._generate_readings(pd.DatetimeIndex([now] * self.n_sensors))
+            readings.insert(0, 'id_sensor', sensor_ids)
+            records = readings.to_dict('records')
+            for record in records:
+                record['timestamp'] = now
+
+            for start in range(0, len(records), self.batch_size):
+                batch = records[start:start + self.batch_size]
+                if self.max_readings is not None:
+                    batch = batch[:self.max_readings - self.emitted]
+                    if not batch:
+                        return
+                self.emitted += len(batch)
+                yield batch
+
+    def __iter__(self):
+        self._start = time.perf_counter()
+        for batch in self._batches():
+            if self.limiter is not None:
+                self.limiter.acquire(len(batch))
+            yield stamp_received(batch)
+
+    async def __aiter__(self):
+        self._start = time.perf_counter()
+        for batch in self._batches():
+            if self.limiter is not None:
+                await self.limiter.acquire_async(len(batch))
+            yield stamp_received(batch)
+
+    def stats(self):
+        """
+        Returns:
+            dict: leituras emitidas, taxa alvo e obtida (leituras/s) e
+                  atraso em relação à agenda (s)
+        """
+        elapsed = time.perf_counter() - self._start if self._start is not None else 0.0
+        limiter = self.limiter.stats() if self.limiter is not None else {}
+        return {
+            'emitted': self.emitted,
+            'target_rate': limiter.get('target_rate'),
+            'achieved_rate': self.emitted / elapsed if elapsed > 0 else 0.0,
+            'lag_s': limiter.get('lag_s', 0.0),
+            'max_lag_s': limiter.get('max_lag_s', 0.0)
+        }
+
+
+class SensorDataSink:
+    """
+    Destino que registra cada leitura em um SensorData.
+    """
+
+    def __init__(self, sensor_data):
+        self.sensor_data = sensor_data
+
+    def __call__(self, batch):
+        for reading in batch:
+            reading.pop(RECEIVED_AT, None)
+            self.sensor_data.add_sensor_reading(reading)
+
+
+class ReadingPipeline:
+    """
+    Caminho de processamento de uma leitura recebida: predição do modelo,
+    alertas do motor de regras e registro no SensorData (leitura e
+    alertas), tudo por lote.
+
+    Serve de destino para pump/run_stream tanto para o fluxo sintético
+    (ReadingStream) quanto para a reprodução de leituras gravadas
+    (utils/replay.py). A latência de cada leitura é medida da chegada
+    (RECEIVED_AT) até o fim do processamento do seu lote.
+
+    Com um DriftMonitor, cada lote também entra na janela ao vivo do
+    monitor; com a janela cheia, a deriva é verificada a cada
+    drift_check_every leituras e features que passam a derivar geram um
+    alerta do sistema.
+    """
+
+    def __init__(self, model, sensor_data=None, rules_engine=None,
+                 thresholds=None, latency_window=100_000, drift_monitor=None,
+                 drift_check_every=100):
+        """
+        Args:
+            model: IrrigationModel ou InferenceClient
+            sensor_data: SensorData onde leituras e alertas são registrados
+                         (None = apenas pontua)
+            rules_engine: motor de regras dos alertas (padrão: o da cultura
+                          do IrrigationModel; DEFAULT_RULES_ENGINE para um
+                          InferenceClient)
+            thresholds: limiares que substituem os do motor
+            latency_window: latências guardadas para os percentis
+            drift_monitor: DriftMonitor das features de entrada (opcional)
+            drift_check_every: leituras entre verificações de deriva
+        """
+        self.model = model
+        self.sensor_data = sensor_data
+        if rules_engine is None:
+            # InferenceClient não tem perfil de cultura
+            rules_engine = getattr(model, 'rules_engine', DEFAULT_RULES_ENGINE)
+        self.rules_engine = rules_engine
+        self.thresholds = thresholds
+        self.drift_monitor = drift_monitor
+        self.drift_check_every = drift_check_every
+        self.drifted_features = []
+        self._next_drift_check = 0
+
+        self.n_readings = 0
+        self.n_batches = 0
+        self.n_alerts = 0
+        self.n_irrigate = 0
+        self.processing_time = 0.0
+        self.latencies = deque(maxlen=latency_window)
+
+    def __call__(self, batch):
+        start = time.perf_counter()
+        received = [reading.pop(RECEIVED_AT, None) for reading in batch]
+
+        X = np.array([[reading[name] for name in FEATURES] for reading in batch], dtype=float)
+        result = self.model.predict_with_proba(X)
+        alerts = self.rules_engine.rule_masks(X, 'alert', self.thresholds)
+        if self.drift_monitor is not None:
+            self.drift_monitor.update_batch(X)
+
+        prediction = np.asarray(result['prediction']).tolist()
+        probability = np.asarray(result['probability']).tolist()
+        for i, reading in enumerate(batch):
+            reading['irrigation_prediction'] = prediction[i]
+            reading['irrigation_probability'] = probability[i]
+            if self.sensor_data is not None:
+                self.sensor_data.add_sensor_reading(reading)
+                for message in self.rules_engine.messages('alert', alerts[i]):
+                    self.sensor_data.add_system_alert('sensor', message)
+
+        end = time.perf_counter()
+        self.latencies.extend(end - t for t in received if t is not None)
+        self.processing_time += end - start
+        self.n_readings += len(batch)
+        self.n_batches += 1
+        self.n_alerts += int(alerts.sum())
+        self.n_irrigate += int(np.sum(prediction))
+
+        if self.drift_monitor is not None and self.n_readings >= self._next_drift_check:
+            self._check_drift()
+
+    def _check_drift(self):
+        """
+        Atualiza drifted_features (apenas com a janela do monitor cheia) e
+        registra um alerta para as features que passaram a derivar.
+        """
+        self._next_drift_check = self.n_readings + self.drift_check_every
+        if self.drift_monitor.n_live < self.drift_monitor.window_size:
+            return
+
+        drifted = self.drift_monitor.drifted_features()
+        new = [name for name in drifted if name not in self.drifted_features]
+        self.drifted_features = drifted
+        if new and self.sensor_data is not None:
+            self.sensor_data.add_system_alert(
+                'modelo', f"Deriva nas features de entrada: {', '.join(new)}")
+
+    def stats(self):
+        """
+        Returns:
+            dict: totais, tempo de processamento, latência ponta a ponta
+                  p50/p99/máxima (ms) e features com deriva (None sem
+                  drift_monitor)
+        """
+        latencies = np.array(self.latencies) * 1000
+        return {
+            'readings': self.n_readings,
+            'batches': self.n_batches,
+            'alerts': self.n_alerts,
+            'irrigate': self.n_irrigate,
+            'processing_time_s': self.processing_time,
+            'latency_p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+            'latency_p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else None,
+            'latency_max_ms': float(latencies.max()) if len(latencies) else None,
+            'drifted_features': list(self.drifted_features) if self.drift_monitor else None
+        }
+
+
+class LeituraSoloSink:
+    """
+    Destino que grava os lotes na tabela leitura_solo com um INSERT em
+    lote (DatabaseManager.insert_leituras_solo). Os status e a irrigação
+    são derivados pelo motor de regras (models/rules.py).
+    """
+
+    def __init__(self, db, sensor_ids=None):
+        """
+        Args:
+            db: DatabaseManager conectado
+            sensor_ids: ids reais de sensor, indexados pelo id simulado
+                        (1..N); se None, usa o id simulado
+        """
+        self.db = db
+        self.sensor_ids = sensor_ids
+
+    def rows(self, batch):
+        """
+        Converte um lote de leituras nas tuplas de insert_leituras_solo.
+        """
+        readings = pd.DataFrame(batch)
+        status = DEFAULT_RULES_ENGINE.status_codes(readings)
+        normal = STATUS_LABELS.index('NORMAL')
+        dry = np.isin(status['humidity'], [STATUS_LABELS.index('CRÍTICO'), STATUS_LABELS.index('BAIXO')])
+
+        ids = readings['id_sensor'].to_numpy()
+        if self.sensor_ids is not None:
+            ids = np.asarray(self.sensor_ids)[ids - 1]
+
+        return list(zip(
+            ids.tolist(),
+            [reading['timestamp'] for reading in batch],
+            (status['phosphorus'] != STATUS_LABELS.index('BAIXO')).tolist(),
+            (status['potassium'] != STATUS_LABELS.index('BAIXO')).tolist(),
+            np.round(readings['ph'].to_numpy(), 2).tolist(),
+            np.where(status['ph'] == normal, 'OK', 'Fora da faixa').tolist(),
+            np.round(readings['humidity'].to_numpy(), 2).tolist(),
+            np.where(status['humidity'] == normal, 'OK', 'Fora da faixa').tolist(),
+            np.where(dry, 'Ativa', 'Inativa').tolist()
+        ))
+
+    def __call__(self, batch):
+        self.db.insert_leituras_solo(self.rows(batch))
+
+
+def pump(stream, sink):
+    """
+    Consome o fluxo de forma síncrona, entregando cada lote ao destino.
+
+    Returns:
+        dict: estatísticas do fluxo (ver ReadingStream.stats)
+    """
+    for batch in stream:
+        sink(batch)
+    return stream.stats()
+
+
+async def run_stream(stream, sink, queue_size=4):
+    """
+    Produz e consome o fluxo em tarefas separadas ligadas por uma fila
+    limitada: quando o destino atrasa, a fila enche e o produtor espera
+    (backpressure), em vez de acumular leituras na memória.
+
+    O destino roda em um executor, então pode ser bloqueante (ex.: INSERT
+    no PostgreSQL).
+
+    Returns:
+        dict: estatísticas do fluxo mais a profundidade máxima da fila e o
+              tempo gasto no destino
+    """
+    queue = asyncio.Queue(maxsize=queue_size)
+    loop = asyncio.get_running_loop()
+    max_depth = 0
+    sink_time = 0.0
+
+    async def produce():
+        nonlocal max_depth
+        try:
+            async for batch in stream:
+                await queue.put(batch)
+                max_depth = max(max_depth, queue.qsize())
+        finally:
+            await queue.put(None)
+
+    async def consume():
+        nonlocal sink_time
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            start = time.perf_counter()
+            await loop.run_in_executor(None, sink, batch)
+            sink_time += time.perf_counter() - start
+
+    producer = asyncio.create_task(produce())
+    try:
+        await consume()
+    except BaseException:
+        # Destino falhou: o produtor ficaria preso na fila cheia
+        producer.cancel()
+        raise
+    await producer
+
+    return {**stream.stats(), 'max_queue_depth': max_depth, 'sink_time_s': sink_time}